@@ -0,0 +1,100 @@
+# backtest.py
+
+import logging
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from hazard_cube import calendar_slot
+from hazard_forecast import HAZARD_COLS, forecast_col
+
+log = logging.getLogger()
+
+WINDOW_DAYS = (1, 7, 14, 30)
+
+
+def daily_series(daily, types=HAZARD_COLS):
+    """flag_daily_hazards output as a gap-free date range: (dates, values with NaN for missing days)."""
+    dates = pd.to_datetime(daily['date'])
+    full = pd.date_range(dates.min(), dates.max(), freq='D')
+    values = np.full((len(full), len(types)), np.nan)
+    values[(dates - full[0]).dt.days.to_numpy()] = daily[list(types)].to_numpy(dtype=np.float64)
+    return full, values
+
+
+def window_totals(values, window_days):
+    """Sum of each window_days-day run starting at every row; NaN when any day of the run is missing."""
+    n = len(values) - window_days + 1
+    if n <= 0:
+        return np.empty((0, values.shape[1]))
+    filled = np.vstack([np.zeros((1, values.shape[1])), np.nancumsum(values, axis=0)])
+    missing = np.r_[0, np.cumsum(np.isnan(values[:, 0]))]
+    totals = filled[window_days:window_days + n] - filled[:n]
+    totals[(missing[window_days:window_days + n] - missing[:n]) > 0] = np.nan
+    return totals
+
+
+def loo_window_forecasts(daily, window_days=1, min_year=1979, max_year=2024, level=0.8):
+    """
+    Leave-one-year-out forecasts of the hazard hours in every window_days-day
+    window starting within min_year..max_year. Per start calendar day, the
+    sum, sum of squares and count of the window totals over all years are
+    built once; each window's forecast is the mean of the other years,
+    (sum - own) / (count - 1), with a normal interval at the given level
+    from the matching leave-one-out variance. For window_days=1 the forecast
+    equals forecast_hazards run without that year.
+    Returns (start dates, actual, forecast, low, high), arrays of
+    shape (windows, hazard types).
+    """
+    dates, values = daily_series(daily)
+    totals = window_totals(values, window_days)
+    starts = dates[:len(totals)]
+    use = ~np.isnan(totals[:, 0]) & (starts.year >= min_year) & (starts.year <= max_year)
+    starts, actual = starts[use], totals[use]
+    slots = calendar_slot(starts.month, starts.day)
+
+    k = actual.shape[1]
+    sums, squares = np.zeros((366, k)), np.zeros((366, k))
+    counts = np.zeros(366)
+    np.add.at(sums, slots, actual)
+    np.add.at(squares, slots, actual ** 2)
+    np.add.at(counts, slots, 1)
+
+    n = (counts[slots] - 1)[:, None]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        forecast = (sums[slots] - actual) / n
+        variance = (squares[slots] - actual ** 2 - n * forecast ** 2) / (n - 1)
+    spread = NormalDist().inv_cdf(0.5 + level / 2) * np.sqrt(np.clip(variance, 0, None))
+    low, high = np.clip(forecast - spread, 0, None), forecast + spread
+
+    keep = n[:, 0] >= 1  # a window needs at least one other year to forecast from
+    return starts[keep], actual[keep], forecast[keep], low[keep], high[keep]
+
+
+def backtest(daily, window_days=WINDOW_DAYS, min_year=1979, max_year=2024, level=0.8):
+    """
+    Leave-one-year-out accuracy of the climatological forecast per hazard
+    type and window length: MAE and bias (forecast - actual) of the window
+    hazard hours, and the share of windows whose actual hours fall inside the
+    level interval (coverage; only windows with two or more other years).
+    """
+    rows = []
+    for days in window_days:
+        _, actual, forecast, low, high = loo_window_forecasts(daily, days, min_year, max_year, level)
+        error = forecast - actual
+        has_interval = ~np.isnan(high[:, 0])
+        inside = (actual >= low) & (actual <= high)
+        for j, col in enumerate(HAZARD_COLS):
+            rows.append({
+                'hazard': forecast_col(col),
+                'window_days': days,
+                'n_windows': len(actual),
+                'mae': np.abs(error[:, j]).mean() if len(actual) else np.nan,
+                'bias': error[:, j].mean() if len(actual) else np.nan,
+                'coverage': inside[has_interval, j].mean() if has_interval.any() else np.nan,
+            })
+    result = pd.DataFrame(rows)
+    log.info("Backtest of %d window lengths x %d hazard types (%d-%d).",
+             len(window_days), len(HAZARD_COLS), min_year, max_year)
+    return result
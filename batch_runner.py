@@ -0,0 +1,138 @@
+# batch_runner.py
+
+import argparse
+import logging
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_explore_clean"))
+from clean_data import clean_hourly
+from data_loader import add_thunderstorm_flag, aggregate_daily
+from hazard_forecast import HAZARD_COLS, HAZARD_RULES, forecast_col, forecast_hazards
+from hazard_kernel import fused_daily_hazards_from_frame
+from instrumentation import setup_logging
+
+log = logging.getLogger()
+
+DEFAULT_CONFIG = {
+    'thresholds': {},
+    'work_start': 7,
+    'work_end': 17,
+    'start_date': "2025-01-01",
+    'end_date': "2025-01-10",
+    'min_year': 1979,
+    'max_year': 2024,
+}
+
+
+def read_manifest(path):
+    """Station manifest: a CSV with 'station' and 'path' columns, one hourly file per station."""
+    manifest = pd.read_csv(path)
+    missing = {'station', 'path'} - set(manifest.columns)
+    if missing:
+        raise ValueError(f"Manifest {path} is missing columns: {sorted(missing)}")
+    if manifest['station'].duplicated().any():
+        raise ValueError(f"Manifest {path} lists a station more than once")
+    base = os.path.dirname(os.path.abspath(path))
+    manifest['path'] = [p if os.path.isabs(p) else os.path.join(base, p) for p in manifest['path']]
+    return manifest
+
+
+def run_station(station, path, out_dir, config):
+    """
+    load -> clean -> flag -> aggregate -> forecast for one station, writing
+    daily_aggregated.csv, daily_hazards.csv and forecast.csv under
+    out_dir/<station>/. Never raises: failures come back in the result.
+    """
+    started = time.perf_counter()
+    result = {'station': station, 'path': path, 'status': 'ok', 'error': None}
+    try:
+        raw = pd.read_csv(path, low_memory=False)
+        hourly = clean_hourly(raw)
+        # Cleaning drops all-empty columns (e.g. snow at a southern site); no readings, no hazard
+        for col in {rule[2] for rule in HAZARD_RULES} - set(hourly.columns):
+            hourly[col] = float('nan')
+        daily = aggregate_daily(add_thunderstorm_flag(hourly))
+        daily_hazards = fused_daily_hazards_from_frame(
+            hourly, config['thresholds'], config['work_start'], config['work_end'])
+        forecast = forecast_hazards(daily_hazards, config['start_date'], config['end_date'],
+                                    config['min_year'], config['max_year'])
+
+        station_dir = os.path.join(out_dir, str(station))
+        os.makedirs(station_dir, exist_ok=True)
+        daily.to_csv(os.path.join(station_dir, "daily_aggregated.csv"), index=False)
+        daily_hazards.to_csv(os.path.join(station_dir, "daily_hazards.csv"), index=False)
+        forecast.to_csv(os.path.join(station_dir, "forecast.csv"), index=False)
+
+        result.update(hourly_rows=len(hourly), days=len(daily))
+        result.update({f"window_{forecast_col(col)}": forecast[forecast_col(col)].sum() for col in HAZARD_COLS})
+    except Exception as exc:
+        result.update(status='failed', error=f"{type(exc).__name__}: {exc}",
+                      traceback=traceback.format_exc())
+    result['seconds'] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def run_batch(manifest, out_dir, config=None, workers=None):
+    """
+    Run every station of the manifest in a process pool of `workers` processes
+    (default: one per CPU). A failing station is recorded and the batch goes on.
+    Writes out_dir/summary.csv (one row per station, with timing and errors)
+    and returns it as a DataFrame.
+    """
+    config = {**DEFAULT_CONFIG, **(config or {})}
+    if isinstance(manifest, str):
+        manifest = read_manifest(manifest)
+    os.makedirs(out_dir, exist_ok=True)
+    started = time.perf_counter()
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(run_station, row.station, row.path, out_dir, config): row.station
+            for row in manifest.itertuples(index=False)
+        }
+        for future in as_completed(futures):
+            station = futures[future]
+            try:
+                result = future.result()
+            except Exception as exc:  # worker process died
+                result = {'station': station, 'status': 'failed', 'error': f"{type(exc).__name__}: {exc}"}
+            level = logging.INFO if result['status'] == 'ok' else logging.WARNING
+            log.log(level, "Station %s: %s in %ss %s", station, result['status'],
+                    result.get('seconds'), result['error'] or "")
+            if result.get('traceback'):
+                log.debug("Station %s traceback:\n%s", station, result['traceback'])
+            results.append(result)
+
+    summary = pd.DataFrame(results).drop(columns=['traceback'], errors='ignore')
+    summary = summary.set_index('station').loc[manifest['station']].reset_index()
+    summary.to_csv(os.path.join(out_dir, "summary.csv"), index=False)
+    n_failed = int((summary['status'] != 'ok').sum())
+    log.info("Batch of %d stations done in %.1fs; %d failed.",
+             len(summary), time.perf_counter() - started, n_failed)
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the hazard pipeline for every station in a manifest.")
+    parser.add_argument("manifest", help="CSV with 'station' and 'path' columns")
+    parser.add_argument("out_dir")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--start-date", default=DEFAULT_CONFIG['start_date'])
+    parser.add_argument("--end-date", default=DEFAULT_CONFIG['end_date'])
+    parser.add_argument("--work-start", type=int, default=DEFAULT_CONFIG['work_start'])
+    parser.add_argument("--work-end", type=int, default=DEFAULT_CONFIG['work_end'])
+    args = parser.parse_args()
+    setup_logging("batch_runner")
+
+    summary = run_batch(args.manifest, args.out_dir, workers=args.workers, config={
+        'start_date': args.start_date, 'end_date': args.end_date,
+        'work_start': args.work_start, 'work_end': args.work_end,
+    })
+    print(summary[['station', 'status', 'seconds', 'error']].to_string(index=False))
@@ -0,0 +1,66 @@
+# benchmarks/bench_daily_analyses.py
+# Wall time of the analyses that run on a daily hazard table, on the full
+# 1979-2024 archive of synthetic days, against a per-analysis time budget.
+#   python benchmarks/bench_daily_analyses.py [--fail-over-budget]
+
+import argparse
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(HERE, '..')))
+import backtest
+import hazard_forecast
+import schedule_risk
+import streaks
+from synthetic_weather import generate_daily_hazards
+
+
+def bench_backtest():
+    daily = generate_daily_hazards(1979, 2024, hazard_forecast.HAZARD_COLS, seed=1)
+    started = time.perf_counter()
+    backtest.backtest(daily)
+    return time.perf_counter() - started
+
+
+def bench_schedule_risk():
+    daily = generate_daily_hazards(1979, 2024, hazard_forecast.HAZARD_COLS, seed=1)
+    tasks = [schedule_risk.Task('foundation', 10, ['is_rain_1h_hazard', 'is_snow_1h_hazard'], lost_hours=3),
+             schedule_risk.Task('framing', 15, ['is_wind_hazard'], lost_hours=4),
+             schedule_risk.Task('roofing', 5, ['is_hazard'], lost_hours=5)]
+    started = time.perf_counter()
+    schedule_risk.simulate_schedule(daily, "2025-03-03", tasks, n_scenarios=100_000)
+    return time.perf_counter() - started
+
+
+def bench_streaks():
+    daily = generate_daily_hazards(1979, 2024, stations=[f"s{i}" for i in range(10)], seed=1,
+                                   drop=0.02, mean_hours=1.5, shuffle=True)
+    started = time.perf_counter()
+    streaks.streak_table(daily, window='week')
+    return time.perf_counter() - started
+
+
+# name -> (function returning seconds, budget in seconds)
+BENCHMARKS = {
+    'backtest full archive': (bench_backtest, 5.0),
+    'schedule_risk 100k scenarios': (bench_schedule_risk, 10.0),
+    'streak_table 10 stations x 46y': (bench_streaks, 5.0),
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the daily-table analyses on the full archive.")
+    parser.add_argument("--fail-over-budget", action="store_true")
+    args = parser.parse_args()
+
+    over = []
+    for name, (func, budget) in BENCHMARKS.items():
+        seconds = func()
+        flag = "" if seconds <= budget else "  OVER BUDGET"
+        print(f"  {name:32s} {seconds:8.3f} s  (budget {budget:.0f} s){flag}")
+        if flag:
+            over.append(name)
+    if over and args.fail_over_budget:
+        sys.exit(1)
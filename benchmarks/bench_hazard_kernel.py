@@ -0,0 +1,57 @@
+# benchmarks/bench_hazard_kernel.py
+# Compare filter_working_hours -> flag_hourly_hazards -> flag_daily_hazards
+# with the fused kernel: wall time and tracemalloc peak on synthetic hourly data.
+#   python benchmarks/bench_hazard_kernel.py [years]
+
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import hazard_forecast
+from hazard_kernel import fused_daily_hazards
+from synthetic_weather import generate_station
+
+
+def hazard_input(years, seed=0):
+    """The hazard input columns of one synthetic station, one row per hour, measurements as float32."""
+    raw = generate_station(years, seed=seed, duplicate_rate=0)
+    df = raw[hazard_forecast.HOURLY_INPUT_COLUMNS].astype(
+        {col: 'float32' for col in hazard_forecast.HOURLY_INPUT_COLUMNS if col != 'dt_iso'})
+    df['dt_iso'] = pd.to_datetime(raw['dt_iso'].str.replace(' +0000 UTC', '', regex=False))
+    return df
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def run_chain(df, thresholds):
+    df = hazard_forecast.filter_working_hours(df)
+    return hazard_forecast.flag_daily_hazards(hazard_forecast.flag_hourly_hazards(df, thresholds))
+
+
+def run_fused(df, thresholds):
+    columns = {col: df[col].to_numpy() for col in df.columns if col != 'dt_iso'}
+    return fused_daily_hazards(df['dt_iso'].to_numpy(), columns, thresholds)
+
+
+if __name__ == "__main__":
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 45
+    df = hazard_input(years)
+    expected, chain_s, chain_peak = measure(run_chain, df, {})
+    daily, fused_s, fused_peak = measure(run_fused, df, {})
+    pd.testing.assert_frame_equal(daily, expected)
+    print(f"{years} years, {len(df):,} hourly rows")
+    print(f"three-function chain: {chain_s:8.3f} s  peak {chain_peak / 1e6:8.1f} MB")
+    print(f"fused kernel:         {fused_s:8.3f} s  peak {fused_peak / 1e6:8.1f} MB")
+    print(f"speedup {chain_s / fused_s:.1f}x, peak memory {chain_peak / fused_peak:.1f}x lower")
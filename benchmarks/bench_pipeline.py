@@ -0,0 +1,166 @@
+# benchmarks/bench_pipeline.py
+# Wall time and tracemalloc peak of every pipeline stage on synthetic data,
+# appended to a JSON history and compared against a stored baseline.
+# Baselines are machine-specific and not committed: on a fresh checkout (or a
+# new --years/--stations size) the regression check is skipped with a notice
+# until one is recorded on this machine with --save-baseline.
+#   python benchmarks/bench_pipeline.py [--years 10] [--stations 1] [--save-baseline]
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(HERE, '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(HERE, '..', 'data_explore_clean')))
+import hazard_forecast
+from bench_hazard_kernel import measure
+from clean_data import clean_hourly
+from data_loader import add_thunderstorm_flag, aggregate_daily, load_hourly_csv
+from synthetic_weather import generate_station
+
+RESULTS_DIR = os.path.join(HERE, "results")
+HISTORY_PATH = os.path.join(RESULTS_DIR, "history.json")
+BASELINE_PATH = os.path.join(RESULTS_DIR, "baseline.json")
+TOLERANCE = 0.25
+
+
+def run_station(raw, work_dir):
+    """Time each stage on one station's raw export; returns {stage: {seconds, peak_mb, rows_in, rows_out}}."""
+    stages = {}
+
+    def stage(name, func, *args):
+        result, seconds, peak = measure(func, *args)
+        rows_in = len(args[0]) if isinstance(args[0], pd.DataFrame) else 0
+        stages[name] = {'seconds': seconds, 'peak_mb': peak / 1e6, 'rows_in': rows_in, 'rows_out': len(result)}
+        return result
+
+    cleaned = stage('clean_hourly', clean_hourly, raw)
+    path = os.path.join(work_dir, "cleaned.csv")
+    cleaned.to_csv(path, index=False)
+    hourly = stage('load_hourly_csv', lambda p: load_hourly_csv(p, use_cache=False), path)
+    stage('aggregate_daily', lambda df: aggregate_daily(add_thunderstorm_flag(df.copy())), hourly)
+    working = stage('filter_working_hours', hazard_forecast.filter_working_hours, hourly)
+    flagged = stage('flag_hourly_hazards', hazard_forecast.flag_hourly_hazards, working, {})
+    daily = stage('flag_daily_hazards', hazard_forecast.flag_daily_hazards, flagged)
+    stage('forecast_hazards', hazard_forecast.forecast_hazards, daily, "2025-01-01", "2025-01-10")
+    return stages
+
+
+def run_suite(years=10, stations=1, seed=0):
+    """Stage totals over stations synthetic stations of years years each."""
+    totals = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for station in range(stations):
+            raw = generate_station(years, station=station, seed=seed)
+            for name, stats in run_station(raw, work_dir).items():
+                total = totals.setdefault(name, {'seconds': 0.0, 'peak_mb': 0.0, 'rows_in': 0, 'rows_out': 0})
+                total['seconds'] += stats['seconds']
+                total['peak_mb'] = max(total['peak_mb'], stats['peak_mb'])
+                total['rows_in'] += stats['rows_in']
+                total['rows_out'] += stats['rows_out']
+    return totals
+
+
+def size_label(years, stations):
+    return f"{years}y x {stations}st"
+
+
+def find_regressions(stages, baseline, tolerance=TOLERANCE):
+    """Stages whose time or peak memory exceeds the baseline by more than tolerance (a fraction)."""
+    regressions = []
+    for name, stats in stages.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric in ('seconds', 'peak_mb'):
+            if base[metric] > 0 and stats[metric] > base[metric] * (1 + tolerance):
+                regressions.append({'stage': name, 'metric': metric, 'baseline': base[metric],
+                                    'value': stats[metric], 'ratio': stats[metric] / base[metric]})
+    return regressions
+
+
+def check_baseline(stages, baselines, label, tolerance=TOLERANCE):
+    """Regressions against the stored baseline for label, or None when there is none yet (check skipped)."""
+    baseline = baselines.get(label)
+    return None if baseline is None else find_regressions(stages, baseline, tolerance)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _load_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def _save_json(path, value):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as fh:
+        json.dump(value, fh, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline stages on synthetic hourly data.")
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--stations", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--history", default=HISTORY_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    label = size_label(args.years, args.stations)
+    stages = run_suite(args.years, args.stations, args.seed)
+    baselines = _load_json(args.baseline, {})
+    regressions = check_baseline(stages, baselines, label, args.tolerance)
+    run = {
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'commit': _git_commit(),
+        'size': label,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'stages': stages,
+        'regressions': regressions or [],
+        'baseline_checked': regressions is not None,
+    }
+    history = _load_json(args.history, [])
+    history.append(run)
+    _save_json(args.history, history)
+    if args.save_baseline:
+        baselines[label] = stages
+        _save_json(args.baseline, baselines)
+
+    print(f"{label}")
+    for name, stats in stages.items():
+        rows_in = f"{stats['rows_in']:,}" if stats['rows_in'] else "file"
+        print(f"  {name:22s} {stats['seconds']:8.3f} s  peak {stats['peak_mb']:8.1f} MB  "
+              f"{rows_in:>10} -> {stats['rows_out']:,} rows")
+    if args.save_baseline:
+        print(f"Saved baseline for {label} to {args.baseline}")
+    elif regressions is None:
+        print(f"No baseline for {label} in {args.baseline}; regression check skipped. "
+              f"Record one with --save-baseline.")
+    for reg in regressions or []:
+        print(f"REGRESSION {reg['stage']} {reg['metric']}: {reg['value']:.3f} vs baseline "
+              f"{reg['baseline']:.3f} ({reg['ratio']:.2f}x)")
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
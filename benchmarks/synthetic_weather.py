@@ -0,0 +1,180 @@
+# benchmarks/synthetic_weather.py
+# Deterministic synthetic hourly weather in the raw OpenWeather CSV layout:
+# seasonal and diurnal temperature, gusty wind, sparse rain/snow, matching
+# weather codes, plus the duplicate timestamps and gaps real exports have.
+#   python benchmarks/synthetic_weather.py out_dir [years] [stations]
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# weather_id -> (weather_main, weather_description, icon stem)
+WEATHER_TEXT = {
+    201: ('Thunderstorm', 'thunderstorm with rain', '11'),
+    500: ('Rain', 'light rain', '10'),
+    501: ('Rain', 'moderate rain', '10'),
+    502: ('Rain', 'heavy intensity rain', '10'),
+    600: ('Snow', 'light snow', '13'),
+    601: ('Snow', 'snow', '13'),
+    701: ('Mist', 'mist', '50'),
+    800: ('Clear', 'sky is clear', '01'),
+    801: ('Clouds', 'few clouds', '02'),
+    802: ('Clouds', 'scattered clouds', '03'),
+    803: ('Clouds', 'broken clouds', '04'),
+    804: ('Clouds', 'overcast clouds', '04'),
+}
+
+TIMEZONE_OFFSET = -21600
+
+
+def _round(values):
+    return np.round(values, 2)
+
+
+def generate_station(years=1, start_year=1979, station=0, seed=0,
+                     duplicate_rate=0.002, gap_rate=0.001, outages=2):
+    """
+    One station's raw hourly export for years years from start_year. The same
+    (seed, station) always gives the same frame. duplicate_rate of the hours
+    appear twice (half exact copies, half with a different reading), gap_rate
+    of the hours are missing, and outages multi-day stretches are missing.
+    """
+    rng = np.random.default_rng([seed, station])
+    times = pd.date_range(f"{start_year}-01-01", f"{start_year + years - 1}-12-31 23:00", freq="h")
+    n = len(times)
+    n_days = n // 24
+    dayofyear = np.asarray(times.dayofyear)
+    season = np.cos(2 * np.pi * (dayofyear - 200) / 365.25)  # 1 in mid-July
+    diurnal = np.cos(2 * np.pi * (np.asarray(times.hour) - 15) / 24)  # 1 at 3 pm
+    daily = lambda scale: np.repeat(rng.normal(0, scale, n_days), 24)[:n]
+
+    base = 58 + rng.normal(0, 4)
+    temp = base + 24 * season + 9 * diurnal + daily(7) + rng.normal(0, 1.5, n)
+    humidity = np.clip(55 - 15 * diurnal + daily(12) + rng.normal(0, 5, n), 5, 100)
+    wind = rng.gamma(2.2, 5.0, n) * (1 + 0.25 * np.cos(2 * np.pi * (dayofyear - 90) / 365.25))
+    gust = np.where(rng.random(n) < 0.35, wind * rng.uniform(1.2, 1.9, n), np.nan)
+    feels = np.where(temp < 50, temp - 0.7 * wind, np.where(temp > 80, temp + 0.15 * (humidity - 40), temp))
+    clouds = np.clip(rng.normal(40, 30, n) + daily(20), 0, 100)
+
+    wet_chance = 0.18 + 0.08 * np.cos(2 * np.pi * (dayofyear[::24][:n_days] - 135) / 365.25)  # wettest in May
+    wet_day = np.repeat(rng.random(n_days) < wet_chance, 24)[:n]
+    wet = wet_day & (rng.random(n) < 0.3)
+    amount = rng.exponential(0.12, n)
+    snowing = wet & (temp < 33)
+    raining = wet & ~snowing
+    rain_1h = np.where(raining, amount, np.nan)
+    snow_1h = np.where(snowing, amount * 2, np.nan)
+    rain_3h = np.where(raining & (rng.random(n) < 0.05), amount * 3, np.nan)
+    snow_3h = np.where(snowing & (rng.random(n) < 0.05), amount * 5, np.nan)
+    clouds = np.where(wet, np.maximum(clouds, 75), clouds)
+
+    weather_id = np.select(
+        [raining & (temp > 65) & (rng.random(n) < 0.25),
+         raining & (amount >= 0.3), raining & (amount >= 0.1), raining,
+         snowing & (amount >= 0.15), snowing,
+         humidity > 95,
+         clouds < 10, clouds < 25, clouds < 50, clouds < 85],
+        [201, 502, 501, 500, 601, 600, 701, 800, 801, 802, 803],
+        default=804,
+    )
+    ids = np.array(sorted(WEATHER_TEXT))
+    code = np.searchsorted(ids, weather_id)
+    main = np.array([WEATHER_TEXT[i][0] for i in ids])[code]
+    description = np.array([WEATHER_TEXT[i][1] for i in ids])[code]
+    day_night = np.where((times.hour >= 6) & (times.hour < 20), 'd', 'n')
+    icon = np.char.add(np.array([WEATHER_TEXT[i][2] for i in ids])[code], day_night)
+
+    epoch = times.asi8 // 10**9
+    stamps = np.char.replace(np.datetime_as_string(times.to_numpy(), unit='s'), 'T', ' ')
+    df = pd.DataFrame({
+        'dt': epoch,
+        'dt_iso': np.char.add(stamps, ' +0000 UTC'),
+        'timezone': TIMEZONE_OFFSET,
+        'city_name': f"Station {station}",
+        'lat': round(34.18 + 0.1 * (station % 7), 4),
+        'lon': round(-101.7 - 0.1 * (station % 9), 4),
+        'temp': _round(temp),
+        'visibility': np.where(humidity > 95, 5000.0, 10000.0),
+        'dew_point': _round(temp - (100 - humidity) / 5),
+        'feels_like': _round(feels),
+        'temp_min': _round(temp - rng.uniform(0, 2, n)),
+        'temp_max': _round(temp + rng.uniform(0, 2, n)),
+        'pressure': np.round(1015 + rng.normal(0, 6, n)),
+        'sea_level': np.nan,
+        'grnd_level': np.nan,
+        'humidity': np.round(humidity),
+        'wind_speed': _round(wind),
+        'wind_deg': np.round(rng.uniform(0, 360, n)),
+        'wind_gust': _round(gust),
+        'rain_1h': _round(rain_1h),
+        'rain_3h': _round(rain_3h),
+        'snow_1h': _round(snow_1h),
+        'snow_3h': _round(snow_3h),
+        'clouds_all': np.round(clouds),
+        'weather_id': weather_id,
+        'weather_main': main,
+        'weather_description': description,
+        'weather_icon': icon,
+    })
+
+    keep = rng.random(n) >= gap_rate
+    for start in rng.integers(0, max(n - 24 * 5, 1), outages):
+        keep[start:start + 24 * int(rng.integers(1, 5))] = False
+    dupes = np.flatnonzero(keep & (rng.random(n) < duplicate_rate))
+    extra = df.iloc[dupes].copy()
+    changed = rng.random(len(extra)) < 0.5
+    extra.loc[changed, 'wind_speed'] = _round(extra.loc[changed, 'wind_speed'] + rng.uniform(0.5, 5, changed.sum()))
+    out = pd.concat([df[keep], extra]).sort_values('dt', kind='stable')
+    return out.reset_index(drop=True)
+
+
+def generate_daily_hazards(first_year, last_year, columns=('is_hazard',), stations=None, seed=0,
+                           drop=0.01, mean_hours=2, shuffle=False):
+    """
+    A flag_daily_hazards-shaped table (date, one hazard-hour count per column,
+    year, month, day) with Poisson hazard hours and drop of the days missing.
+    With stations, one block per station and a leading station column;
+    shuffle mixes the rows the way an unsorted export would.
+    """
+    rng = np.random.default_rng(seed)
+    frames = []
+    for station in ([None] if stations is None else stations):
+        dates = pd.date_range(f"{first_year}-01-01", f"{last_year}-12-31", freq="D")
+        dates = dates[rng.random(len(dates)) >= drop]
+        daily = pd.DataFrame({'date': dates.date})
+        for col in columns:
+            daily[col] = rng.poisson(mean_hours, len(dates)).astype('int64')
+        daily['year'] = dates.year
+        daily['month'] = dates.month
+        daily['day'] = dates.day
+        if station is not None:
+            daily.insert(0, 'station', station)
+        frames.append(daily)
+    daily = pd.concat(frames, ignore_index=True)
+    return daily.sample(frac=1, random_state=seed).reset_index(drop=True) if shuffle else daily
+
+
+def write_stations(out_dir, n_stations=1, years=1, start_year=1979, seed=0, **kwargs):
+    """
+    Write one raw CSV per station plus a manifest.csv (station, path) for
+    batch_runner; returns the manifest path.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    rows = []
+    for station in range(n_stations):
+        name = f"station_{station:03d}"
+        df = generate_station(years, start_year, station, seed, **kwargs)
+        df.to_csv(os.path.join(out_dir, name + ".csv"), index=False)
+        rows.append({'station': name, 'path': name + ".csv"})
+    manifest = os.path.join(out_dir, "manifest.csv")
+    pd.DataFrame(rows).to_csv(manifest, index=False)
+    return manifest
+
+
+if __name__ == "__main__":
+    out_dir = sys.argv[1]
+    years = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    stations = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    print(write_stations(out_dir, stations, years))
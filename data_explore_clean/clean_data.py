@@ -1,64 +1,95 @@
 import pandas as pd
 import logging
 import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from instrumentation import setup_logging, stage
 
-# --- Logging Setup ---
-os.makedirs("logs", exist_ok=True)
-logging.basicConfig(
-    filename="logs/clean_data.log",
-    filemode="w",
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(message)s"
-)
 log = logging.getLogger()
 
 FILENAME = 'Historical Weather Plainview TX.csv'
 OUTFILE = 'Historical Weather Plainview TX CLEANED.csv'
 
-log.info("Reading data file...")
-df = pd.read_csv(FILENAME, low_memory=False)
-
-# 1. Drop 100% missing columns
-missing_pct = df.isnull().mean()
-cols_drop = missing_pct[missing_pct == 1.0].index.tolist()
-df = df.drop(columns=cols_drop)
-log.info(f"Dropped columns with 100% missing: {cols_drop}")
-
-# 2. Parse datetime
-df['dt_iso'] = df['dt_iso'].str.replace(' UTC', '', regex=False)
-df['dt_iso'] = pd.to_datetime(df['dt_iso'], errors='coerce')
-
-# 3. Check duplicates by dt_iso
-dups = df[df.duplicated(subset=['dt_iso'], keep=False)]
-if not dups.empty:
-    log.warning(f"Duplicate dt_iso timestamps: {dups['dt_iso'].nunique()} unique times, {len(dups)} rows total.")
-
-# 4. Handle duplicates
-log.info("Aggregating duplicates if needed...")
-grouped = df.groupby('dt_iso', as_index=False)
-
-def aggregate_group(grp):
-    # If all rows identical, just keep first
-    if (grp.nunique() == 1).all():
-        return grp.iloc[0]
-    # If not identical: Aggregate
-    # Numeric columns: take max (hazard), otherwise first (categorical)
-    num_cols = grp.select_dtypes(include='number').columns
-    agg = {}
-    for col in grp.columns:
-        if col in num_cols:
-            agg[col] = grp[col].max()
-        else:
-            agg[col] = grp[col].iloc[0]
-    log.warning(f"Aggregated non-identical duplicate at {grp['dt_iso'].iloc[0]}")
-    return pd.Series(agg)
-
-cleaned = grouped.apply(aggregate_group)
-cleaned = cleaned.reset_index(drop=True)
-log.info(f"Cleaned data shape: {cleaned.shape}")
-
-# 5. Save cleaned data
-cleaned.to_csv(OUTFILE, index=False)
-log.info(f"Saved cleaned data to: {OUTFILE}")
-
-log.info("Clean_data.py finished successfully.")
+
+def drop_empty_columns(df):
+    """Drop columns that are 100% missing."""
+    missing_pct = df.isnull().mean()
+    cols_drop = missing_pct[missing_pct == 1.0].index.tolist()
+    log.info("Dropped columns with 100%% missing: %s", cols_drop)
+    return df.drop(columns=cols_drop)
+
+
+def parse_dt_iso(df):
+    """Parse dt_iso strings such as '1979-01-01 00:00:00 +0000 UTC'."""
+    df = df.copy()
+    df['dt_iso'] = df['dt_iso'].str.replace(' UTC', '', regex=False)
+    df['dt_iso'] = pd.to_datetime(df['dt_iso'], errors='coerce')
+    return df
+
+
+def resolve_duplicates(df):
+    """
+    Collapse rows sharing a dt_iso into one row per timestamp, sorted by dt_iso.
+    A duplicated timestamp whose rows agree on every column (ignoring NaN) keeps
+    its first row; otherwise numeric columns take the max (hazard) and the
+    others the first row's value (categorical). Unique timestamps pass through
+    untouched, and all duplicated ones are resolved with one vectorized groupby.
+    Rows whose dt_iso failed to parse are dropped.
+    """
+    df = df[df['dt_iso'].notna()]
+    is_dup = df.duplicated(subset=['dt_iso'], keep=False)
+    unique_rows = df[~is_dup]
+    dups = df[is_dup]
+    if dups.empty:
+        return unique_rows.sort_values('dt_iso', kind='stable').reset_index(drop=True)
+
+    log.warning("Duplicate dt_iso timestamps: %d unique times, %d rows total.", dups['dt_iso'].nunique(), len(dups))
+    grouped = dups.groupby('dt_iso', sort=True)
+    first_rows = dups.drop_duplicates(subset=['dt_iso'], keep='first').set_index('dt_iso').sort_index()
+
+    other_cols = [c for c in dups.columns if c != 'dt_iso']
+    distinct = grouped[other_cols].nunique()
+    # Resolve like the original script (an all-NaN column sends a group to the max
+    # branch), but only report groups where some column really holds two values
+    identical = (distinct == 1).all(axis=1)
+    conflicting = distinct.index[~(distinct <= 1).all(axis=1)]
+    num_cols = dups[other_cols].select_dtypes(include='number').columns.tolist()
+
+    resolved = first_rows.copy()
+    mixed = identical.index[~identical]
+    if num_cols and len(mixed):
+        resolved.loc[mixed, num_cols] = grouped[num_cols].max().loc[mixed]
+    if len(conflicting):
+        log.warning("Aggregated %d non-identical duplicate timestamps.", len(conflicting))
+        log.debug("Non-identical duplicate timestamps: %s", list(conflicting))
+
+    resolved = resolved.reset_index()[df.columns]
+    cleaned = pd.concat([unique_rows, resolved], ignore_index=True)
+    return cleaned.sort_values('dt_iso', kind='stable').reset_index(drop=True)
+
+
+@stage
+def clean_hourly(df):
+    """Full cleaning stage: drop empty columns, parse dt_iso, resolve duplicate timestamps."""
+    df = drop_empty_columns(df)
+    df = parse_dt_iso(df)
+    log.info("Aggregating duplicates if needed...")
+    cleaned = resolve_duplicates(df)
+    log.info("Cleaned data shape: %s", cleaned.shape)
+    return cleaned
+
+
+def main(filename=FILENAME, outfile=OUTFILE):
+    log.info("Reading data file...")
+    df = pd.read_csv(filename, low_memory=False)
+    cleaned = clean_hourly(df)
+    cleaned.to_csv(outfile, index=False)
+    log.info("Saved cleaned data to: %s", outfile)
+    log.info("Clean_data.py finished successfully.")
+    return cleaned
+
+
+if __name__ == "__main__":
+    setup_logging("clean_data")
+    main()
@@ -1,13 +1,19 @@
-import pandas as pd
-
-FILENAME = 'data/Historical Weather Plainview TX CLEANED.csv'
-df = pd.read_csv(FILENAME, parse_dates=['dt_iso'])
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_explore import FILENAME, REPORT_PATH
+from data_profile import describe, extremes, load_report
 
+# Reads the data_explore.py profile report (profiling the CSV once if there is none yet)
 cols = ['rain_1h', 'rain_3h', 'snow_1h', 'snow_3h']
+report = load_report(REPORT_PATH, FILENAME)
 
 for col in cols:
+    if col not in report['columns']:
+        print(f"\n{col}: not in the data")
+        continue
     print(f"\n{col}:")
-    print("  % Null:", df[col].isnull().mean()*100)
-    print("  Nonzero count:", (df[col].fillna(0) > 0).sum())
-    print("  Stats:\n", df[col].describe())
-    print("  Top 5 events:\n", df.nlargest(5, col)[['dt_iso', col]])
+    print("  % Null:", report['columns'][col]['null_pct'])
+    print("  Nonzero count:", report['columns'][col]['nonzero'])
+    print("  Stats:\n", describe(report, [col])[col])
+    print("  Top 5 events:\n", extremes(report, col).head(5))
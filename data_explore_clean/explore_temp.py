@@ -1,64 +1,54 @@
-import pandas as pd
+import os
+import sys
 import matplotlib.pyplot as plt
+import pandas as pd
 
-FILENAME = 'data\Historical Weather Plainview TX CLEANED.csv'
-
-df = pd.read_csv(FILENAME, parse_dates=['dt_iso'])
-
-# Select columns of interest
-temp_cols = ['dt_iso', 'temp', 'dew_point', 'feels_like', 'temp_min', 'temp_max']
-df_temp = df[temp_cols]
-
-# How often does temp != temp_min or temp_max?
-min_diff = (df_temp['temp'] != df_temp['temp_min']).sum()
-max_diff = (df_temp['temp'] != df_temp['temp_max']).sum()
-
-print(f"Rows where temp != temp_min: {min_diff}")
-print(f"Rows where temp != temp_max: {max_diff}")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_explore import FILENAME, REPORT_PATH
+from data_profile import check_failures, describe, extremes, load_report
 
-# Show samples where different
-print("\nSample rows where temp != temp_min:")
-print(df_temp[df_temp['temp'] != df_temp['temp_min']].head())
+# Reads the data_explore.py profile report (profiling the CSV once if there is none yet)
+report = load_report(REPORT_PATH, FILENAME)
+temp_cols = [c for c in ('temp', 'dew_point', 'feels_like', 'temp_min', 'temp_max') if c in report['columns']]
 
-print("\nSample rows where temp != temp_max:")
-print(df_temp[df_temp['temp'] != df_temp['temp_max']].head())
+# How often does temp != temp_min or temp_max? Show samples where different
+for name in ('temp == temp_min', 'temp == temp_max'):
+    if name in report['checks']:
+        failed, sample = check_failures(report, name)
+        print(f"Rows where {name.replace('==', '!=')}: {failed}")
+        print(sample.head(), "\n")
 
 # Describe stats for all temp columns
-print("\nColumn stats:")
-print(df_temp.describe())
+print("Column stats:")
+print(describe(report, temp_cols))
 
+# Coldest and hottest readings
+for col in ('temp', 'feels_like'):
+    if col in report['columns']:
+        print(f"\nColdest {col}:\n", extremes(report, col, 'bottom'))
+        print(f"\nHottest {col}:\n", extremes(report, col, 'top'))
 
-# --- 1. Histograms ---
+
+# --- 1. Histograms (from the profile's quantile sketch) ---
 for col in temp_cols:
+    hist = report['columns'][col]['histogram']
     plt.figure()
-    df[col].hist(bins=50)
+    plt.stairs(hist['counts'], hist['edges'], fill=True)
     plt.title(f'Histogram of {col}')
     plt.xlabel(col)
     plt.ylabel('Count')
     plt.savefig(f'temp_hist_{col}.png')
     plt.close()
 
-# --- 2. Scatter plots ---
-plt.figure()
-plt.scatter(df['temp'], df['temp_min'], alpha=0.2, s=2)
-plt.xlabel('temp')
-plt.ylabel('temp_min')
-plt.title('temp vs temp_min')
-plt.savefig('scatter_temp_vs_temp_min.png')
-plt.close()
-
-plt.figure()
-plt.scatter(df['temp'], df['temp_max'], alpha=0.2, s=2)
-plt.xlabel('temp')
-plt.ylabel('temp_max')
-plt.title('temp vs temp_max')
-plt.savefig('scatter_temp_vs_temp_max.png')
-plt.close()
-
-plt.figure()
-plt.scatter(df['temp'], df['feels_like'], alpha=0.2, s=2)
-plt.xlabel('temp')
-plt.ylabel('feels_like')
-plt.title('temp vs feels_like')
-plt.savefig('scatter_temp_vs_feels_like.png')
-plt.close()
\ No newline at end of file
+# --- 2. Scatter plots (from the profile's row sample) ---
+sample = pd.DataFrame(report['sample']['rows'])
+for col in ('temp_min', 'temp_max', 'feels_like'):
+    if 'temp' not in sample or col not in sample:
+        continue
+    plt.figure()
+    plt.scatter(sample['temp'], sample[col], alpha=0.2, s=2)
+    plt.xlabel('temp')
+    plt.ylabel(col)
+    plt.title(f'temp vs {col}')
+    plt.savefig(f'scatter_temp_vs_{col}.png')
+    plt.close()
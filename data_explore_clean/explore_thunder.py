@@ -1,14 +1,16 @@
-import pandas as pd
+import os
+import sys
 import matplotlib.pyplot as plt
 
-FILENAME = 'data/Historical Weather Plainview TX CLEANED.csv'
-df = pd.read_csv(FILENAME, parse_dates=['dt_iso'])
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_loader import load_hourly_csv
+from weather_codes import add_weather_class_mask, check_code_consistency, has_class
 
-# Flag thunderstorm hours
-df['is_thunderstorm'] = (
-    df['weather_main'].str.contains('thunderstorm', case=False, na=False) |
-    df['weather_description'].str.contains('thunderstorm', case=False, na=False)
-)
+df = load_hourly_csv(columns=['dt_iso', 'weather_id', 'weather_main', 'weather_description'])
+
+# Flag thunderstorm hours (weather_id 200-299) with one code-table lookup
+df = add_weather_class_mask(df)
+df['is_thunderstorm'] = has_class(df['weather_class'], 'thunderstorm')
 
 # Extract month/year
 df['month'] = df['dt_iso'].dt.month
@@ -54,11 +56,10 @@ else:
 # Year counts
 print(ts['dt_iso'].dt.year.value_counts().sort_index())
 
-# Thunderstorm by weather_id
-df['is_thunderstorm_id'] = df['weather_id'].between(200, 299)
-# Compare with is_thunderstorm
-print("Thunderstorm by ID:", df['is_thunderstorm_id'].sum())
-print("Earliest thunderstorm (ID):", df[df['is_thunderstorm_id']]['dt_iso'].min())
+# Compare weather_id classes with the text columns
+mismatches = check_code_consistency(df)
+print("Thunderstorm by ID:", df['is_thunderstorm'].sum())
+print("Code/text mismatches:\n", mismatches.to_string(index=False) if len(mismatches) else "none")
 
 df['year'] = df['dt_iso'].dt.year
 ts_by_year = df.groupby('year')['is_thunderstorm'].sum()
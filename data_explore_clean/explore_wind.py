@@ -1,24 +1,27 @@
-import pandas as pd
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_explore import FILENAME, REPORT_PATH
+from data_profile import check_failures, describe, extremes, load_report
 
-FILENAME = 'data/Historical Weather Plainview TX CLEANED.csv'
-df = pd.read_csv(FILENAME, parse_dates=['dt_iso'])
+# Reads the data_explore.py profile report (profiling the CSV once if there is none yet)
+report = load_report(REPORT_PATH, FILENAME)
+cols = [c for c in ('wind_speed', 'wind_gust') if c in report['columns']]
 
 # Check nulls
-print("Null % wind_speed:", df['wind_speed'].isnull().mean()*100)
-print("Null % wind_gust:", df['wind_gust'].isnull().mean()*100)
+for col in cols:
+    print(f"Null % {col}:", report['columns'][col]['null_pct'])
 
 # Describe stats
-print("\nWind_speed stats:\n", df['wind_speed'].describe())
-print("\nWind_gust stats:\n", df['wind_gust'].describe())
+print("\nWind stats:\n", describe(report, cols))
 
 # Gust < speed?
-if 'wind_gust' in df.columns:
-    bad = df[(df['wind_gust'].notnull()) & (df['wind_gust'] < df['wind_speed'])]
-    print(f"\nRows where wind_gust < wind_speed: {len(bad)}")
-    if len(bad):
-        print(bad[['dt_iso', 'wind_speed', 'wind_gust']].head())
+if 'wind_gust >= wind_speed' in report['checks']:
+    failed, sample = check_failures(report, 'wind_gust >= wind_speed')
+    print(f"\nRows where wind_gust < wind_speed: {failed}")
+    if failed:
+        print(sample.head())
 
 # Top wind events
-print("\nTop 10 wind_speed:\n", df.nlargest(10, 'wind_speed')[['dt_iso','wind_speed','wind_gust']])
-if 'wind_gust' in df.columns:
-    print("\nTop 10 wind_gust:\n", df.nlargest(10, 'wind_gust')[['dt_iso','wind_speed','wind_gust']])
+for col in cols:
+    print(f"\nTop 10 {col}:\n", extremes(report, col))
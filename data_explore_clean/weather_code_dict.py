@@ -1,5 +1,10 @@
+import os
+import sys
 import pandas as pd
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from weather_codes import WEATHER_CLASSES, check_code_consistency, classify_weather_ids, has_class
+
 FILENAME = 'data/Historical Weather Plainview TX CLEANED.csv'
 df = pd.read_csv(FILENAME, usecols=['weather_id', 'weather_main', 'weather_description'])
 
@@ -10,8 +15,18 @@ code_dict = df.drop_duplicates().sort_values(['weather_id', 'weather_main', 'wea
 code_counts = df.groupby(['weather_id', 'weather_main', 'weather_description']).size().reset_index(name='count')
 code_counts = code_counts.sort_values(['weather_id', 'count'], ascending=[True, False])
 
+# Hazard classes each code maps to in the compiled lookup table
+class_mask = classify_weather_ids(code_counts['weather_id'])
+code_counts['classes'] = [
+    ','.join(name for name in WEATHER_CLASSES if has_class(mask, name)) for mask in class_mask
+]
+
 # Save to CSV for easy review
 code_counts.to_csv('weather_code_lookup.csv', index=False)
 
 # Also, print out all unique codes with mapping
 print(code_counts.to_string(index=False, max_rows=50))
+
+# Codes whose class disagrees with the weather_main / weather_description text
+mismatches = check_code_consistency(df)
+print(mismatches.to_string(index=False) if len(mismatches) else "weather_id classes agree with text columns.")
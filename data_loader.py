@@ -2,93 +2,315 @@
 
 import pandas as pd
 import logging
-import os
-
-# Logging setup
-os.makedirs("logs", exist_ok=True)
-logging.basicConfig(
-    filename="logs/data_loader.log",
-    filemode="w",
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(message)s"
-)
+
+import hourly_cache
+import weather_codes
+from instrumentation import setup_logging, stage
+
 log = logging.getLogger()
 
 DATA_PATH = "data/Historical Weather Plainview TX CLEANED.csv"
 OUT_PATH = "data/daily_aggregated.csv"
 
 
-def load_hourly_csv(path=DATA_PATH):
-    log.info(f"Loading hourly CSV from {path}...")
-    df = pd.read_csv(path, low_memory=False, parse_dates=['dt_iso'])
-    log.info(f"Loaded data shape: {df.shape}")
+# Compact dtypes for the hourly weather columns. Measurements fit float32
+# (values carry at most two decimals). Hazard thresholds are cast to the
+# column dtype before comparing (hazard_forecast.rule_limit), so flags do not
+# depend on whether a threshold is a Python float or an np.float64, and daily
+# sums and means are accumulated in float64 (widen_floats).
+# Repeated strings become categoricals; weather_id codes (200-804) fit int16.
+# Integer columns are read as float and narrowed only when no cell is blank,
+# as in hourly_store, so raw or partial exports still load (with NaN).
+HOURLY_SCHEMA = {
+    'dt': 'int64',
+    'timezone': 'int32',
+    'city_name': 'category',
+    'lat': 'float64',
+    'lon': 'float64',
+    'temp': 'float32',
+    'visibility': 'float32',
+    'dew_point': 'float32',
+    'feels_like': 'float32',
+    'temp_min': 'float32',
+    'temp_max': 'float32',
+    'pressure': 'float32',
+    'sea_level': 'float32',
+    'grnd_level': 'float32',
+    'humidity': 'float32',
+    'wind_speed': 'float32',
+    'wind_deg': 'float32',
+    'wind_gust': 'float32',
+    'rain_1h': 'float32',
+    'rain_3h': 'float32',
+    'snow_1h': 'float32',
+    'snow_3h': 'float32',
+    'clouds_all': 'float32',
+    'weather_id': 'int16',
+    'weather_main': 'category',
+    'weather_description': 'category',
+    'weather_icon': 'category',
+}
+
+
+def _narrow_ints(df, ints):
+    for col, kind in ints.items():
+        if col in df.columns and not df[col].isna().any():
+            df[col] = df[col].astype(kind)
+    return df
+
+
+def _read_hourly_csv(path, columns=None, schema=HOURLY_SCHEMA, **kwargs):
+    parse_dates = ['dt_iso'] if columns is None or 'dt_iso' in columns else None
+    dtype = {k: v for k, v in (schema or {}).items() if columns is None or k in columns}
+    ints = {k: v for k, v in dtype.items() if pd.api.types.is_integer_dtype(v)}
+    reader = pd.read_csv(path, usecols=columns, parse_dates=parse_dates,
+                         dtype={**dtype, **dict.fromkeys(ints, 'float64')} or None, **kwargs)
+    if kwargs.get('chunksize'):
+        return (_narrow_ints(chunk, ints) for chunk in reader)
+    return _narrow_ints(reader, ints)
+
+
+@stage
+def load_hourly_csv(path=DATA_PATH, columns=None, use_cache=True, cache_dir=None, schema=HOURLY_SCHEMA):
+    """
+    Load the hourly CSV, optionally only the given columns.
+    Columns listed in schema get its compact dtypes (pass schema=None for
+    pandas' defaults). With use_cache the parsed frame is kept as per-column
+    .npy files next to the CSV (see hourly_cache) and reused until the CSV
+    or the schema changes.
+    """
+    log.info("Loading hourly CSV from %s...", path)
+    if use_cache:
+        df = hourly_cache.load_cached(
+            path, lambda: _read_hourly_csv(path, schema=schema, low_memory=False),
+            columns=columns, cache_dir=cache_dir,
+            options={'parse_dates': ['dt_iso'], 'schema': schema or {}},
+        )
+    else:
+        df = _read_hourly_csv(path, columns, schema=schema, low_memory=False)
+        if columns is not None:
+            df = df[list(columns)]
+    log.info("Loaded data shape: %s", df.shape)
     return df
 
 
+def memory_report(before, after):
+    """
+    Bytes per column of two versions of a frame (e.g. default vs HOURLY_SCHEMA
+    dtypes), with a TOTAL row and the before/after ratio.
+    """
+    report = pd.DataFrame({
+        'bytes_before': before.memory_usage(deep=True, index=False),
+        'bytes_after': after.memory_usage(deep=True, index=False),
+    })
+    report.loc['TOTAL'] = report.sum()
+    report['ratio'] = report['bytes_before'] / report['bytes_after']
+    return report
+
+
+def schema_memory_report(path=DATA_PATH, columns=None):
+    """Load path with default and with HOURLY_SCHEMA dtypes and compare their memory use."""
+    before = load_hourly_csv(path, columns=columns, use_cache=False, schema=None)
+    after = load_hourly_csv(path, columns=columns, use_cache=False)
+    report = memory_report(before, after)
+    log.info("Hourly frame memory by column:\n%s", report)
+    return report
+
+
+@stage
 def add_thunderstorm_flag(df):
-    df['is_thunderstorm'] = (
-        df['weather_main'].str.contains('thunderstorm', case=False, na=False) |
-        df['weather_description'].str.contains('thunderstorm', case=False, na=False)
-    )
-    log.info(f"Total thunderstorm hours: {df['is_thunderstorm'].sum()}")
+    """
+    Flag thunderstorm hours. Uses the weather_id code table (200-299) when the
+    column is present, else falls back to matching the text columns.
+    """
+    if 'weather_id' in df.columns:
+        df['is_thunderstorm'] = weather_codes.has_class(
+            weather_codes.classify_weather_ids(df['weather_id']), 'thunderstorm')
+    else:
+        df['is_thunderstorm'] = (
+            df['weather_main'].str.contains('thunderstorm', case=False, na=False) |
+            df['weather_description'].str.contains('thunderstorm', case=False, na=False)
+        )
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Total thunderstorm hours: %d", df['is_thunderstorm'].sum())
     return df
 
 
-def aggregate_daily(df):
-    log.info("Aggregating to daily...")
-    df['date'] = df['dt_iso'].dt.date
-    agg_funcs = {
-        'temp': 'mean',
-        'temp_min': 'min',
-        'temp_max': 'max',
-        'wind_speed': 'max',
-        'wind_gust': 'max',
-        'rain_1h': ['sum', 'max'],
-        'rain_3h': ['sum', 'max'],
-        'snow_1h': ['sum', 'max'],
-        'snow_3h': ['sum', 'max'],
-        'is_thunderstorm': 'any',
-    }
-    agg_funcs = {k: v for k, v in agg_funcs.items() if k in df.columns}
-    daily = df.groupby('date').agg(agg_funcs)
-    daily = daily.reset_index()
+DAILY_AGG_FUNCS = {
+    'temp': 'mean',
+    'temp_min': 'min',
+    'temp_max': 'max',
+    'wind_speed': 'max',
+    'wind_gust': 'max',
+    'rain_1h': ['sum', 'max'],
+    'rain_3h': ['sum', 'max'],
+    'snow_1h': ['sum', 'max'],
+    'snow_3h': ['sum', 'max'],
+    'is_thunderstorm': 'any',
+}
 
-    # Rename columns for clarity
-    rename_map = {
-        'temp_mean': 'temp_mean',
-        'temp_min_min': 'temp_min',
-        'temp_max_max': 'temp_max',
-        'wind_speed_max': 'wind_speed_max',
-        'wind_gust_max': 'wind_gust_max',
-        'rain_1h_sum': 'rain_1h_total',
-        'rain_1h_max': 'rain_1h_max',
-        'rain_3h_sum': 'rain_3h_total',
-        'rain_3h_max': 'rain_3h_max',
-        'snow_1h_sum': 'snow_1h_total',
-        'snow_1h_max': 'snow_1h_max',
-        'snow_3h_sum': 'snow_3h_total',
-        'snow_3h_max': 'snow_3h_max',
-        'is_thunderstorm_any': 'thunderstorm_day'
-    }
+# Rename columns for clarity
+DAILY_RENAME_MAP = {
+    'temp_mean': 'temp_mean',
+    'temp_min_min': 'temp_min',
+    'temp_max_max': 'temp_max',
+    'wind_speed_max': 'wind_speed_max',
+    'wind_gust_max': 'wind_gust_max',
+    'rain_1h_sum': 'rain_1h_total',
+    'rain_1h_max': 'rain_1h_max',
+    'rain_3h_sum': 'rain_3h_total',
+    'rain_3h_max': 'rain_3h_max',
+    'snow_1h_sum': 'snow_1h_total',
+    'snow_1h_max': 'snow_1h_max',
+    'snow_3h_sum': 'snow_3h_total',
+    'snow_3h_max': 'snow_3h_max',
+    'is_thunderstorm_any': 'thunderstorm_day'
+}
+
+# How each daily aggregate is built from mergeable per-chunk partials:
+# {agg: [(partial stat, how partials of that stat merge)]}
+PARTIAL_STATS = {
+    'mean': [('sum', 'sum'), ('count', 'sum')],
+    'min': [('min', 'min')],
+    'max': [('max', 'max')],
+    'sum': [('sum', 'sum')],
+    'any': [('any', 'any')],
+}
+
+
+def daily_agg_funcs(columns):
+    return {k: v for k, v in DAILY_AGG_FUNCS.items() if k in columns}
+
+
+def narrow_float_dtypes(frame):
+    """Source dtypes of the float columns narrower than float64 (float32 under HOURLY_SCHEMA)."""
+    return {col: frame[col].dtype for col in frame.columns
+            if frame[col].dtype.kind == 'f' and frame[col].dtype.itemsize < 8}
+
+
+def widen_floats(frame):
+    """
+    frame with its narrow float columns as float64, plus their source dtypes.
+    Daily sums and means of float32 readings are accumulated in float64 and
+    rounded once by narrow_daily, so the result does not depend on how the
+    rows were split (whole frame, CSV chunks, worker partitions).
+    """
+    dtypes = narrow_float_dtypes(frame)
+    return (frame.astype({col: 'float64' for col in dtypes}) if dtypes else frame), dtypes
+
+
+def narrow_daily(daily, dtypes):
+    """Cast the (column, agg) aggregates of widened columns back to their source dtype."""
+    cast = {key: dtypes[key[0]] for key in daily.columns if key[0] in dtypes and key[1] != 'count'}
+    return daily.astype(cast) if cast else daily
+
+
+def finish_daily(daily):
+    """Flatten the (column, agg) MultiIndex of a per-date aggregate and apply DAILY_RENAME_MAP."""
+    daily = daily.reset_index()
     # Fix MultiIndex columns
     daily.columns = [
         col[0] if isinstance(col, str) else '_'.join(col)
         if isinstance(col, tuple) else str(col)
         for col in daily.columns.values
     ]
-    daily = daily.rename(columns=rename_map)
-    log.info(f"Aggregated daily data shape: {daily.shape}")
-    log.info(f"Sample daily rows:\n{daily.head()}")
+    return daily.rename(columns=DAILY_RENAME_MAP)
+
+
+@stage
+def aggregate_daily(df):
+    log.info("Aggregating to daily...")
+    df['date'] = df['dt_iso'].dt.date
+    agg_funcs = daily_agg_funcs(df.columns)
+    frame, dtypes = widen_floats(df[list(agg_funcs)])
+    daily = narrow_daily(frame.groupby(df['date']).agg(agg_funcs), dtypes)
+    daily = finish_daily(daily)
+    log.info("Aggregated daily data shape: %s", daily.shape)
+    log.debug("Sample daily rows:\n%s", daily.head())
+    return daily
+
+
+def partial_daily(df, agg_funcs):
+    """Per-date partial aggregates of one chunk of hourly rows (see PARTIAL_STATS); float sums are float64."""
+    dates = df['dt_iso'].dt.date
+    stats = {
+        col: list(dict.fromkeys(stat for func in ([funcs] if isinstance(funcs, str) else funcs)
+                                for stat, _ in PARTIAL_STATS[func]))
+        for col, funcs in agg_funcs.items()
+    }
+    frame, _ = widen_floats(df[list(stats)])
+    return frame.groupby(dates.rename('date')).agg(stats)
+
+
+def merge_partial_daily(partials):
+    """Combine partial aggregates whose dates may overlap (e.g. a day split across chunks)."""
+    combined = pd.concat(partials)
+    if not combined.index.has_duplicates:
+        return combined.sort_index()
+    merge_ops = {stat: merge for ops in PARTIAL_STATS.values() for stat, merge in ops}
+    grouped = combined.groupby(level=0)
+    merged = []
+    for merge in dict.fromkeys(merge_ops.values()):
+        cols = [col for col in combined.columns if merge_ops[col[1]] == merge]
+        if cols:
+            merged.append(getattr(grouped[cols], merge)())
+    return pd.concat(merged, axis=1)[combined.columns]
+
+
+def finalize_partial_daily(partial, agg_funcs, dtypes=None):
+    """
+    Turn merged partials into the same frame aggregate_daily returns; dtypes
+    are the source columns' narrow float dtypes (narrow_float_dtypes).
+    """
+    columns = {}
+    for col, funcs in agg_funcs.items():
+        for func in ([funcs] if isinstance(funcs, str) else funcs):
+            if func == 'mean':
+                total, count = partial[(col, 'sum')], partial[(col, 'count')]
+                columns[(col, func)] = total / count.where(count > 0)
+            else:
+                columns[(col, func)] = partial[(col, PARTIAL_STATS[func][0][0])]
+    daily = narrow_daily(pd.DataFrame(columns), dtypes or {})
+    daily.index.name = 'date'
+    return finish_daily(daily)
+
+
+@stage
+def aggregate_daily_chunked(path=DATA_PATH, chunksize=500_000):
+    """
+    Streaming version of add_thunderstorm_flag + aggregate_daily: reads the CSV
+    chunksize rows at a time and keeps only per-date partial aggregates, so
+    peak memory is bounded by the chunk size rather than the file size.
+    """
+    log.info("Aggregating %s to daily in chunks of %d rows...", path, chunksize)
+    partials = []
+    agg_funcs = dtypes = None
+    for chunk in _read_hourly_csv(path, chunksize=chunksize):
+        chunk = add_thunderstorm_flag(chunk)
+        if agg_funcs is None:
+            agg_funcs = daily_agg_funcs(chunk.columns)
+            dtypes = narrow_float_dtypes(chunk[list(agg_funcs)])
+        partials.append(partial_daily(chunk, agg_funcs))
+    daily = finalize_partial_daily(merge_partial_daily(partials), agg_funcs, dtypes)
+    log.info("Aggregated daily data shape: %s from %d chunks", daily.shape, len(partials))
     return daily
 
-def main():
-    df = load_hourly_csv()
-    df = add_thunderstorm_flag(df)
-    daily = aggregate_daily(df)
+def main(chunksize=None, workers=None):
+    if chunksize:
+        daily = aggregate_daily_chunked(DATA_PATH, chunksize=chunksize)
+    elif workers:
+        from parallel_daily import aggregate_daily_parallel
+        df = add_thunderstorm_flag(load_hourly_csv())
+        daily = aggregate_daily_parallel(df, workers=workers)
+    else:
+        df = load_hourly_csv()
+        df = add_thunderstorm_flag(df)
+        daily = aggregate_daily(df)
     daily.to_csv(OUT_PATH, index=False)
-    log.info(f"Saved daily aggregated data to {OUT_PATH}")
+    log.info("Saved daily aggregated data to %s", OUT_PATH)
     return daily
 
 
 if __name__ == "__main__":
+    setup_logging("data_loader")
     main()
@@ -0,0 +1,553 @@
+# data_profile.py
+
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from hourly_cache import file_fingerprint, is_same_file
+
+log = logging.getLogger()
+
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+STATION_COLS = ('station', 'city_name')
+HOUR_NS = 3600 * 10**9
+
+# Row-wise consistency checks (left, op, right); a row fails one where both values are present and the
+# comparison does not hold. These replace the one-off passes of explore_wind.py and explore_temp.py.
+PAIR_CHECKS = (
+    ('wind_gust', '>=', 'wind_speed'),
+    ('temp', '==', 'temp_min'),
+    ('temp', '==', 'temp_max'),
+)
+OPS = {'>=': np.greater_equal, '<=': np.less_equal, '==': np.equal}
+
+
+class QuantileSketch:
+    """
+    Mergeable approximate quantiles in bounded memory (a KLL-style
+    compactor stack). Level h holds at most size values, each standing for
+    2**h inputs; a full level is sorted and every other value moves up.
+    Exact until more than size values have been added.
+    """
+
+    def __init__(self, size=4096, seed=0):
+        self.size = size
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        self.levels[0] = np.concatenate([self.levels[0], np.asarray(values, dtype=np.float64)])
+        self._compact()
+
+    def merge(self, other):
+        for h, values in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], values])
+        self._compact()
+
+    def _compact(self):
+        h = 0
+        while h < len(self.levels):
+            if len(self.levels[h]) > self.size:
+                values = np.sort(self.levels[h])
+                keep = values[len(values) - len(values) % 2:]  # odd one out stays
+                promoted = values[self._rng.integers(2):len(values) - len(keep):2]
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h] = keep
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def _weighted(self):
+        weights = np.concatenate([np.full(len(v), 2.0 ** h) for h, v in enumerate(self.levels)])
+        return np.concatenate(self.levels), weights
+
+    def quantiles(self, qs=QUANTILES):
+        values, weights = self._weighted()
+        if not len(values):
+            return [None] * len(qs)
+        order = np.argsort(values, kind='stable')
+        values, ranks = values[order], np.cumsum(weights[order])
+        pos = np.searchsorted(ranks, np.asarray(qs) * ranks[-1], side='left')
+        return values[np.minimum(pos, len(values) - 1)].tolist()
+
+    def histogram(self, bins=50, range=None):
+        """Approximate (counts, edges); the weights add up to the number of values seen."""
+        values, weights = self._weighted()
+        counts, edges = np.histogram(values, bins=bins, range=range, weights=weights)
+        return counts.round().astype(np.int64), edges
+
+
+def _extremes(values, times, stations, n, largest):
+    if len(values) > n:
+        pick = np.argpartition(-values if largest else values, n)[:n]
+        values, times, stations = values[pick], times[pick], stations[pick]
+    return pd.DataFrame({'value': values, 'time': times, 'station': stations})
+
+
+def _keep_first(a, b, n, by=None, ascending=True):
+    frame = pd.concat([a, b], ignore_index=True) if len(a) and len(b) else (a if len(a) else b)
+    if by is not None:
+        frame = frame.sort_values(by, ascending=ascending, kind='stable')
+    return frame.head(n).reset_index(drop=True)
+
+
+class NumericSummary:
+    """
+    Count, nulls, nonzero, min/max, mean/variance (Chan's merge), quantile
+    sketch, and the top_n largest and smallest values with their time and station.
+    """
+
+    def __init__(self, top_n=10, sketch_size=4096, histogram_bins=50):
+        self.top_n, self.histogram_bins = top_n, histogram_bins
+        self.count = self.nulls = self.nonzero = 0
+        self.min, self.max = np.inf, -np.inf
+        self.mean = self.m2 = 0.0
+        self.sketch = QuantileSketch(sketch_size)
+        self.top = pd.DataFrame({'value': np.empty(0), 'time': np.empty(0, dtype=np.int64),
+                                 'station': np.empty(0, dtype=object)})
+        self.bottom = self.top
+
+    def update(self, values, times, stations):
+        valid = ~np.isnan(values)
+        self.nulls += int((~valid).sum())
+        values, times, stations = values[valid], times[valid], stations[valid]
+        if not len(values):
+            return
+        other = NumericSummary(self.top_n, self.sketch.size, self.histogram_bins)
+        other.count, other.nonzero = len(values), int((values != 0).sum())
+        other.min, other.max = values.min(), values.max()
+        other.mean = values.mean()
+        other.m2 = ((values - other.mean) ** 2).sum()
+        other.sketch.levels = [values]
+        other.top = _extremes(values, times, stations, self.top_n, largest=True)
+        other.bottom = _extremes(values, times, stations, self.top_n, largest=False)
+        self.merge(other)
+
+    def merge(self, other):
+        n = self.count + other.count
+        if other.count:
+            delta = other.mean - self.mean
+            self.m2 += other.m2 + delta ** 2 * self.count * other.count / n
+            self.mean += delta * other.count / n
+        self.count, self.nulls, self.nonzero = n, self.nulls + other.nulls, self.nonzero + other.nonzero
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+        self.top = _keep_first(self.top, other.top, self.top_n, 'value', ascending=False)
+        self.bottom = _keep_first(self.bottom, other.bottom, self.top_n, 'value')
+
+    def report(self, qs=QUANTILES):
+        n = self.count
+        counts, edges = self.sketch.histogram(self.histogram_bins, (self.min, self.max)) if n else ([], [])
+        return {
+            'kind': 'numeric',
+            'count': n,
+            'nulls': self.nulls,
+            'null_pct': 100 * self.nulls / (n + self.nulls) if n + self.nulls else None,
+            'nonzero': self.nonzero,
+            'min': float(self.min) if n else None,
+            'max': float(self.max) if n else None,
+            'mean': self.mean if n else None,
+            'std': float(np.sqrt(self.m2 / (n - 1))) if n > 1 else None,
+            'quantiles': dict(zip((f"{q:g}" for q in qs), self.sketch.quantiles(qs))),
+            'top': _extreme_records(self.top),
+            'bottom': _extreme_records(self.bottom),
+            'histogram': {'counts': list(map(int, counts)), 'edges': list(map(float, edges))},
+        }
+
+
+def _extreme_records(frame):
+    return [{'value': float(row.value), 'time': _iso(row.time), 'station': row.station} for row in frame.itertuples()]
+
+
+class PairCheck:
+    """Rows where both columns are present and left op right fails: how many, and the first top_n of them."""
+
+    def __init__(self, left, op, right, top_n=10):
+        self.left, self.op, self.right, self.top_n = left, op, right, top_n
+        self.checked = self.failed = 0
+        self.sample = pd.DataFrame({'time': np.empty(0, dtype=np.int64), 'station': np.empty(0, dtype=object),
+                                    'left': np.empty(0), 'right': np.empty(0)})
+
+    @property
+    def name(self):
+        return f"{self.left} {self.op} {self.right}"
+
+    def update(self, left, right, times, stations):
+        both = ~np.isnan(left) & ~np.isnan(right)
+        failed = both & ~OPS[self.op](left, right)
+        at = np.flatnonzero(failed)[:self.top_n]
+        other = PairCheck(self.left, self.op, self.right, self.top_n)
+        other.checked, other.failed = int(both.sum()), int(failed.sum())
+        other.sample = pd.DataFrame({'time': times[at], 'station': stations[at],
+                                     'left': left[at], 'right': right[at]})
+        self.merge(other)
+
+    def merge(self, other):
+        self.checked += other.checked
+        self.failed += other.failed
+        self.sample = _keep_first(self.sample, other.sample, self.top_n)
+
+    def report(self):
+        return {
+            'checked': self.checked,
+            'failed': self.failed,
+            'failed_pct': 100 * self.failed / self.checked if self.checked else None,
+            'sample': [{'time': _iso(row.time), 'station': row.station, self.left: float(row.left),
+                        self.right: float(row.right)} for row in self.sample.itertuples()],
+        }
+
+
+class RowSample:
+    """
+    A uniform sample of up to size rows of the numeric columns, for plots
+    that need rows rather than summaries. Every row draws a random key and
+    the size smallest keys stay, so merged samples are still uniform.
+    """
+
+    def __init__(self, size=1000, seed=0):
+        self.size = size
+        self.keys = np.empty(0)
+        self.rows = pd.DataFrame()
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, rows):
+        other = RowSample(self.size)
+        keys = self._rng.random(len(rows))
+        keep = np.argsort(keys, kind='stable')[:self.size]
+        other.keys, other.rows = keys[keep], rows.iloc[keep].reset_index(drop=True)
+        self.merge(other)
+
+    def merge(self, other):
+        keys = np.concatenate([self.keys, other.keys])
+        rows = _keep_first(self.rows, other.rows, len(keys))
+        keep = np.argsort(keys, kind='stable')[:self.size]
+        self.keys, self.rows = keys[keep], rows.iloc[keep].reset_index(drop=True)
+
+    def report(self):
+        rows = self.rows.astype(object).where(self.rows.notna(), None)
+        return {'size': len(rows), 'rows': rows.to_dict(orient='list')}
+
+
+class CategorySummary:
+    """
+    Value counts of a text column, pruned to the capacity most frequent
+    values when it grows past twice that; pruned_max bounds how far any
+    reported count may fall short.
+    """
+
+    def __init__(self, top_k=10, capacity=10_000):
+        self.top_k, self.capacity = top_k, capacity
+        self.count = self.nulls = self.pruned_max = 0
+        self.counts = pd.Series(dtype=np.int64)
+
+    def update(self, values):
+        counts = values.value_counts(dropna=True)
+        counts = counts[counts > 0]  # categorical dtypes list unused categories
+        other = CategorySummary(self.top_k, self.capacity)
+        other.count = int(counts.sum())
+        other.nulls = int(len(values) - other.count)
+        other.counts = counts.astype(np.int64)
+        other.counts.index = other.counts.index.astype(str)
+        self.merge(other)
+
+    def merge(self, other):
+        self.count += other.count
+        self.nulls += other.nulls
+        self.pruned_max += other.pruned_max
+        self.counts = self.counts.add(other.counts, fill_value=0).astype(np.int64)
+        if len(self.counts) > 2 * self.capacity:
+            self.counts = self.counts.sort_values(ascending=False, kind='stable')
+            self.pruned_max += int(self.counts.iloc[self.capacity])
+            self.counts = self.counts.iloc[:self.capacity]
+
+    def report(self):
+        top = self.counts.sort_values(ascending=False, kind='stable').head(self.top_k)
+        total = self.count + self.nulls
+        return {
+            'kind': 'categorical',
+            'count': self.count,
+            'nulls': self.nulls,
+            'null_pct': 100 * self.nulls / total if total else None,
+            'distinct': len(self.counts),
+            'distinct_exact': self.pruned_max == 0,
+            'top': top.to_dict(),
+        }
+
+
+class TimeSummary:
+    """
+    Records per hour over the span seen so far (one uint32 per hour), from
+    which duplicates, gaps and unique hours/dates follow. Memory grows with
+    the time span, not the number of rows.
+    """
+
+    def __init__(self, top_n=5):
+        self.top_n = top_n
+        self.first_hour = 0
+        self.hours = np.zeros(0, dtype=np.uint32)
+
+    def update(self, hours):
+        if not len(hours):
+            return
+        other = TimeSummary(self.top_n)
+        other.first_hour = int(hours.min())
+        other.hours = np.bincount(hours - other.first_hour).astype(np.uint32)
+        self.merge(other)
+
+    def merge(self, other):
+        if not len(other.hours):
+            return
+        if not len(self.hours):
+            self.first_hour, self.hours = other.first_hour, other.hours.copy()
+            return
+        first = min(self.first_hour, other.first_hour)
+        last = max(self.first_hour + len(self.hours), other.first_hour + len(other.hours))
+        hours = np.zeros(last - first, dtype=np.uint32)
+        for part in (self, other):
+            start = part.first_hour - first
+            hours[start:start + len(part.hours)] += part.hours
+        self.first_hour, self.hours = first, hours
+
+    def report(self):
+        if not len(self.hours):
+            return {'records': 0}
+        def stamp(hour):
+            return _iso((self.first_hour + hour) * HOUR_NS)
+
+        present = self.hours > 0
+        days = np.unique((self.first_hour + np.flatnonzero(present)) // 24)
+        dup = np.flatnonzero(self.hours > 1)
+        edges = np.diff(np.concatenate([[0], (~present).view(np.int8), [0]]))
+        starts = np.flatnonzero(edges == 1)
+        lengths = np.flatnonzero(edges == -1) - starts
+        largest = np.argsort(-lengths, kind='stable')[:self.top_n]
+        return {
+            'first': stamp(0),
+            'last': stamp(len(self.hours) - 1),
+            'records': int(self.hours.sum(dtype=np.int64)),
+            'unique_hours': int(present.sum()),
+            'unique_dates': len(days),
+            'duplicate_rows': int((self.hours[dup] - 1).sum(dtype=np.int64)),
+            'duplicate_hours': len(dup),
+            'duplicate_sample': [stamp(h) for h in dup[:self.top_n]],
+            'gaps': len(lengths),
+            'missing_hours': int(lengths.sum()),
+            'largest_gaps': [{'after': stamp(starts[i] - 1), 'before': stamp(starts[i] + lengths[i]),
+                              'missing_hours': int(lengths[i])} for i in largest],
+        }
+
+
+def _iso(ns):
+    return None if ns == np.iinfo(np.int64).min else pd.Timestamp(int(ns), tz='UTC').isoformat()
+
+
+def parse_times(values):
+    """dt_iso strings (raw '... +0000 UTC' or cleaned) as UTC epoch nanoseconds; NaT becomes int64 min."""
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        values = values.astype(str).str.replace(' UTC', '', regex=False)
+    return pd.to_datetime(values, utc=True, format='ISO8601', errors='coerce').to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+
+class DataProfile:
+    """
+    Column profile of an hourly table built chunk by chunk: numeric,
+    categorical and timestamp summaries, pair checks and a row sample, all
+    mergeable, so chunks, files or stations can be profiled separately and
+    combined with merge. Column kinds are fixed by the first chunk; later
+    text in a numeric column counts as null. Timestamps are tracked per
+    station when station_col is present (default: the first of 'station',
+    'city_name').
+    """
+
+    def __init__(self, time_col='dt_iso', station_col=None, top_k=10, top_n=10, sketch_size=4096,
+                 max_categories=10_000, histogram_bins=50, pair_checks=PAIR_CHECKS, sample_rows=1000):
+        self.time_col, self.station_col = time_col, station_col
+        self.top_k, self.top_n = top_k, top_n
+        self.sketch_size, self.max_categories = sketch_size, max_categories
+        self.histogram_bins, self.pair_checks = histogram_bins, pair_checks
+        self.rows = self.chunks = self.unparsed_times = 0
+        self.columns = {}
+        self.times = {}
+        self.checks = {}
+        self.sample = RowSample(sample_rows)
+        self.source = None
+
+    def _summary(self, chunk, col):
+        if pd.api.types.is_numeric_dtype(chunk[col]):
+            return NumericSummary(self.top_n, self.sketch_size, self.histogram_bins)
+        return CategorySummary(self.top_k, self.max_categories)
+
+    def update(self, chunk):
+        if not self.chunks and self.station_col is None:
+            self.station_col = next((c for c in STATION_COLS if c in chunk.columns), None)
+        self.rows += len(chunk)
+        self.chunks += 1
+
+        has_time = self.time_col in chunk.columns
+        times = parse_times(chunk[self.time_col]) if has_time else np.full(len(chunk), np.iinfo(np.int64).min)
+        stations = (chunk[self.station_col].astype(str).to_numpy(dtype=object) if self.station_col in chunk.columns
+                    else np.full(len(chunk), None, dtype=object))
+        if has_time:
+            parsed = times != np.iinfo(np.int64).min
+            self.unparsed_times += int((~parsed).sum())
+            hours = pd.Series(times[parsed] // HOUR_NS)
+            keys = stations[parsed] if self.station_col in chunk.columns else np.full(parsed.sum(), 'all')
+            for station, station_hours in hours.groupby(keys, sort=False):
+                self.times.setdefault(station, TimeSummary(self.top_n)).update(station_hours.to_numpy())
+
+        numeric = {}
+        for col in chunk.columns:
+            if col == self.time_col:
+                continue
+            if col not in self.columns:
+                self.columns[col] = self._summary(chunk, col)
+            summary = self.columns[col]
+            if isinstance(summary, NumericSummary):
+                numeric[col] = pd.to_numeric(chunk[col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+                summary.update(numeric[col], times, stations)
+            else:
+                summary.update(chunk[col])
+
+        for left, op, right in self.pair_checks:
+            if left in numeric and right in numeric:
+                check = PairCheck(left, op, right, self.top_n)
+                check = self.checks.setdefault(check.name, check)
+                check.update(numeric[left], numeric[right], times, stations)
+        self.sample.update(pd.DataFrame(numeric))
+        return self
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.chunks += other.chunks
+        self.unparsed_times += other.unparsed_times
+        for col, summary in other.columns.items():
+            if col in self.columns:
+                self.columns[col].merge(summary)
+            else:
+                self.columns[col] = summary
+        for station, summary in other.times.items():
+            self.times.setdefault(station, TimeSummary(self.top_n)).merge(summary)
+        for name, check in other.checks.items():
+            if name in self.checks:
+                self.checks[name].merge(check)
+            else:
+                self.checks[name] = check
+        self.sample.merge(other.sample)
+        if self.source != other.source:
+            self.source = None
+        return self
+
+    def report(self):
+        return {
+            'rows': self.rows,
+            'chunks': self.chunks,
+            'time_col': self.time_col,
+            'station_col': self.station_col,
+            'unparsed_times': self.unparsed_times,
+            'time': {str(station): summary.report() for station, summary in self.times.items()},
+            'columns': {col: summary.report() for col, summary in self.columns.items()},
+            'checks': {name: check.report() for name, check in self.checks.items()},
+            'sample': self.sample.report(),
+            'source': self.source,
+        }
+
+
+def profile_csv(path, chunksize=250_000, columns=None, **options):
+    """
+    Profile a CSV in one chunked pass; memory is bounded by chunksize and the
+    DataProfile options. The report's source is the CSV's file_fingerprint.
+    """
+    profile = DataProfile(**options)
+    profile.source = dict(file_fingerprint(path, with_hash=True), path=str(path))
+    for chunk in pd.read_csv(path, usecols=columns, chunksize=chunksize, low_memory=False):
+        profile.update(chunk)
+    log.info("Profiled %d rows of %s in %d chunks.", profile.rows, path, profile.chunks)
+    return profile
+
+
+def write_report(report, path):
+    with open(path, "w") as fh:
+        json.dump(report, fh, indent=2, default=str)
+    return path
+
+
+def load_report(path, csv_path=None, **options):
+    """
+    The JSON report at path. With csv_path, the report is checked against the
+    CSV's size/mtime/sha256 (as hourly_cache checks its manifest); a missing
+    or stale report is rebuilt from csv_path and written to path first.
+    """
+    report = None
+    if os.path.exists(path):
+        with open(path) as fh:
+            report = json.load(fh)
+    if csv_path is None:
+        if report is None:
+            raise FileNotFoundError(f"no profile report at {path}")
+        return report
+    if report is not None:
+        if report.get('source') and is_same_file(report['source'], csv_path):
+            return report
+        log.warning("Profile report %s does not match %s; profiling it again.", path, csv_path)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    write_report(profile_csv(csv_path, **options).report(), path)
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def describe(report, columns):
+    """DataFrame.describe() of numeric columns from a report; the quartiles come from the sketch."""
+    table = {}
+    for col in columns:
+        stats = report['columns'][col]
+        quantiles = stats['quantiles']
+        table[col] = {'count': stats['count'], 'mean': stats['mean'], 'std': stats['std'], 'min': stats['min'],
+                      '25%': quantiles.get('0.25'), '50%': quantiles.get('0.5'), '75%': quantiles.get('0.75'),
+                      'max': stats['max']}
+    return pd.DataFrame(table)
+
+
+def extremes(report, col, end='top'):
+    """The report's largest ('top') or smallest ('bottom') values of col with their time and station."""
+    return pd.DataFrame(report['columns'][col][end], columns=['time', 'station', 'value'])
+
+
+def check_failures(report, name):
+    """(failed row count, sample DataFrame) of one pair check, e.g. 'wind_gust >= wind_speed'."""
+    check = report['checks'][name]
+    return check['failed'], pd.DataFrame(check['sample'])
+
+
+def log_report(report):
+    """The profile as readable log lines: time coverage per station, then one line per column."""
+    log.info("Rows: %d (%d chunks), unparsed %s: %d", report['rows'], report['chunks'],
+             report['time_col'], report['unparsed_times'])
+    for station, times in report['time'].items():
+        log.info("Station %s: %s to %s, %d records, %d unique hours, %d unique dates", station,
+                 times['first'], times['last'], times['records'], times['unique_hours'], times['unique_dates'])
+        if times['duplicate_rows']:
+            log.warning("Station %s: %d duplicate rows over %d hours, e.g. %s", station,
+                        times['duplicate_rows'], times['duplicate_hours'], times['duplicate_sample'])
+        if times['gaps']:
+            log.warning("Station %s: %d gaps, %d missing hours; largest: %s", station,
+                        times['gaps'], times['missing_hours'], times['largest_gaps'])
+    for col, stats in report['columns'].items():
+        if stats['kind'] == 'numeric':
+            log.info("%s: count %d, null %.2f%%, nonzero %d, min %s, mean %s, max %s, quantiles %s, "
+                     "top %s, bottom %s", col, stats['count'], stats['null_pct'] or 0, stats['nonzero'],
+                     stats['min'], stats['mean'], stats['max'], stats['quantiles'],
+                     [t['value'] for t in stats['top']], [t['value'] for t in stats['bottom']])
+        else:
+            log.info("%s: count %d, null %.2f%%, %d distinct, top %s", col, stats['count'],
+                     stats['null_pct'] or 0, stats['distinct'], stats['top'])
+    for name, check in report['checks'].items():
+        if check['failed']:
+            log.warning("%s fails on %d of %d rows, e.g. %s", name, check['failed'], check['checked'],
+                        check['sample'][:3])
+        else:
+            log.info("%s holds on all %d rows", name, check['checked'])
@@ -0,0 +1,199 @@
+# forecast_service.py
+
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from hazard_forecast import (HAZARD_COLS, HOURLY_INPUT_COLUMNS, build_hazard_hour_index,
+                             forecast_col, shift_window)
+from instrumentation import setup_logging
+
+log = logging.getLogger()
+
+LATENCY_WINDOW = 10_000
+ANSWER_CACHE_SIZE = 1024
+
+
+@dataclass
+class StationData:
+    """A station's HazardHourIndex plus the year and calendar slot of each of its days."""
+    index: object
+    years: np.ndarray
+    slots: np.ndarray
+
+
+def station_data(index):
+    dates = index.first_date + pd.to_timedelta(np.arange(len(index.cum)), unit='D')
+    return StationData(index=index, years=np.asarray(dates.year),
+                       slots=np.asarray(dates.month * 100 + dates.day))
+
+
+def load_station(path, thresholds=None):
+    """Load an hourly CSV once and keep only its hazard hour index in memory."""
+    from data_loader import load_hourly_csv
+
+    df = load_hourly_csv(path, columns=HOURLY_INPUT_COLUMNS)
+    return station_data(build_hazard_hour_index(df, thresholds or {}))
+
+
+def shift_forecast(data, start_date, end_date, work_start=7, work_end=17, min_year=1979, max_year=2024):
+    """
+    forecast_hazards for one shift straight from the hour index: the shift's
+    daily counts and the per-calendar-day means are plain array sums, with no
+    DataFrame built until the answer. Same values as the full pipeline.
+    """
+    window = shift_window(data.index, work_start, work_end)
+
+    dates = pd.date_range(start=start_date, end=end_date, freq='D')
+    wanted = np.asarray(dates.month * 100 + dates.day)
+    slots = np.unique(wanted)
+    use = (window[:, 0] > 0) & (data.years >= min_year) & (data.years <= max_year) & np.isin(data.slots, slots)
+    slot_pos = np.searchsorted(slots, data.slots[use])
+    counts = np.bincount(slot_pos, minlength=len(slots))
+    sums = np.zeros((len(slots), len(HAZARD_COLS)))
+    np.add.at(sums, slot_pos, window[use, 1:])
+
+    pos = np.searchsorted(slots, wanted)
+    n_years = counts[pos]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums[pos] / n_years[:, None]
+    out = pd.DataFrame({'date': dates.date, 'n_years': n_years.astype('int64')})
+    for k, col in enumerate(HAZARD_COLS):
+        out[forecast_col(col)] = means[:, k]
+    return out
+
+
+class ForecastService:
+    """
+    In-memory forecast answers for a set of stations, with an LRU cache of
+    recent answers and request latency metrics.
+    """
+
+    def __init__(self, stations, cache_size=ANSWER_CACHE_SIZE):
+        self.stations = stations
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.requests = 0
+        self.errors = 0
+        self.answer = functools.lru_cache(maxsize=cache_size)(self._answer)
+
+    def _answer(self, station, start, end, work_start, work_end, min_year, max_year):
+        forecast = shift_forecast(self.stations[station], start, end, work_start, work_end, min_year, max_year)
+        records = [
+            {k: (None if isinstance(v, float) and math.isnan(v) else v) for k, v in row.items()}
+            for row in forecast.assign(date=forecast['date'].astype(str)).to_dict(orient='records')
+        ]
+        return json.dumps({'station': station, 'work_start': work_start, 'work_end': work_end,
+                           'min_year': min_year, 'max_year': max_year, 'forecast': records})
+
+    def query(self, params):
+        """Answer a /forecast query string dict; raises KeyError/ValueError on bad input."""
+        station = params.get('station') or next(iter(self.stations))
+        if station not in self.stations:
+            raise KeyError(f"unknown station {station!r}")
+        start = pd.Timestamp(params['start']).date().isoformat()
+        end = pd.Timestamp(params.get('end', params['start'])).date().isoformat()
+        return self.answer(station, start, end,
+                           int(params.get('work_start', 7)), int(params.get('work_end', 17)),
+                           int(params.get('min_year', 1979)), int(params.get('max_year', 2024)))
+
+    def metrics(self):
+        info = self.answer.cache_info()
+        lat = np.array(self.latencies) * 1000 if self.latencies else np.zeros(1)
+        lookups = info.hits + info.misses
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'latency_ms': {'p50': float(np.percentile(lat, 50)), 'p99': float(np.percentile(lat, 99)),
+                           'max': float(lat.max())},
+            'cache': {'hits': info.hits, 'misses': info.misses, 'size': info.currsize,
+                      'max_size': info.maxsize, 'hit_rate': info.hits / lookups if lookups else 0.0},
+            'stations': sorted(self.stations),
+        }
+
+    def handle(self, target):
+        """(status, JSON body) for a request target such as /forecast?start=2025-01-01&end=2025-01-10."""
+        started = time.perf_counter()
+        url = urlsplit(target)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            if url.path == '/forecast':
+                status, body = 200, self.query(params)
+            elif url.path == '/metrics':
+                status, body = 200, json.dumps(self.metrics())
+            elif url.path == '/health':
+                status, body = 200, '{"status": "ok"}'
+            else:
+                status, body = 404, json.dumps({'error': f"no route {url.path}"})
+        except (KeyError, ValueError) as exc:
+            status, body = 400, json.dumps({'error': str(exc).strip("'")})
+        self.requests += 1
+        self.errors += status != 200
+        self.latencies.append(time.perf_counter() - started)
+        return status, body
+
+    async def serve_connection(self, reader, writer):
+        """Minimal HTTP/1.1: GET requests, keep-alive until the client closes."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode('latin-1').partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                parts = request_line.decode('latin-1').split()
+                if len(parts) < 2 or parts[0] != 'GET':
+                    status, body = 405, json.dumps({'error': 'only GET is supported'})
+                else:
+                    status, body = self.handle(parts[1])
+                payload = body.encode()
+                close = headers.get('connection', '').lower() == 'close'
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+                    f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n".encode() + payload)
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(service, host="127.0.0.1", port=8765, unix_path=None):
+    if unix_path:
+        server = await asyncio.start_unix_server(service.serve_connection, path=unix_path)
+    else:
+        server = await asyncio.start_server(service.serve_connection, host, port)
+    log.info("Forecast service listening on %s.", unix_path or f"{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve hazard forecasts from memory.")
+    parser.add_argument("--station", action="append", required=True, metavar="NAME=HOURLY_CSV")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="serve on this Unix socket instead of TCP")
+    parser.add_argument("--cache-size", type=int, default=ANSWER_CACHE_SIZE)
+    args = parser.parse_args()
+    setup_logging("forecast_service")
+
+    stations = {}
+    for spec in args.station:
+        name, _, path = spec.partition("=")
+        stations[name] = load_station(path)
+    asyncio.run(serve(ForecastService(stations, args.cache_size), args.host, args.port, args.unix))
@@ -0,0 +1,145 @@
+# hazard_cube.py
+
+import json
+import logging
+import os
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from hazard_forecast import HAZARD_COLS, forecast_col
+
+log = logging.getLogger()
+
+N_SLOTS = 366
+FEB29_SLOT = 59
+
+# Day-of-year slot on a leap-year calendar, so every (month, day) keeps the
+# same slot in every year and non-leap years simply leave Feb 29 empty.
+_SLOT_BY_MONTH_DAY = np.full((13, 32), -1, dtype=np.int16)
+for _i, _d in enumerate(pd.date_range("2000-01-01", "2000-12-31", freq="D")):
+    _SLOT_BY_MONTH_DAY[_d.month, _d.day] = _i
+
+
+@dataclass
+class HazardCube:
+    """
+    Daily hazard hours as a dense year x day-of-year slot x hazard type array.
+    data[y, s, k] is HAZARD_COLS[k] hours on slot s of years[y]; NaN = no data.
+    """
+    years: np.ndarray
+    types: list
+    data: np.ndarray
+
+
+def calendar_slot(month, day):
+    return _SLOT_BY_MONTH_DAY[np.asarray(month), np.asarray(day)]
+
+
+def _meta_path(path):
+    return os.path.splitext(path)[0] + ".json"
+
+
+def build_hazard_cube(daily, path, types=HAZARD_COLS):
+    """
+    Write flag_daily_hazards output to path as a .npy cube (float32) plus a
+    .json sidecar, ready to be opened memory-mapped by open_hazard_cube.
+    """
+    first_year, last_year = int(daily['year'].min()), int(daily['year'].max())
+    shape = (last_year - first_year + 1, N_SLOTS, len(types))
+    cube = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=shape)
+    cube[:] = np.nan
+    y = daily['year'].to_numpy() - first_year
+    s = calendar_slot(daily['month'].to_numpy(), daily['day'].to_numpy())
+    cube[y, s, :] = daily[list(types)].to_numpy(dtype=np.float32)
+    cube.flush()
+    del cube
+    with open(_meta_path(path), "w") as fh:
+        json.dump({'first_year': first_year, 'types': list(types)}, fh)
+    log.info("Wrote hazard cube %s with shape %s", path, shape)
+    return open_hazard_cube(path)
+
+
+def open_hazard_cube(path):
+    """Open a cube read-only and memory-mapped; processes share the OS page cache instead of each loading a copy."""
+    with open(_meta_path(path)) as fh:
+        meta = json.load(fh)
+    data = np.load(path, mmap_mode='r')
+    years = np.arange(meta['first_year'], meta['first_year'] + data.shape[0])
+    return HazardCube(years=years, types=meta['types'], data=data)
+
+
+def _year_rows(cube, min_year, max_year):
+    return np.flatnonzero((cube.years >= min_year) & (cube.years <= max_year))
+
+
+def _daily_stat(cube, start_date, end_date, min_year, max_year, reduce):
+    window = pd.date_range(start=start_date, end=end_date, freq='D')
+    slots = calendar_slot(window.month, window.day)
+    rows = _year_rows(cube, min_year, max_year)
+    values = np.asarray(cube.data[rows][:, slots, :], dtype=np.float64)  # (years, days, types)
+    n_years = (~np.isnan(values[:, :, 0])).sum(axis=0)
+    out = pd.DataFrame({'date': window.date, 'n_years': n_years.astype('int64')})
+    with warnings.catch_warnings():
+        # all-NaN days (no history) give NaN, as in forecast_hazards
+        warnings.simplefilter("ignore", RuntimeWarning)
+        stats = reduce(values)
+    for k, col in enumerate(cube.types):
+        out[forecast_col(col)] = stats[:, k]
+    return out
+
+
+def cube_mean(cube, start_date, end_date, min_year=1979, max_year=2024):
+    """Mean hazard hours per day of the window across years; same values as forecast_hazards."""
+    return _daily_stat(cube, start_date, end_date, min_year, max_year,
+                       lambda v: np.nanmean(v, axis=0))
+
+
+def cube_percentile(cube, start_date, end_date, q=90, min_year=1979, max_year=2024):
+    """q-th percentile of hazard hours per day of the window across years (e.g. P90)."""
+    return _daily_stat(cube, start_date, end_date, min_year, max_year,
+                       lambda v: np.nanpercentile(v, q, axis=0))
+
+
+def window_by_year(cube, start_date, end_date, hazard='is_hazard', min_year=1979, max_year=2024):
+    """
+    Hazard hours for each day of the window replayed in every historical year,
+    as a (n_years, n_days) array plus the base years. A window crossing New
+    Year continues into the following year. Feb 29 counts as 0 in non-leap
+    years; years missing any other day of the window are dropped.
+    """
+    window = pd.date_range(start=start_date, end=end_date, freq='D')
+    slots = calendar_slot(window.month, window.day)
+    offsets = np.asarray(window.year - window.year[0])
+    k = cube.types.index(hazard)
+    rows = _year_rows(cube, min_year, max_year)
+    rows = rows[rows + offsets.max(initial=0) < len(cube.years)]
+    values = np.asarray(cube.data[rows[:, None] + offsets[None, :], slots[None, :], k], dtype=np.float64)
+    leap_gap = np.isnan(values) & (slots == FEB29_SLOT)[None, :]
+    values[leap_gap] = 0.0
+    complete = ~np.isnan(values).any(axis=1)
+    return cube.years[rows[complete]], values[complete]
+
+
+def window_total_percentiles(cube, start_date, end_date, q=(50, 90), hazard='is_hazard',
+                             min_year=1979, max_year=2024):
+    """Percentiles across years of the total hazard hours in the window."""
+    _, values = window_by_year(cube, start_date, end_date, hazard, min_year, max_year)
+    totals = values.sum(axis=1)
+    return {p.item(): float(np.percentile(totals, p)) if len(totals) else np.nan for p in np.atleast_1d(q)}
+
+
+def lost_day_exceedance(cube, start_date, end_date, more_than_days, lost_day_hours=1,
+                        hazard='is_hazard', min_year=1979, max_year=2024):
+    """
+    Probability, across historical years, of more than more_than_days lost
+    days in the window, a lost day being one with at least lost_day_hours
+    hours of the hazard.
+    """
+    _, values = window_by_year(cube, start_date, end_date, hazard, min_year, max_year)
+    if not len(values):
+        return np.nan
+    lost_days = (values >= lost_day_hours).sum(axis=1)
+    return float((lost_days > more_than_days).mean())
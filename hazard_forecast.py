@@ -3,19 +3,43 @@
 import pandas as pd
 import numpy as np
 import logging
-import os
-
-# Setup logging
-os.makedirs("logs", exist_ok=True)
-logging.basicConfig(
-    filename="logs/hazard_forecast.log",
-    filemode="w",
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(message)s"
-)
+from dataclasses import dataclass
+
+from instrumentation import stage
+
 log = logging.getLogger()
 
+HAZARD_COLS = [
+    'is_wind_hazard', 'is_heat_hazard', 'is_cold_hazard',
+    'is_rain_1h_hazard', 'is_rain_3h_hazard',
+    'is_snow_1h_hazard', 'is_snow_3h_hazard', 'is_hazard'
+]
+
+# How each hourly hazard type is flagged:
+# (flag column, thresholds key, source column, default threshold, comparison, treat NaN as 0)
+HAZARD_RULES = [
+    ('is_wind_hazard', 'wind_speed', 'wind_speed', 28, '>=', False),
+    ('is_heat_hazard', 'temp_heat', 'feels_like', 80, '>=', False),
+    ('is_cold_hazard', 'temp_cold', 'feels_like', 32, '<=', False),
+    ('is_rain_1h_hazard', 'rain_1h', 'rain_1h', 0.25, '>=', True),
+    ('is_rain_3h_hazard', 'rain_3h', 'rain_3h', 1.0, '>=', True),
+    ('is_snow_1h_hazard', 'snow_1h', 'snow_1h', 0.5, '>=', True),
+    ('is_snow_3h_hazard', 'snow_3h', 'snow_3h', 1.5, '>=', True),
+]
 
+
+def rule_limit(thresholds, key, default, values):
+    """
+    A rule's threshold in the float dtype of the values it is compared with.
+    NumPy only casts Python scalars down to float32; an np.float64 limit (e.g.
+    read from a frame) would compare in float64, where float32(0.35) < 0.35.
+    """
+    limit = thresholds.get(key, default)
+    dtype = getattr(values, 'dtype', None)
+    return dtype.type(limit) if dtype is not None and dtype.kind == 'f' else limit
+
+
+@stage
 def filter_working_hours(df, work_start=7, work_end=17):
     """Keep only rows within working hours (e.g., 7:00–16:59)."""
     df = df.copy()
@@ -24,34 +48,30 @@ def filter_working_hours(df, work_start=7, work_end=17):
     log.info("Filtered to working hours %02d:00–%02d:00; %d rows remain.", work_start, work_end, len(filtered))
     return filtered
 
+@stage
 def flag_hourly_hazards(df, thresholds):
     """
     Flags hourly hazards based on thresholds.
     Uses feels_like for cold/heat.
     """
     df = df.copy()
-    df['is_wind_hazard'] = df['wind_speed'] >= thresholds.get('wind_speed', 28)
-    df['is_heat_hazard'] = df['feels_like'] >= thresholds.get('temp_heat', 80)
-    df['is_cold_hazard'] = df['feels_like'] <= thresholds.get('temp_cold', 32)
-    df['is_rain_1h_hazard'] = df['rain_1h'].fillna(0) >= thresholds.get('rain_1h', 0.25)
-    df['is_rain_3h_hazard'] = df['rain_3h'].fillna(0) >= thresholds.get('rain_3h', 1.0)
-    df['is_snow_1h_hazard'] = df['snow_1h'].fillna(0) >= thresholds.get('snow_1h', 0.5)
-    df['is_snow_3h_hazard'] = df['snow_3h'].fillna(0) >= thresholds.get('snow_3h', 1.5)
-    df['is_hazard'] = df[
-        [
-            'is_wind_hazard', 'is_heat_hazard', 'is_cold_hazard',
-            'is_rain_1h_hazard', 'is_rain_3h_hazard',
-            'is_snow_1h_hazard', 'is_snow_3h_hazard'
-        ]
-    ].any(axis=1)
+    for flag, key, col, default, op, fill_zero in HAZARD_RULES:
+        values = df[col].fillna(0) if fill_zero else df[col]
+        limit = rule_limit(thresholds, key, default, values)
+        df[flag] = values >= limit if op == '>=' else values <= limit
+    df['is_hazard'] = df[[rule[0] for rule in HAZARD_RULES]].any(axis=1)
     log.info("Flagged hazards for %d hourly rows.", len(df))
     return df
 
+@stage
 def flag_daily_hazards(df_hourly):
     """
     For each day, count hazard hours by type.
     Returns a daily DataFrame with columns: date, year, month, day, [hazard_hr...], total_hazard_hr.
+    Also accepts flag_hourly_hazard_mask output (a hazard_mask column).
     """
+    if 'hazard_mask' in df_hourly.columns and 'is_hazard' not in df_hourly.columns:
+        return daily_hazards_from_mask(df_hourly['dt_iso'], df_hourly['hazard_mask'])
     df_hourly = df_hourly.copy()
     df_hourly['date'] = pd.to_datetime(df_hourly['dt_iso']).dt.date
 
@@ -73,34 +93,279 @@ def flag_daily_hazards(df_hourly):
     log.info("Aggregated daily hazard hours for %d days.", len(daily))
     return daily
 
-def forecast_hazards(daily, start_date, end_date, min_year=1979, max_year=2024):
+# Bit i of a hazard mask is set when HAZARD_RULES[i] fires; any bit set = is_hazard
+HAZARD_BITS = {rule[0]: 1 << i for i, rule in enumerate(HAZARD_RULES)}
+
+
+def flag_hourly_hazard_mask(df, thresholds):
     """
-    For each day in forecast window, compute mean hazard hours by type across all years.
+    Bit-packed flag_hourly_hazards: returns only dt_iso and a uint8
+    'hazard_mask' per hour (see HAZARD_BITS) instead of a copy of the frame
+    with eight bool columns.
+    """
+    mask = np.zeros(len(df), dtype=np.uint8)
+    for bit, (flag, key, col, default, op, fill_zero) in enumerate(HAZARD_RULES):
+        values = df[col].to_numpy()
+        if fill_zero:
+            values = np.where(pd.isna(values), 0, values)
+        limit = rule_limit(thresholds, key, default, values)
+        hit = values >= limit if op == '>=' else values <= limit
+        mask |= hit.astype(np.uint8) << bit
+    log.info("Flagged hazard masks for %d hourly rows.", len(df))
+    return pd.DataFrame({'dt_iso': df['dt_iso'].to_numpy(), 'hazard_mask': mask}, index=df.index)
+
+def decode_hazard_mask(mask):
+    """Expand hazard masks back to the bool columns of flag_hourly_hazards."""
+    mask = np.asarray(mask)
+    decoded = {flag: (mask & bit) != 0 for flag, bit in HAZARD_BITS.items()}
+    decoded['is_hazard'] = mask != 0
+    return pd.DataFrame(decoded)
+
+def hazard_popcount(mask):
+    """Number of hazard types active in each hour."""
+    return np.bitwise_count(np.asarray(mask, dtype=np.uint8))
+
+def daily_hazards_from_mask(dt_iso, mask):
+    """
+    flag_daily_hazards for bit-packed hours: per-type daily counts are
+    bincounts of each bit, and any-hazard hours count the non-zero masks.
+    """
+    days = pd.to_datetime(pd.Series(dt_iso)).dt.normalize()
+    codes, uniques = pd.factorize(days, sort=True)
+    mask = np.asarray(mask, dtype=np.uint8)
+    valid = codes >= 0
+    codes, mask = codes[valid], mask[valid]
+
+    daily = pd.DataFrame({'date': pd.DatetimeIndex(uniques).date})
+    for flag, bit in HAZARD_BITS.items():
+        daily[flag] = np.bincount(codes, weights=(mask & bit) != 0, minlength=len(uniques)).astype('int64')
+    daily['is_hazard'] = np.bincount(codes, weights=mask != 0, minlength=len(uniques)).astype('int64')
+    daily['year'] = pd.to_datetime(daily['date']).dt.year
+    daily['month'] = pd.to_datetime(daily['date']).dt.month
+    daily['day'] = pd.to_datetime(daily['date']).dt.day
+    log.info("Aggregated daily hazard hours for %d days from hazard masks.", len(daily))
+    return daily
+
+# Hourly columns the hazard pipeline reads; load only these
+HOURLY_INPUT_COLUMNS = [
+    'dt_iso', 'wind_speed', 'feels_like',
+    'rain_1h', 'rain_3h', 'snow_1h', 'snow_3h',
+]
+
+@dataclass
+class HazardHourIndex:
+    """
+    Hazard hour counts for every calendar day from first_date on, cumulative
+    along the hour-of-day axis: cum[d, h, k] is the number of hours before
+    h:00 on day d flagged for channel k. Channel 0 ('rows') counts hourly rows.
+    """
+    first_date: pd.Timestamp
+    cum: np.ndarray
+    channels: list
+
+
+def build_hazard_hour_index(df, thresholds):
+    """
+    Flag the full hourly history once and bin it into a day x hour x hazard
+    prefix-sum array, so daily_hazards_for_shift can answer any shift window
+    without re-filtering or re-flagging.
+    """
+    flagged = flag_hourly_hazards(df, thresholds)
+    ts = pd.to_datetime(flagged['dt_iso'])
+    valid = ts.notna().to_numpy()
+    ts = ts[valid]
+    day = ts.dt.normalize()
+    first_date = day.min()
+    day_idx = (day - first_date).dt.days.to_numpy()
+    n_days = int(day_idx.max()) + 1 if len(day_idx) else 0
+    slot = day_idx * 24 + ts.dt.hour.to_numpy()
+
+    channels = ['rows'] + HAZARD_COLS
+    counts = np.zeros((n_days * 24, len(channels)), dtype=np.int32)
+    counts[:, 0] = np.bincount(slot, minlength=n_days * 24)
+    for k, col in enumerate(HAZARD_COLS, start=1):
+        counts[:, k] = np.bincount(slot, weights=flagged[col].to_numpy()[valid], minlength=n_days * 24)
+
+    cum = np.zeros((n_days, 25, len(channels)), dtype=np.int32)
+    np.cumsum(counts.reshape(n_days, 24, len(channels)), axis=1, out=cum[:, 1:, :])
+    log.info("Built hazard hour index for %d days.", n_days)
+    return HazardHourIndex(first_date=first_date, cum=cum, channels=channels)
+
+def shift_window(index, work_start=7, work_end=17):
+    """
+    Per-day counts for the shift work_start:00 to work_end:00 from a
+    HazardHourIndex, shaped like index.cum[:, 0]: column 0 is rows in the
+    shift, then one column per HAZARD_COLS entry.
+    If work_end < work_start the shift wraps past midnight and the hours after
+    midnight count toward the day the shift started. Equal bounds are an
+    empty shift (filter_working_hours keeps no rows) and raise ValueError.
+    """
+    if not (0 <= work_start <= 24 and 0 <= work_end <= 24):
+        raise ValueError(f"work hours must be within 0-24, got {work_start}-{work_end}")
+    if work_start == work_end:
+        raise ValueError(f"work_start and work_end must differ, got {work_start}-{work_end}")
+    cum = index.cum
+    if work_start < work_end:
+        return cum[:, work_end] - cum[:, work_start]
+    window = cum[:, 24] - cum[:, work_start]
+    window[:-1] += cum[1:, work_end]
+    return window
+
+
+def daily_hazards_for_shift(index, work_start=7, work_end=17):
+    """
+    Daily hazard hours for the shift work_start:00 to work_end:00 from a
+    HazardHourIndex (see shift_window); same output as filter_working_hours
+    -> flag_hourly_hazards -> flag_daily_hazards for that window.
+    """
+    window = shift_window(index, work_start, work_end)
+    keep = np.flatnonzero(window[:, 0] > 0)
+    dates = index.first_date + pd.to_timedelta(keep, unit='D')
+    daily = pd.DataFrame({'date': dates.date})
+    for k, col in enumerate(HAZARD_COLS, start=1):
+        daily[col] = window[keep, k].astype('int64')
+    daily['year'] = pd.to_datetime(daily['date']).dt.year
+    daily['month'] = pd.to_datetime(daily['date']).dt.month
+    daily['day'] = pd.to_datetime(daily['date']).dt.day
+    log.info("Shift %02d:00-%02d:00: hazard hours for %d days.", work_start, work_end, len(daily))
+    return daily
+
+def forecast_col(col):
+    """Forecast column name for a hazard flag column, e.g. is_wind_hazard -> wind_hr."""
+    return col.replace("is_", "").replace("_hazard", "_hr")
+
+
+POOL_WEIGHTS = ('uniform', 'triangular', 'gaussian')
+
+# First day-of-year slot of each month on a leap-year calendar (index = month)
+_LEAP_MONTH_START = np.array([0, 0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335])
+_SLOT_DATES = pd.date_range("2000-01-01", "2000-12-31", freq="D")
+
+
+def pool_kernel(pool_days, weights='uniform'):
+    """Weights for calendar-day offsets -pool_days..pool_days."""
+    offsets = np.arange(-pool_days, pool_days + 1)
+    if weights == 'uniform':
+        return np.ones(len(offsets))
+    if weights == 'triangular':
+        return 1 - np.abs(offsets) / (pool_days + 1)
+    if weights == 'gaussian':
+        sigma = max(pool_days / 2, 0.5)
+        return np.exp(-0.5 * (offsets / sigma) ** 2)
+    raise ValueError(f"pool_weights must be one of {POOL_WEIGHTS}, got {weights!r}")
+
+
+def circular_pool(values, kernel):
+    """
+    out[s] = sum_j kernel[j] * values[(s + j - k) % n] along the first axis:
+    values padded circularly by k slots on each side, then a 'valid'
+    convolution. Cost is n x kernel width per column.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n, k = len(values), len(kernel) // 2
+    padded = values[np.arange(-k, n + k) % n]
+    return np.apply_along_axis(np.convolve, 0, padded, np.asarray(kernel)[::-1], 'valid')
+
+
+def _pooled_climatology(subset, pool_days, pool_weights):
+    month, day = subset['month'].to_numpy(), subset['day'].to_numpy()
+    slots = _LEAP_MONTH_START[month] + day - 1
+    counts = np.bincount(slots, minlength=366)
+    # distinct years per slot, as grouped['year'].nunique() in the unpooled table
+    years = subset['year'].to_numpy(dtype=np.int64)
+    years = years - years.min() if len(years) else years
+    seen = np.bincount(years * 366 + slots, minlength=366 * (years.max() + 1 if len(years) else 1)) > 0
+    n_years = seen.reshape(-1, 366).sum(axis=0)
+    # per-slot totals of each hazard type, then the day counts, pooled in one product
+    stacked = np.column_stack([np.bincount(slots, weights=subset[col].to_numpy(dtype=np.float64), minlength=366)
+                               for col in HAZARD_COLS] + [counts])
+    kernel = pool_kernel(pool_days, pool_weights)
+    pooled = circular_pool(stacked, kernel)
+    pooled_counts = pooled[:, -1]
+    keep = np.flatnonzero(pooled_counts > 0)
+    means = pooled[keep, :-1] / pooled_counts[keep, None]
+    n_pooled = circular_pool(counts, np.ones(len(kernel))) if pool_weights != 'uniform' else pooled_counts
+
+    dtype = subset['month'].dtype
+    index = pd.MultiIndex.from_arrays(
+        [_SLOT_DATES.month[keep].astype(dtype), _SLOT_DATES.day[keep].astype(dtype)], names=['month', 'day'])
+    clim = pd.DataFrame(means, index=index, columns=[forecast_col(col) for col in HAZARD_COLS])
+    clim.insert(0, 'n_years', n_years[keep].astype('int64'))
+    clim.insert(1, 'n_pooled', np.rint(n_pooled[keep]).astype('int64'))
+    return clim
+
+
+@stage
+def build_climatology(daily, min_year=1979, max_year=2024, pool_days=0, pool_weights='uniform'):
+    """
+    Per-calendar-day climatology from flag_daily_hazards output.
+    Indexed by (month, day); holds n_years and the mean hazard hours by type
+    across min_year..max_year. Build once, then answer any window with
+    forecast_from_climatology.
+    With pool_days > 0 each calendar day also pools the days up to pool_days
+    either side (wrapping around the year end), weighted by pool_weights, and
+    n_pooled counts the day-samples behind each mean. Pooling is a circular
+    convolution over a 366-slot day-of-year array (Feb 29 is a slot of its
+    own, empty in non-leap years), so its cost does not depend on the number
+    of rows or the window.
+    """
+    subset = daily[(daily['year'] >= min_year) & (daily['year'] <= max_year)]
+    if pool_days:
+        clim = _pooled_climatology(subset, pool_days, pool_weights)
+        log.info("Built climatology for %d calendar days (%d-%d), pooled +/-%d days (%s).",
+                 len(clim), min_year, max_year, pool_days, pool_weights)
+        return clim
+    grouped = subset.groupby(['month', 'day'])
+    clim = grouped[HAZARD_COLS].mean()
+    clim.columns = [forecast_col(col) for col in HAZARD_COLS]
+    clim.insert(0, 'n_years', grouped['year'].nunique())
+    log.info("Built climatology for %d calendar days (%d-%d).", len(clim), min_year, max_year)
+    return clim
+
+def forecast_from_climatology(clim, start_date, end_date):
+    """
+    Look up each day of the forecast window in a build_climatology table.
+    Days with no history get n_years 0 and NaN hazard hours.
     """
-    hazard_cols = [
-        'is_wind_hazard', 'is_heat_hazard', 'is_cold_hazard',
-        'is_rain_1h_hazard', 'is_rain_3h_hazard',
-        'is_snow_1h_hazard', 'is_snow_3h_hazard', 'is_hazard'
-    ]
     window_dates = pd.date_range(start=start_date, end=end_date, freq='D')
-    out = []
-    for dt in window_dates:
-        m, d = dt.month, dt.day
-        subset = daily[(daily['month'] == m) & (daily['day'] == d) &
-                       (daily['year'] >= min_year) & (daily['year'] <= max_year)]
-        n_years = subset['year'].nunique()
-        stats = {col.replace("is_", "").replace("_hazard", "_hr"): subset[col].mean() if n_years > 0 else np.nan
-                 for col in hazard_cols}
-        row = {
-            'date': dt.date(),
-            'n_years': n_years,
-            **stats
-        }
-        out.append(row)
-        log.info("Forecast for %s: %s", dt.date(), row)
-    return pd.DataFrame(out)
+    keys = pd.MultiIndex.from_arrays([window_dates.month, window_dates.day], names=['month', 'day'])
+    out = clim.reindex(keys).reset_index(drop=True)
+    out['n_years'] = out['n_years'].fillna(0).astype('int64')
+    out.insert(0, 'date', window_dates.date)
+    return out
+
+@stage
+def forecast_hazards(daily, start_date, end_date, min_year=1979, max_year=2024, climatology=None,
+                     pool_days=0, pool_weights='uniform'):
+    """
+    For each day in forecast window, compute mean hazard hours by type across all years.
+    Pass a prebuilt climatology (from build_climatology) to skip rebuilding it per call.
+    pool_days / pool_weights pool neighbouring calendar days (see build_climatology).
+    """
+    if climatology is None:
+        climatology = build_climatology(daily, min_year=min_year, max_year=max_year,
+                                        pool_days=pool_days, pool_weights=pool_weights)
+    forecast = forecast_from_climatology(climatology, start_date, end_date)
+    log.info("Forecast %d days from %s to %s.", len(forecast), start_date, end_date)
+    return forecast
 
 if __name__ == "__main__":
+    import argparse
+    from contextlib import nullcontext
+
+    from data_loader import load_hourly_csv
+    from instrumentation import METRICS, profiled, setup_logging
+
+    parser = argparse.ArgumentParser(description="Forecast hazard hours for a window.")
+    parser.add_argument("--metrics", help="write per-stage metrics here (.prom for Prometheus text, else JSON)")
+    parser.add_argument("--trace-memory", action="store_true", help="record tracemalloc peaks per stage")
+    parser.add_argument("--profile", help="dump cProfile stats here (plus a .txt of the hot paths)")
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+    setup_logging("hazard_forecast", level=logging.DEBUG if args.debug else logging.INFO)
+    if args.metrics:
+        METRICS.enable(trace_memory=args.trace_memory)
+
     # --- Usage Example ---
     thresholds = {
         'wind_speed': 28,
@@ -115,12 +380,18 @@ if __name__ == "__main__":
     work_start = 7
     work_end = 17
 
-    df = pd.read_csv("data/Historical Weather Plainview TX CLEANED.csv", parse_dates=['dt_iso'])
-    log.info("Loaded %d rows from hourly data.", len(df))
+    with profiled(args.profile) if args.profile else nullcontext():
+        df = load_hourly_csv(columns=HOURLY_INPUT_COLUMNS)
+        log.info("Loaded %d rows from hourly data.", len(df))
 
-    df = filter_working_hours(df, work_start=work_start, work_end=work_end)
-    df = flag_hourly_hazards(df, thresholds)
-    daily = flag_daily_hazards(df)
-    forecast = forecast_hazards(daily, start_date="2025-01-01", end_date="2025-01-10")
+        df = filter_working_hours(df, work_start=work_start, work_end=work_end)
+        df = flag_hourly_hazards(df, thresholds)
+        daily = flag_daily_hazards(df)
+        forecast = forecast_hazards(daily, start_date="2025-01-01", end_date="2025-01-10")
     print(forecast)
+    if args.metrics:
+        if args.metrics.endswith(".prom"):
+            METRICS.to_prometheus(args.metrics)
+        else:
+            METRICS.to_json(args.metrics)
     log.info("Forecast window complete.")
@@ -0,0 +1,76 @@
+# hazard_kernel.py
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from hazard_forecast import HAZARD_COLS, HAZARD_RULES, rule_limit
+
+log = logging.getLogger()
+
+HOUR_NS = 3600 * 10**9
+DAY_NS = 24 * HOUR_NS
+
+
+def fused_daily_hazards(times, columns, thresholds, work_start=7, work_end=17):
+    """
+    Daily hazard hours straight from hourly arrays, in one pass and without
+    DataFrame copies: same output as filter_working_hours ->
+    flag_hourly_hazards -> flag_daily_hazards.
+
+    times is a datetime64 array of wall-clock hours; columns maps each source
+    column of HAZARD_RULES (wind_speed, feels_like, rain_*, snow_*) to an
+    array aligned with times. Rows need not be sorted, but sorted input skips
+    the argsort. Per-day counts are np.add.reduceat over day-boundary offsets.
+    """
+    times = np.asarray(times, dtype='datetime64[ns]')
+    valid = ~np.isnat(times)
+    t = times.view('int64')
+    hour = (t // HOUR_NS) % 24
+    idx = np.flatnonzero(valid & (hour >= work_start) & (hour < work_end))
+    t = t[idx]
+    if len(t) > 1 and (np.diff(t) < 0).any():
+        order = np.argsort(t, kind='stable')
+        idx, t = idx[order], t[order]
+
+    day = t // DAY_NS
+    starts = np.flatnonzero(np.r_[True, day[1:] != day[:-1]]) if len(day) else np.array([], dtype=np.intp)
+    days = day[starts]
+
+    counts = {}
+    any_hit = np.zeros(len(idx), dtype=bool)
+    for flag, key, col, default, op, fill_zero in HAZARD_RULES:
+        values = np.asarray(columns[col])[idx]
+        if fill_zero and values.dtype.kind == 'f':
+            values = np.where(np.isnan(values), 0, values)
+        limit = rule_limit(thresholds, key, default, values)
+        hit = values >= limit if op == '>=' else values <= limit
+        any_hit |= hit
+        counts[flag] = _day_sums(hit, starts)
+    counts['is_hazard'] = _day_sums(any_hit, starts)
+
+    dates = pd.DatetimeIndex((days * DAY_NS).astype('datetime64[ns]'))
+    daily = pd.DataFrame({'date': dates.date})
+    for col in HAZARD_COLS:
+        daily[col] = counts[col]
+    daily['year'] = dates.year
+    daily['month'] = dates.month
+    daily['day'] = dates.day
+    log.info("Fused kernel: hazard hours for %d days from %d working-hour rows.", len(daily), len(idx))
+    return daily
+
+
+def _day_sums(hit, starts):
+    if not len(starts):
+        return np.zeros(0, dtype='int64')
+    return np.add.reduceat(hit, starts, dtype=np.int64)
+
+
+def fused_daily_hazards_from_frame(df, thresholds, work_start=7, work_end=17):
+    """fused_daily_hazards on an hourly DataFrame's columns (tz-aware dt_iso uses its wall clock)."""
+    ts = pd.to_datetime(df['dt_iso'])
+    if ts.dt.tz is not None:
+        ts = ts.dt.tz_localize(None)
+    columns = {col: df[col].to_numpy() for col in {rule[2] for rule in HAZARD_RULES}}
+    return fused_daily_hazards(ts.to_numpy(), columns, thresholds, work_start, work_end)
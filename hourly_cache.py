@@ -0,0 +1,218 @@
+# hourly_cache.py
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+log = logging.getLogger()
+
+CACHE_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+
+class CacheUnsupported(Exception):
+    """Raised when a frame holds a column the columnar cache cannot store."""
+
+
+def default_cache_dir(path):
+    """Cache directory for a source file, e.g. data/.cache/<file name>.cols/"""
+    folder, name = os.path.split(os.path.abspath(path))
+    return os.path.join(folder, ".cache", name + ".cols")
+
+
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path, with_hash=False):
+    """Size and mtime of the source file, plus its sha256 if requested."""
+    st = os.stat(path)
+    fp = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if with_hash:
+        fp["sha256"] = file_sha256(path)
+    return fp
+
+
+def _read_manifest(cache_dir):
+    manifest_path = os.path.join(cache_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return None
+    try:
+        with open(manifest_path) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        log.warning("Unreadable cache manifest at %s; ignoring it.", manifest_path)
+        return None
+
+
+def _write_manifest(cache_dir, manifest):
+    tmp_path = os.path.join(cache_dir, MANIFEST_NAME + ".tmp")
+    with open(tmp_path, "w") as fh:
+        json.dump(manifest, fh, indent=2)
+    os.replace(tmp_path, os.path.join(cache_dir, MANIFEST_NAME))
+
+
+def is_cache_valid(manifest, path, options=None):
+    """
+    A cache is valid when it was written by this cache version with the same
+    read options, and the source file still has the same size and mtime.
+    If only the mtime changed (file copied or touched) the stored sha256
+    decides.
+    """
+    if manifest is None or manifest.get("version") != CACHE_VERSION:
+        return False
+    if manifest.get("options") != (options or {}):
+        return False
+    return is_same_file(manifest.get("source", {}), path)
+
+
+def is_same_file(source, path):
+    """
+    Whether path still matches a stored file_fingerprint: same size and
+    mtime, or same size and sha256 when only the mtime changed.
+    """
+    current = file_fingerprint(path)
+    if current["size"] != source.get("size"):
+        return False
+    if current["mtime_ns"] == source.get("mtime_ns"):
+        return True
+    return bool(source.get("sha256")) and file_sha256(path) == source["sha256"]
+
+
+def _save_column(cache_dir, idx, name, series):
+    """Write one column as .npy file(s) and return its manifest entry."""
+    entry = {"name": name, "file": f"col_{idx:03d}.npy"}
+    target = os.path.join(cache_dir, entry["file"])
+    dtype = series.dtype
+
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        entry["kind"] = "datetime"
+        entry["tz"] = str(dtype.tz)
+        np.save(target, series.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy())
+    elif pd.api.types.is_datetime64_dtype(dtype):
+        entry["kind"] = "datetime"
+        np.save(target, series.to_numpy())
+    elif isinstance(dtype, pd.CategoricalDtype) or dtype == object:
+        if dtype == object:
+            inferred = pd.api.types.infer_dtype(series, skipna=True)
+            if inferred not in ("string", "empty"):
+                raise CacheUnsupported(f"column {name!r} holds {inferred} values")
+            cat = pd.Categorical(series)
+            entry["kind"] = "string"
+        else:
+            cat = series.array
+            if pd.api.types.infer_dtype(cat.categories, skipna=True) not in ("string", "empty"):
+                raise CacheUnsupported(f"column {name!r} has non-string categories")
+            entry["kind"] = "category"
+            entry["ordered"] = bool(cat.ordered)
+        entry["categories"] = f"col_{idx:03d}.categories.npy"
+        np.save(target, cat.codes)
+        np.save(os.path.join(cache_dir, entry["categories"]),
+                np.asarray(cat.categories, dtype=str))
+    elif isinstance(dtype, np.dtype) and dtype.kind in "biuf":
+        entry["kind"] = "numeric"
+        np.save(target, series.to_numpy())
+    else:
+        raise CacheUnsupported(f"column {name!r} has unsupported dtype {dtype}")
+
+    entry["dtype"] = str(dtype)
+    return entry
+
+
+def _load_column(cache_dir, entry):
+    values = np.load(os.path.join(cache_dir, entry["file"]), allow_pickle=False)
+    kind = entry["kind"]
+    if kind == "datetime":
+        series = pd.Series(values)
+        if entry.get("tz"):
+            series = series.dt.tz_localize("UTC").dt.tz_convert(entry["tz"])
+        return series
+    if kind in ("string", "category"):
+        categories = np.load(os.path.join(cache_dir, entry["categories"]), allow_pickle=False)
+        cat = pd.Categorical.from_codes(values, categories=categories.astype(object),
+                                        ordered=entry.get("ordered", False))
+        if kind == "string":
+            return pd.Series(np.asarray(cat, dtype=object))
+        return pd.Series(cat)
+    return pd.Series(values)
+
+
+def write_cache(df, cache_dir, fingerprint, options=None):
+    """
+    Store every column of df as its own .npy file under cache_dir.
+    The cache is built in a sibling temp directory and swapped in at the end,
+    so readers never see a half-written cache.
+    """
+    tmp_dir = f"{cache_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    try:
+        entries = [_save_column(tmp_dir, i, col, df[col]) for i, col in enumerate(df.columns)]
+        manifest = {
+            "version": CACHE_VERSION,
+            "source": fingerprint,
+            "options": options or {},
+            "n_rows": len(df),
+            "columns": entries,
+        }
+        _write_manifest(tmp_dir, manifest)
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        os.replace(tmp_dir, cache_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    log.info("Wrote columnar cache for %d rows x %d columns to %s", len(df), len(entries), cache_dir)
+    return manifest
+
+
+def read_cache(cache_dir, manifest, columns=None):
+    """Load the cached columns (all of them, or only those requested) into a DataFrame."""
+    entries = {e["name"]: e for e in manifest["columns"]}
+    if columns is None:
+        columns = [e["name"] for e in manifest["columns"]]
+    missing = [c for c in columns if c not in entries]
+    if missing:
+        raise ValueError(f"Columns not found in cached data: {missing}")
+    return pd.DataFrame({c: _load_column(cache_dir, entries[c]) for c in columns})
+
+
+def load_cached(path, reader, columns=None, cache_dir=None, options=None):
+    """
+    Return the frame for path from its columnar cache, calling reader() to
+    parse the source and (re)build the cache when it is missing or stale.
+    options are the read settings that shape the parsed frame; changing them
+    invalidates the cache.
+    """
+    cache_dir = cache_dir or default_cache_dir(path)
+    manifest = _read_manifest(cache_dir)
+    if is_cache_valid(manifest, path, options):
+        mtime_ns = file_fingerprint(path)["mtime_ns"]
+        if manifest["source"].get("mtime_ns") != mtime_ns:
+            # Same content under a new mtime: refresh so the next check is cheap again
+            manifest["source"]["mtime_ns"] = mtime_ns
+            _write_manifest(cache_dir, manifest)
+        log.info("Cache hit for %s", path)
+        return read_cache(cache_dir, manifest, columns)
+
+    log.info("Cache miss for %s; parsing source.", path)
+    fingerprint = file_fingerprint(path, with_hash=True)
+    df = reader()
+    try:
+        write_cache(df, cache_dir, fingerprint, options)
+    except (CacheUnsupported, OSError) as exc:
+        log.warning("Could not cache %s: %s", path, exc)
+    if columns is not None:
+        missing = [c for c in columns if c not in df.columns]
+        if missing:
+            raise ValueError(f"Columns not found in {path}: {missing}")
+        df = df[list(columns)]
+    return df
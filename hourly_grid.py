@@ -0,0 +1,159 @@
+# hourly_grid.py
+
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from data_loader import daily_agg_funcs, finish_daily
+from hazard_forecast import HAZARD_RULES, rule_limit
+
+log = logging.getLogger()
+
+HOUR = pd.Timedelta(hours=1)
+
+
+@dataclass
+class HourlyGrid:
+    """
+    Hourly columns laid out on a complete grid of n_days x 24 hours starting at
+    first_day 00:00. Slot i is first_day + i hours; present[i] is False where
+    the source had no row. Missing float slots hold NaN, missing bool slots False.
+    """
+    first_day: pd.Timestamp
+    n_days: int
+    values: dict
+    present: np.ndarray
+    dtypes: dict
+    gaps: pd.DataFrame
+
+
+def build_hourly_grid(df, columns=None):
+    """
+    Reindex cleaned hourly data (one row per on-the-hour dt_iso) onto a regular
+    hourly grid. columns defaults to every numeric and bool column.
+    The gap report lists each run of missing hours between two records.
+    """
+    ts = pd.to_datetime(df['dt_iso'])
+    valid = ts.notna().to_numpy()
+    ts = ts[valid]
+    if (ts != ts.dt.floor('h')).any():
+        raise ValueError("dt_iso values must fall on the hour")
+    if ts.duplicated().any():
+        raise ValueError("dt_iso has duplicate timestamps; resolve them first (clean_data.resolve_duplicates)")
+    if columns is None:
+        columns = [c for c in df.columns
+                   if c != 'dt_iso' and (pd.api.types.is_numeric_dtype(df[c]) or pd.api.types.is_bool_dtype(df[c]))]
+
+    first_day = ts.min().normalize()
+    slot = ((ts - first_day) // HOUR).to_numpy()
+    n_days = int(slot.max()) // 24 + 1
+    present = np.zeros(n_days * 24, dtype=bool)
+    present[slot] = True
+
+    values, dtypes = {}, {}
+    for col in columns:
+        src = df[col].to_numpy()[valid]
+        dtypes[col] = src.dtype
+        if src.dtype == bool:
+            arr = np.zeros(n_days * 24, dtype=bool)
+        else:
+            arr = np.full(n_days * 24, np.nan, dtype=src.dtype if src.dtype.kind == 'f' else 'float64')
+        arr[slot] = src
+        values[col] = arr
+
+    sorted_slots = np.sort(slot)
+    step = np.diff(sorted_slots)
+    at = np.flatnonzero(step > 1)
+    gaps = pd.DataFrame({
+        'gap_start': first_day + (sorted_slots[at] + 1) * HOUR,
+        'gap_end': first_day + (sorted_slots[at + 1] - 1) * HOUR,
+        'n_hours': step[at] - 1,
+    })
+    log.info("Hourly grid: %d days, %d of %d hours present, %d gaps.",
+             n_days, present.sum(), present.size, len(gaps))
+    return HourlyGrid(first_day=first_day, n_days=n_days, values=values,
+                      present=present, dtypes=dtypes, gaps=gaps)
+
+
+def day_view(grid, col):
+    """(n_days, 24) view of one column; no data is copied."""
+    return grid.values[col].reshape(grid.n_days, 24)
+
+
+def working_hours_view(grid, col, work_start=7, work_end=17):
+    """(n_days, work_end - work_start) view of one column for hours work_start..work_end-1."""
+    return day_view(grid, col)[:, work_start:work_end]
+
+
+def grid_dates(grid, days=None):
+    days = np.arange(grid.n_days) if days is None else days
+    return (grid.first_day + pd.to_timedelta(days, unit='D')).date
+
+
+def _reduce_day(view, func):
+    # Sums and means accumulate in float64 and round once, as aggregate_daily does
+    if func == 'mean':
+        count = (~np.isnan(view)).sum(axis=1)
+        total = np.nansum(view, axis=1, dtype=np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (total / count).astype(view.dtype)
+    if func == 'min':
+        return np.fmin.reduce(view, axis=1)
+    if func == 'max':
+        return np.fmax.reduce(view, axis=1)
+    if func == 'sum':
+        return np.nansum(view, axis=1, dtype=np.float64).astype(view.dtype)
+    if func == 'any':
+        return view.any(axis=1)
+    raise ValueError(f"Unsupported aggregation {func!r}")
+
+
+def grid_daily_aggregate(grid):
+    """
+    aggregate_daily on the grid: every aggregate is one reduction along the
+    hour axis of a (n_days, 24) view. Days without any rows are left out.
+    """
+    days = np.flatnonzero(grid.present.reshape(grid.n_days, 24).any(axis=1))
+    columns = {}
+    for col, funcs in daily_agg_funcs(grid.values).items():
+        view = day_view(grid, col)[days]
+        for func in ([funcs] if isinstance(funcs, str) else funcs):
+            result = _reduce_day(view, func)
+            src = grid.dtypes[col]
+            if func in ('min', 'max', 'sum') and src.kind in 'iu':
+                # integer input stays integer, as in the groupby
+                result = result.astype('int64')
+            columns[(col, func)] = result
+    daily = pd.DataFrame(columns, index=pd.Index(grid_dates(grid, days), name='date'))
+    return finish_daily(daily)
+
+
+def grid_daily_hazards(grid, thresholds, work_start=7, work_end=17):
+    """
+    filter_working_hours -> flag_hourly_hazards -> flag_daily_hazards on the
+    grid: a column slice for the working hours, a comparison, and a sum along
+    the hour axis per hazard type.
+    """
+    if not 0 <= work_start < work_end <= 24:
+        raise ValueError(f"grid working hours must satisfy 0 <= start < end <= 24, got {work_start}-{work_end}")
+    rows = grid.present.reshape(grid.n_days, 24)[:, work_start:work_end]
+    days = np.flatnonzero(rows.any(axis=1))
+    rows = rows[days]
+
+    daily = pd.DataFrame({'date': grid_dates(grid, days)})
+    any_hazard = np.zeros((len(days), work_end - work_start), dtype=bool)
+    for flag, key, col, default, op, fill_zero in HAZARD_RULES:
+        view = working_hours_view(grid, col, work_start, work_end)[days]
+        if fill_zero:
+            view = np.where(np.isnan(view), 0, view)
+        limit = rule_limit(thresholds, key, default, view)
+        hit = (view >= limit if op == '>=' else view <= limit) & rows
+        any_hazard |= hit
+        daily[flag] = hit.sum(axis=1).astype('int64')
+    daily['is_hazard'] = any_hazard.sum(axis=1).astype('int64')
+    daily['year'] = pd.to_datetime(daily['date']).dt.year
+    daily['month'] = pd.to_datetime(daily['date']).dt.month
+    daily['day'] = pd.to_datetime(daily['date']).dt.day
+    return daily
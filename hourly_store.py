@@ -0,0 +1,163 @@
+# hourly_store.py
+
+import logging
+import re
+import sqlite3
+
+import pandas as pd
+
+from data_loader import HOURLY_SCHEMA
+
+log = logging.getLogger()
+
+TABLE = "hourly"
+_NAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _quote(name):
+    if not _NAME_RE.match(name):
+        raise ValueError(f"Unsupported column name for the hourly store: {name!r}")
+    return f'"{name}"'
+
+
+def _sql_type(dtype):
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    return "TEXT"
+
+
+def connect(db_path):
+    """
+    Open (and create if needed) the hourly store. Rows are keyed by
+    (station, ts) with ts in epoch seconds; md = month * 100 + day is kept
+    alongside so calendar-window queries use the (station, md) index.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TABLE} (
+            station TEXT NOT NULL,
+            ts INTEGER NOT NULL,
+            md INTEGER NOT NULL,
+            PRIMARY KEY (station, ts)
+        ) WITHOUT ROWID
+    """)
+    conn.execute(f"CREATE INDEX IF NOT EXISTS {TABLE}_station_md ON {TABLE} (station, md)")
+    return conn
+
+
+def _store_columns(conn):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({TABLE})")]
+
+
+def upsert_hourly(conn, df, station):
+    """
+    Insert or update one station's hourly rows (e.g. clean_data.clean_hourly
+    output). Existing (station, dt_iso) rows take the new values; columns not
+    yet in the store are added. Tz-aware timestamps are stored as wall-clock
+    time, as the hazard kernel reads them.
+    """
+    ts = pd.to_datetime(df['dt_iso'])
+    if ts.dt.tz is not None:
+        ts = ts.dt.tz_localize(None)
+    keep = ts.notna().to_numpy()
+    df, ts = df[keep], ts[keep]
+    data_cols = [c for c in df.columns if c not in ('dt_iso', 'station')]
+
+    existing = set(_store_columns(conn))
+    for col in data_cols:
+        if col not in existing:
+            conn.execute(f"ALTER TABLE {TABLE} ADD COLUMN {_quote(col)} {_sql_type(df[col].dtype)}")
+
+    epoch = (ts.to_numpy().astype('datetime64[s]').astype('int64')).tolist()
+    md = (ts.dt.month * 100 + ts.dt.day).tolist()
+    values = [df[col].astype(object).where(df[col].notna(), None).tolist() for col in data_cols]
+    rows = zip([station] * len(epoch), epoch, md, *values)
+
+    cols = ['station', 'ts', 'md'] + data_cols
+    placeholders = ", ".join("?" * len(cols))
+    updates = ", ".join(f"{_quote(c)} = excluded.{_quote(c)}" for c in data_cols) or "md = excluded.md"
+    with conn:
+        conn.executemany(
+            f"INSERT INTO {TABLE} ({', '.join(_quote(c) for c in cols)}) VALUES ({placeholders}) "
+            f"ON CONFLICT (station, ts) DO UPDATE SET {updates}",
+            rows,
+        )
+    log.info("Upserted %d hourly rows for station %s.", len(epoch), station)
+    return len(epoch)
+
+
+def import_cleaned_csv(conn, path, station, chunksize=500_000):
+    """Upsert a cleaned hourly CSV (clean_data.py output) chunk by chunk."""
+    total = 0
+    for chunk in pd.read_csv(path, chunksize=chunksize, low_memory=False):
+        chunk['dt_iso'] = pd.to_datetime(chunk['dt_iso'], errors='coerce')
+        total += upsert_hourly(conn, chunk, station)
+    return total
+
+
+def _md_ranges(months=None, season=None):
+    """(low, high) md ranges for a list of months and/or a (month, day)-(month, day) season."""
+    ranges = []
+    for m in months or []:
+        ranges.append((m * 100 + 1, m * 100 + 31))
+    if season is not None:
+        (m0, d0), (m1, d1) = season
+        low, high = m0 * 100 + d0, m1 * 100 + d1
+        if low <= high:
+            ranges.append((low, high))
+        else:  # wraps past New Year, e.g. Dec 15 - Jan 15
+            ranges += [(low, 1231), (101, high)]
+    return ranges
+
+
+def build_query(station, columns=None, start=None, end=None, months=None, season=None, available=None):
+    """SQL and parameters for load_hourly_store; every filter is pushed into the WHERE clause."""
+    if columns is None:
+        columns = [c for c in (available or []) if c not in ('station', 'ts', 'md')]
+    select = ", ".join(["ts"] + [_quote(c) for c in columns if c != 'dt_iso'])
+    where, params = ["station = ?"], [station]
+    if start is not None:
+        where.append("ts >= ?")
+        params.append(int(pd.Timestamp(start).timestamp()))
+    if end is not None:
+        where.append("ts < ?")
+        params.append(int(pd.Timestamp(end).timestamp()))
+    ranges = _md_ranges(months, season)
+    source = TABLE
+    if ranges:
+        where.append("(" + " OR ".join("md BETWEEN ? AND ?" for _ in ranges) + ")")
+        params += [v for r in ranges for v in r]
+        if start is None and end is None:
+            # ORDER BY ts would otherwise pull the planner onto the primary key
+            source = f"{TABLE} INDEXED BY {TABLE}_station_md"
+    sql = f"SELECT {select} FROM {source} WHERE {' AND '.join(where)} ORDER BY ts"
+    return sql, params
+
+
+def load_hourly_store(conn, station, columns=None, start=None, end=None, months=None, season=None,
+                      schema=HOURLY_SCHEMA):
+    """
+    Counterpart of load_hourly_csv for the store. Returns dt_iso plus the
+    requested columns (all by default) with schema dtypes, reading only rows
+    in [start, end), in the given months, and/or in season
+    ((month, day), (month, day)), which may wrap past New Year.
+    """
+    available = _store_columns(conn)
+    if columns is not None:
+        missing = [c for c in columns if c != 'dt_iso' and c not in available]
+        if missing:
+            raise ValueError(f"Columns not found in hourly store: {missing}")
+    sql, params = build_query(station, columns, start, end, months, season, available)
+    df = pd.read_sql_query(sql, conn, params=params)
+    df.insert(0, 'dt_iso', pd.to_datetime(df.pop('ts'), unit='s'))
+    for col in df.columns[1:]:
+        if col in (schema or {}):
+            dtype = schema[col]
+            if dtype.startswith('int') and df[col].isna().any():
+                continue
+            df[col] = df[col].astype(dtype)
+    log.info("Loaded %d rows x %d columns for station %s from the hourly store.", len(df), df.shape[1], station)
+    return df
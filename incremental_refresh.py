@@ -0,0 +1,117 @@
+# incremental_refresh.py
+
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from data_loader import add_thunderstorm_flag, aggregate_daily
+from hazard_forecast import HAZARD_COLS, forecast_col
+from hazard_kernel import fused_daily_hazards_from_frame
+
+log = logging.getLogger()
+
+
+@dataclass
+class RunningClimatology:
+    """
+    build_climatology kept as running totals: sums[month, day, k] is the total
+    HAZARD_COLS[k] hours and counts[month, day] the number of years seen for
+    that calendar day within min_year..max_year. Updated in place.
+    """
+    min_year: int
+    max_year: int
+    sums: np.ndarray
+    counts: np.ndarray
+
+
+@dataclass
+class IncrementalState:
+    """Everything a daily refresh updates: the daily aggregate, the hazard daily table and the climatology."""
+    daily: pd.DataFrame
+    daily_hazards: pd.DataFrame
+    climatology: RunningClimatology
+    thresholds: dict
+    work_start: int = 7
+    work_end: int = 17
+
+
+def running_climatology(daily_hazards, min_year=1979, max_year=2024):
+    clim = RunningClimatology(
+        min_year=min_year, max_year=max_year,
+        sums=np.zeros((13, 32, len(HAZARD_COLS)), dtype=np.int64),
+        counts=np.zeros((13, 32), dtype=np.int64),
+    )
+    _add_days(clim, daily_hazards, sign=1)
+    return clim
+
+
+def _add_days(clim, daily_hazards, sign):
+    in_range = (daily_hazards['year'] >= clim.min_year) & (daily_hazards['year'] <= clim.max_year)
+    rows = daily_hazards[in_range]
+    month, day = rows['month'].to_numpy(), rows['day'].to_numpy()
+    np.add.at(clim.sums, (month, day), sign * rows[HAZARD_COLS].to_numpy(dtype=np.int64))
+    np.add.at(clim.counts, (month, day), sign)
+
+
+def climatology_table(clim):
+    """The build_climatology table (same index, columns and values) from running totals."""
+    month, day = np.nonzero(clim.counts)
+    counts = clim.counts[month, day]
+    out = pd.DataFrame(clim.sums[month, day] / counts[:, None],
+                       index=pd.MultiIndex.from_arrays([month.astype('int32'), day.astype('int32')],
+                                                     names=['month', 'day']),
+                       columns=[forecast_col(col) for col in HAZARD_COLS])
+    out.insert(0, 'n_years', counts)
+    return out
+
+
+def affected_dates(new_hourly):
+    """Distinct calendar dates touched by newly appended hourly rows."""
+    return pd.Index(pd.to_datetime(new_hourly['dt_iso']).dt.date.dropna().unique())
+
+
+def affected_range(new_hourly):
+    """[start, end) covering every affected date, e.g. for hourly_store.load_hourly_store."""
+    dates = affected_dates(new_hourly)
+    return pd.Timestamp(dates.min()), pd.Timestamp(dates.max()) + pd.Timedelta(days=1)
+
+
+def replace_dates(table, updated, date_col):
+    """Swap the rows of the updated dates in a per-date table, keeping it sorted by date."""
+    kept = table[~table[date_col].isin(updated[date_col])]
+    out = pd.concat([kept, updated], ignore_index=True)
+    if len(kept) and len(updated) and updated[date_col].min() <= kept[date_col].max():
+        out = out.sort_values(date_col, kind='stable').reset_index(drop=True)
+    return out
+
+
+def refresh(state, hourly_days):
+    """
+    Bring state up to date after new hourly rows arrived. hourly_days holds
+    every hourly row (old and new) of the dates the new rows touch, e.g.
+    load_hourly_store(conn, station, start=..., end=...) over affected_range;
+    only those dates are recomputed, so the cost follows the new data, not
+    the archive.
+    """
+    dates = affected_dates(hourly_days)
+    daily = aggregate_daily(add_thunderstorm_flag(hourly_days.copy()))
+    state.daily = replace_dates(state.daily, daily, 'date_')
+
+    hazards = fused_daily_hazards_from_frame(hourly_days, state.thresholds, state.work_start, state.work_end)
+    old = state.daily_hazards[state.daily_hazards['date'].isin(dates)]
+    _add_days(state.climatology, old, sign=-1)
+    _add_days(state.climatology, hazards, sign=1)
+    state.daily_hazards = replace_dates(state.daily_hazards, hazards, 'date')
+    log.info("Incremental refresh: %d dates recomputed from %d hourly rows.", len(dates), len(hourly_days))
+    return state
+
+
+def refresh_from_store(state, conn, station, new_hourly):
+    """Upsert new hourly rows into the hourly store, then refresh state from the affected dates only."""
+    from hourly_store import load_hourly_store, upsert_hourly
+
+    upsert_hourly(conn, new_hourly, station)
+    start, end = affected_range(new_hourly)
+    return refresh(state, load_hourly_store(conn, station, start=start, end=end))
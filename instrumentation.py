@@ -0,0 +1,177 @@
+# instrumentation.py
+
+import cProfile
+import functools
+import io
+import json
+import logging
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+
+log = logging.getLogger()
+
+LOG_FORMAT = "%(asctime)s | %(levelname)s | %(message)s"
+
+
+def setup_logging(name, level=logging.INFO, log_dir="logs"):
+    """
+    Log to <log_dir>/<name>.log. Called by each script's entry point rather
+    than at import, so importing a module never takes over the root logger.
+    Repeated calls for the same file are no-ops.
+    """
+    os.makedirs(log_dir, exist_ok=True)
+    path = os.path.abspath(os.path.join(log_dir, f"{name}.log"))
+    root = logging.getLogger()
+    root.setLevel(level)
+    if not any(getattr(h, 'baseFilename', None) == path for h in root.handlers):
+        handler = logging.FileHandler(path, mode="w")
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        root.addHandler(handler)
+    return root
+
+
+@dataclass
+class StageStats:
+    """Totals for one pipeline stage across its calls; peak_bytes is the largest tracemalloc peak of a call."""
+    calls: int = 0
+    seconds: float = 0.0
+    rows_in: int = 0
+    rows_out: int = 0
+    peak_bytes: int = 0
+
+
+class StageMetrics:
+    """
+    Per-stage wall time, rows in/out and (with trace_memory) tracemalloc
+    peak, filled in by functions decorated with @stage while enabled.
+    Disabled, a decorated call costs one attribute check.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_memory = False
+        self.stages = {}
+        self._peaks = []  # open stages' peaks, innermost last
+
+    def enable(self, trace_memory=False):
+        self.enabled = True
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        return self
+
+    def disable(self):
+        self.enabled = False
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.trace_memory = False
+
+    def reset(self):
+        self.stages = {}
+
+    @contextmanager
+    def measure(self, name, rows_in=0):
+        """Time a block as stage name; set result['rows_out'] inside it to record output rows."""
+        result = {'rows_out': 0}
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # Fold the peak so far into the enclosing stages before resetting it
+            self._peaks = [max(p, peak) for p in self._peaks]
+            tracemalloc.reset_peak()
+            self._peaks.append(current)
+            start_bytes = current
+        started = time.perf_counter()
+        try:
+            yield result
+        finally:
+            elapsed = time.perf_counter() - started
+            stats = self.stages.setdefault(name, StageStats())
+            stats.calls += 1
+            stats.seconds += elapsed
+            stats.rows_in += rows_in
+            stats.rows_out += result['rows_out']
+            if self.trace_memory:
+                peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+                self._peaks = [max(p, peak) for p in self._peaks]
+                stats.peak_bytes = max(stats.peak_bytes, peak - start_bytes)
+
+    def as_dict(self):
+        return {name: asdict(stats) for name, stats in self.stages.items()}
+
+    def to_json(self, path=None):
+        text = json.dumps({'stages': self.as_dict()}, indent=2)
+        if path:
+            with open(path, "w") as fh:
+                fh.write(text)
+        return text
+
+    def to_prometheus(self, path=None, prefix="weather_pipeline"):
+        """Prometheus text exposition format, one series per stage and metric."""
+        metrics = [
+            ('calls_total', 'counter', 'Stage calls', 'calls'),
+            ('seconds_total', 'counter', 'Wall time spent in the stage', 'seconds'),
+            ('rows_in_total', 'counter', 'Rows passed into the stage', 'rows_in'),
+            ('rows_out_total', 'counter', 'Rows returned by the stage', 'rows_out'),
+            ('peak_bytes', 'gauge', 'Largest tracemalloc peak of one stage call', 'peak_bytes'),
+        ]
+        lines = []
+        for suffix, kind, help_text, field in metrics:
+            metric = f"{prefix}_stage_{suffix}"
+            lines += [f"# HELP {metric} {help_text}.", f"# TYPE {metric} {kind}"]
+            for name, stats in self.stages.items():
+                lines.append(f'{metric}{{stage="{name}"}} {getattr(stats, field)}')
+        text = "\n".join(lines) + "\n"
+        if path:
+            with open(path, "w") as fh:
+                fh.write(text)
+        return text
+
+
+METRICS = StageMetrics()
+
+
+def _rows(value):
+    return len(value) if hasattr(value, 'shape') else 0
+
+
+def stage(func=None, *, name=None):
+    """Record calls of a pipeline function in METRICS: rows in from its first argument, rows out from its result."""
+    if func is None:
+        return functools.partial(stage, name=name)
+    stage_name = name or func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not METRICS.enabled:
+            return func(*args, **kwargs)
+        with METRICS.measure(stage_name, _rows(args[0]) if args else 0) as result:
+            value = func(*args, **kwargs)
+            result['rows_out'] = _rows(value)
+        return value
+    return wrapper
+
+
+@contextmanager
+def profiled(path=None, top=25, sort="cumulative"):
+    """
+    Opt-in cProfile of a block. Writes the raw stats to path (for snakeviz
+    or pstats) plus a path + ".txt" listing of the top hot paths, and logs
+    that listing at DEBUG.
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats(sort).print_stats(top)
+        if path:
+            profiler.dump_stats(path)
+            with open(path + ".txt", "w") as fh:
+                fh.write(out.getvalue())
+        log.debug("Profile (top %d by %s):\n%s", top, sort, out.getvalue())
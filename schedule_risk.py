@@ -0,0 +1,127 @@
+# schedule_risk.py
+
+import logging
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from backtest import daily_series
+from hazard_forecast import HAZARD_COLS
+
+log = logging.getLogger()
+
+WEEKDAYS = (0, 1, 2, 3, 4)
+
+
+@dataclass
+class Task:
+    """
+    One step of a project plan: work_days productive days, lost on any work
+    day with at least lost_hours hours of one of its hazard types
+    (HAZARD_COLS names, e.g. 'is_rain_1h_hazard').
+    """
+    name: str
+    work_days: int
+    hazards: list = field(default_factory=lambda: ['is_hazard'])
+    lost_hours: int = 1
+
+
+@dataclass
+class ScheduleResult:
+    """finish[s, t]: day offset from start_date on which task t of scenario s finishes (-1 if past the horizon)."""
+    start_date: pd.Timestamp
+    tasks: list
+    finish: np.ndarray
+
+    @property
+    def completion(self):
+        return self.finish[:, -1]
+
+
+def _lost_days(values, task):
+    cols = [HAZARD_COLS.index(h) for h in task.hazards]
+    hours = np.nan_to_num(values[:, cols], nan=0.0)  # no record: no hazard
+    return (hours >= task.lost_hours).any(axis=1)
+
+
+def simulate_schedule(daily, start_date, tasks, n_scenarios=100_000, block_days=14, horizon=None,
+                      workdays=WEEKDAYS, min_year=1979, max_year=2024, seed=0, chunk=10_000):
+    """
+    Replay a plan of sequential tasks from start_date against resampled
+    history (flag_daily_hazards output). Each scenario is a block bootstrap:
+    every block_days-day stretch of the schedule takes its weather from the
+    same calendar stretch of a random year in min_year..max_year, keeping
+    seasonality and multi-day spells. Only days in workdays (Mon=0) count.
+
+    For each chunk of scenarios the lost-day flags are gathered into a
+    (scenarios x days) array and cumulated once per task; each task's finish
+    is where its good-day count reaches work_days past the previous task's
+    finish, found with one comparison against the whole array.
+    """
+    start_date = pd.Timestamp(start_date)
+    total_days = sum(t.work_days for t in tasks)
+    horizon = horizon or max(365, 3 * total_days)
+    dates, values = daily_series(daily)
+
+    # Series row of start_date's calendar day in each candidate year
+    anchors = {}
+    for year in range(min_year, max_year + 1):
+        try:
+            day = start_date.replace(year=year)
+        except ValueError:  # Feb 29 in a non-leap year
+            day = pd.Timestamp(year, 3, 1)
+        pos = (day - dates[0]).days
+        if 0 <= pos and pos + horizon <= len(dates):
+            anchors[year] = pos
+    if not anchors:
+        raise ValueError(f"No year in {min_year}-{max_year} has {horizon} days of history from "
+                         f"{start_date:%m-%d}")
+    anchor = np.array(list(anchors.values()))
+
+    lost = [_lost_days(values, task) for task in tasks]
+    offsets = np.arange(horizon)
+    workday = np.isin((start_date.dayofweek + offsets) % 7, workdays)
+    n_blocks = -(-horizon // block_days)
+    rng = np.random.default_rng(seed)
+
+    finish = np.empty((n_scenarios, len(tasks)), dtype=np.int32)
+    for lo in range(0, n_scenarios, chunk):
+        n = min(chunk, n_scenarios - lo)
+        years = rng.integers(0, len(anchor), size=(n, n_blocks))
+        rows = anchor[years][:, offsets // block_days] + offsets  # (n, horizon) series rows
+        done = np.full(n, -1)  # offset the previous task finished on
+        for t, task in enumerate(tasks):
+            good = ~lost[t][rows] & workday
+            cum = np.cumsum(good, axis=1, dtype=np.int32)
+            before = np.where(done >= 0, cum[np.arange(n), np.clip(done, 0, horizon - 1)], 0)
+            end = (cum < (before + task.work_days)[:, None]).sum(axis=1)
+            end[(end >= horizon) | (done >= horizon)] = horizon
+            finish[lo:lo + n, t] = end
+            done = end
+    finish[finish >= horizon] = -1
+    log.info("Simulated %d scenarios of %d tasks from %s over %d base years.",
+             n_scenarios, len(tasks), start_date.date(), len(anchor))
+    return ScheduleResult(start_date=start_date, tasks=list(tasks), finish=finish)
+
+
+def completion_summary(result, quantiles=(0.5, 0.8, 0.9, 0.95)):
+    """Finish date quantiles per task (NaT when a quantile falls past the horizon), plus the share that finished."""
+    rows = []
+    for t, task in enumerate(result.tasks):
+        finish = result.finish[:, t].astype(np.float64)
+        finish[finish < 0] = np.inf
+        row = {'task': task.name, 'finished_share': float(np.isfinite(finish).mean())}
+        for q in quantiles:
+            offset = np.quantile(finish, q, method='higher')
+            row[f"p{int(round(q * 100))}"] = (result.start_date + pd.Timedelta(days=int(offset))).date() \
+                if np.isfinite(offset) else pd.NaT
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def probability_late(result, deadline):
+    """Share of scenarios whose last task finishes after deadline (or not within the horizon)."""
+    limit = (pd.Timestamp(deadline) - result.start_date).days
+    completion = result.completion
+    return float(((completion < 0) | (completion > limit)).mean())
@@ -0,0 +1,155 @@
+# stage_cache.py
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from hazard_forecast import (HAZARD_RULES, filter_working_hours, flag_daily_hazards,
+                             flag_hourly_hazards, forecast_hazards)
+
+log = logging.getLogger()
+
+STAGE_CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+
+def frame_fingerprint(df):
+    """Content hash of a DataFrame: column names, dtypes, index and every value."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def stage_key(stage, input_key, params):
+    """Key of a stage result: the stage, its input's key and its parameters."""
+    payload = json.dumps([STAGE_CACHE_VERSION, stage, input_key, params], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def resolved_thresholds(thresholds):
+    """Thresholds with HAZARD_RULES defaults filled in, so {} and the explicit defaults share a key."""
+    return {key: thresholds.get(key, default) for _, key, _, default, _, _ in HAZARD_RULES}
+
+
+@dataclass
+class StageCache:
+    """
+    On-disk memo of pipeline stage results, one pickle per key under
+    cache_dir. Reading a result bumps its mtime; once the directory grows past
+    max_bytes the least recently used results are evicted.
+    """
+    cache_dir: str
+    max_bytes: int = DEFAULT_MAX_BYTES
+    stats: dict = field(default_factory=dict)
+    evictions: int = 0
+
+    def __post_init__(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".pkl")
+
+    def record(self, stage, outcome):
+        counts = self.stats.setdefault(stage, {'hits': 0, 'misses': 0})
+        counts[outcome] += 1
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
+
+    def load(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fh:
+                value = pickle.load(fh)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        os.utime(path)
+        return value
+
+    def store(self, key, value):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._path(key))
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used results until the cache fits in max_bytes."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".pkl"):
+                st = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((st.st_mtime_ns, st.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            total -= size
+            self.evictions += 1
+            log.debug("Evicted stage cache entry %s (%d bytes).", name, size)
+
+    def summary(self):
+        """Hit/miss counts per stage plus the overall hit rate and the cache size on disk."""
+        hits = sum(v['hits'] for v in self.stats.values())
+        misses = sum(v['misses'] for v in self.stats.values())
+        size = sum(os.path.getsize(os.path.join(self.cache_dir, n))
+                   for n in os.listdir(self.cache_dir) if n.endswith(".pkl"))
+        return {
+            'stages': self.stats,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'evictions': self.evictions,
+            'bytes': size,
+        }
+
+
+def cached_forecast(df, cache, thresholds, start_date, end_date, work_start=7, work_end=17,
+                    min_year=1979, max_year=2024, input_key=None):
+    """
+    filter_working_hours -> flag_hourly_hazards -> flag_daily_hazards ->
+    forecast_hazards through a StageCache. Stage keys chain from the input
+    fingerprint, so they are known up front: the run resumes after the last
+    stage already cached and recomputes only the stages downstream of a
+    changed parameter; the stage it resumes from counts as a hit, every
+    recomputed stage as a miss. Pass input_key to skip hashing df.
+    """
+    stages = [
+        ('filter_working_hours', lambda x: filter_working_hours(x, work_start, work_end),
+         {'work_start': work_start, 'work_end': work_end}),
+        ('flag_hourly_hazards', lambda x: flag_hourly_hazards(x, thresholds),
+         {'thresholds': resolved_thresholds(thresholds)}),
+        ('flag_daily_hazards', flag_daily_hazards, {}),
+        ('forecast_hazards', lambda x: forecast_hazards(x, start_date, end_date, min_year, max_year),
+         {'start_date': start_date, 'end_date': end_date, 'min_year': min_year, 'max_year': max_year}),
+    ]
+    keys = []
+    key = input_key or frame_fingerprint(df)
+    for name, _, params in stages:
+        key = stage_key(name, key, params)
+        keys.append(key)
+
+    value, resume = df, 0
+    for i in range(len(stages) - 1, -1, -1):
+        if keys[i] in cache:
+            cached = cache.load(keys[i])
+            if cached is not None:
+                value, resume = cached, i + 1
+                cache.record(stages[i][0], 'hits')
+                break
+
+    for i in range(resume, len(stages)):
+        name, func, _ = stages[i]
+        value = func(value)
+        cache.store(keys[i], value)
+        cache.record(name, 'misses')
+    log.info("Stage cache: resumed after %d of %d stages.", resume, len(stages))
+    return value
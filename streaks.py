@@ -0,0 +1,97 @@
+# streaks.py
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from hazard_cube import calendar_slot
+
+log = logging.getLogger()
+
+MIN_DAYS = (3, 5, 7)
+
+
+def run_lengths(flags, segments):
+    """
+    Runs of consecutive True in flags that stay within one segment id:
+    (start positions, lengths). segments must be non-decreasing.
+    """
+    flags = np.asarray(flags, dtype=bool)
+    new_segment = np.r_[True, segments[1:] != segments[:-1]]
+    starts = np.flatnonzero(flags & (new_segment | ~np.r_[False, flags[:-1]]))
+    ends = np.flatnonzero(flags & (np.r_[new_segment[1:], True] | ~np.r_[flags[1:], False]))
+    return starts, ends - starts + 1
+
+
+def calendar_window(dates, window='month'):
+    """Window label of each date: 'month' (1-12), 'week' (0-52, 7-day blocks of the leap calendar) or 'year' (0)."""
+    if window == 'month':
+        return dates.month.to_numpy()
+    if window == 'week':
+        return calendar_slot(dates.month, dates.day) // 7
+    if window == 'year':
+        return np.zeros(len(dates), dtype=np.int64)
+    raise ValueError(f"Unknown calendar window {window!r}; expected 'month', 'week' or 'year'")
+
+
+def streak_table(daily, col='is_hazard', lost_hours=1, window='month', min_days=MIN_DAYS,
+                 date_col='date', station_col='station'):
+    """
+    Hazard and workable streaks per station, year and calendar window.
+    A day is a hazard day when col >= lost_hours, e.g. hazard hours from
+    flag_daily_hazards or thunderstorm_day (with date_col='date_') from
+    aggregate_daily; every other recorded day is workable. Streaks stop at
+    window edges and at missing days. daily may hold many stations in a
+    station_col column; all runs come from one run-length encoding of the
+    sorted table.
+
+    Columns: [station,] year, window, days, longest_hazard, longest_workable,
+    and hazard_streaks_<N> / workable_streaks_<N>, the number of streaks of
+    at least N days, for N in min_days.
+    """
+    keys = [station_col] if station_col in daily.columns else []
+    frame = pd.DataFrame({'date': pd.to_datetime(daily[date_col]), 'hazard': daily[col].to_numpy() >= lost_hours})
+    for key in keys:
+        frame[key] = daily[key].to_numpy()
+    frame = frame.sort_values(keys + ['date'], kind='stable').reset_index(drop=True)
+    dates = pd.DatetimeIndex(frame['date'])
+    frame['year'] = dates.year
+    frame['window'] = calendar_window(dates, window)
+
+    group_cols = keys + ['year', 'window']
+    new_group = np.zeros(len(frame), dtype=bool)
+    new_group[:1] = True  # no rows gives an empty table
+    for c in group_cols:
+        values = frame[c].to_numpy()
+        new_group[1:] |= values[1:] != values[:-1]
+    group = np.cumsum(new_group) - 1
+    gap = np.r_[True, np.diff(dates.asi8) != 86_400 * 10**9]
+    segments = np.cumsum(new_group | gap)
+
+    table = frame.loc[new_group, group_cols].reset_index(drop=True)
+    table['days'] = np.bincount(group, minlength=len(table))
+    hazard = frame['hazard'].to_numpy()
+    for name, flags in (('hazard', hazard), ('workable', ~hazard)):
+        starts, lengths = run_lengths(flags, segments)
+        owner = group[starts]
+        longest = np.zeros(len(table), dtype=np.int64)
+        np.maximum.at(longest, owner, lengths)
+        table[f'longest_{name}'] = longest
+        for n in min_days:
+            table[f'{name}_streaks_{n}'] = np.bincount(owner, weights=lengths >= n, minlength=len(table)).astype(np.int64)
+    log.info("Streaks of %s >= %s over %d %s windows.", col, lost_hours, len(table), window)
+    return table
+
+
+def workable_window_probability(table, min_days=MIN_DAYS, station_col='station'):
+    """
+    Share of years whose window held at least one N-day workable streak, per
+    [station and] calendar window, for each N in min_days.
+    """
+    keys = [c for c in (station_col, 'window') if c in table.columns]
+    flags = pd.DataFrame({f'p_workable_{n}': table['longest_workable'] >= n for n in min_days})
+    flags[keys] = table[keys]
+    result = flags.groupby(keys).mean()
+    result['years'] = table.groupby(keys)['year'].nunique()
+    return result.reset_index()
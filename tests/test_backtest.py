@@ -0,0 +1,68 @@
+# tests/test_backtest.py
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+# Import backtest / hazard_forecast / synthetic_weather
+def import_modules():
+    import sys
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    sys.path.insert(0, root)
+    sys.path.insert(0, os.path.join(root, 'benchmarks'))
+    import backtest
+    import hazard_forecast
+    import synthetic_weather
+    return backtest, hazard_forecast, synthetic_weather
+
+backtest, hazard_forecast, synthetic_weather = import_modules()
+
+# --- Fixtures ---
+@pytest.fixture
+def daily():
+    return synthetic_weather.generate_daily_hazards(2015, 2022, hazard_forecast.HAZARD_COLS)
+
+# --- Tests ---
+def test_one_day_windows_match_forecast_without_the_year(daily):
+    starts, actual, forecast, _, _ = backtest.loo_window_forecasts(daily, 1, 2015, 2022)
+    for year in (2016, 2020):
+        others = daily[daily['year'] != year]
+        expected = hazard_forecast.forecast_hazards(others, f"{year}-01-01", f"{year}-12-31", 2015, 2022)
+        expected = expected.set_index(pd.to_datetime(expected['date']))
+        mask = starts.year == year
+        cols = [hazard_forecast.forecast_col(c) for c in hazard_forecast.HAZARD_COLS]
+        np.testing.assert_allclose(forecast[mask], expected.loc[starts[mask], cols].to_numpy())
+
+def test_week_windows_match_brute_force(daily):
+    starts, actual, forecast, low, high = backtest.loo_window_forecasts(daily, 7, 2015, 2022)
+    dates = pd.to_datetime(daily['date'])
+    series = pd.Series(daily['is_hazard'].to_numpy(), index=dates).asfreq('D')
+    k = hazard_forecast.HAZARD_COLS.index('is_hazard')
+
+    def total(start):
+        window = series[start:start + pd.Timedelta(days=6)]
+        return window.sum() if len(window) == 7 and window.notna().all() else np.nan
+
+    i = np.flatnonzero(starts == pd.Timestamp("2018-06-10"))[0]
+    assert actual[i, k] == total(pd.Timestamp("2018-06-10"))
+    other = [total(pd.Timestamp(f"{y}-06-10")) for y in range(2015, 2023) if y != 2018]
+    other = [t for t in other if not np.isnan(t)]
+    assert forecast[i, k] == pytest.approx(np.mean(other))
+    spread = 1.2815515655446004 * np.std(other, ddof=1)
+    assert high[i, k] == pytest.approx(np.mean(other) + spread)
+    assert low[i, k] == pytest.approx(max(np.mean(other) - spread, 0))
+
+def test_backtest_summary(daily):
+    result = backtest.backtest(daily, window_days=(1, 7), min_year=2015, max_year=2022, level=0.8)
+    assert len(result) == 2 * len(hazard_forecast.HAZARD_COLS)
+    assert set(result['hazard']) == {hazard_forecast.forecast_col(c) for c in hazard_forecast.HAZARD_COLS}
+    assert (result['mae'] > 0).all()
+    assert result['coverage'].between(0.5, 1).all()
+    assert (result.loc[result['window_days'] == 7, 'n_windows'] < result.loc[result['window_days'] == 1, 'n_windows'].iloc[0]).all()
+
+def test_full_archive():
+    # Timing lives in benchmarks/bench_daily_analyses.py
+    daily = synthetic_weather.generate_daily_hazards(1979, 2024, hazard_forecast.HAZARD_COLS, seed=1)
+    result = backtest.backtest(daily)
+    assert len(result) == len(backtest.WINDOW_DAYS) * len(hazard_forecast.HAZARD_COLS)
+    assert result['n_windows'].gt(0).all()
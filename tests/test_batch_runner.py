@@ -0,0 +1,69 @@
+# tests/test_batch_runner.py
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+# Import batch_runner / hazard_forecast
+def import_modules():
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    import batch_runner
+    import hazard_forecast
+    return batch_runner, hazard_forecast
+
+batch_runner, hazard_forecast = import_modules()
+
+def write_station(path, seed):
+    rng = np.random.default_rng(seed)
+    times = pd.date_range("2022-12-25", "2024-01-15 23:00", freq="h")
+    n = len(times)
+    pd.DataFrame({
+        'dt_iso': times.strftime('%Y-%m-%d %H:%M:%S +0000 UTC'),
+        'temp': rng.uniform(20, 90, n).round(2),
+        'feels_like': rng.uniform(10, 100, n).round(2),
+        'wind_speed': rng.uniform(0, 40, n).round(2),
+        'rain_1h': np.where(rng.random(n) < 0.1, rng.uniform(0, 1, n).round(2), np.nan),
+        'rain_3h': np.nan,
+        'snow_1h': np.nan,
+        'snow_3h': np.nan,
+        'weather_id': rng.choice([800, 211, 500], n),
+        'weather_main': 'Clear',
+        'weather_description': 'clear sky',
+    }).to_csv(path, index=False)
+
+# --- Fixtures ---
+@pytest.fixture
+def manifest_path(tmp_path):
+    write_station(tmp_path / "a.csv", 1)
+    write_station(tmp_path / "b.csv", 2)
+    pd.DataFrame({
+        'station': ['site_a', 'missing', 'site_b'],
+        'path': ['a.csv', 'does_not_exist.csv', str(tmp_path / "b.csv")],
+    }).to_csv(tmp_path / "manifest.csv", index=False)
+    return str(tmp_path / "manifest.csv")
+
+# --- Tests ---
+def test_run_batch(manifest_path, tmp_path):
+    out_dir = str(tmp_path / "out")
+    config = {'start_date': "2025-01-01", 'end_date': "2025-01-05", 'min_year': 2023, 'max_year': 2023}
+    summary = batch_runner.run_batch(manifest_path, out_dir, config=config, workers=2)
+    assert summary['station'].tolist() == ['site_a', 'missing', 'site_b']
+    assert summary['status'].tolist() == ['ok', 'failed', 'ok']
+    assert 'FileNotFoundError' in summary.loc[1, 'error']
+    assert (summary['seconds'] >= 0).all()
+    assert os.path.exists(os.path.join(out_dir, "summary.csv"))
+
+    forecast = pd.read_csv(os.path.join(out_dir, "site_a", "forecast.csv"))
+    assert len(forecast) == 5
+    assert summary.loc[0, 'window_wind_hr'] == pytest.approx(forecast['wind_hr'].sum())
+    daily = pd.read_csv(os.path.join(out_dir, "site_b", "daily_aggregated.csv"))
+    assert len(daily) == summary.loc[2, 'days']
+
+def test_read_manifest_requires_columns(tmp_path):
+    pd.DataFrame({'station': ['x']}).to_csv(tmp_path / "m.csv", index=False)
+    with pytest.raises(ValueError):
+        batch_runner.read_manifest(str(tmp_path / "m.csv"))
+
+if __name__ == "__main__":
+    pytest.main([__file__])
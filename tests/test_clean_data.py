@@ -0,0 +1,67 @@
+# tests/test_clean_data.py
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+# Import clean_data from data_explore_clean
+def import_clean_data():
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data_explore_clean')))
+    import clean_data
+    return clean_data
+
+clean_data = import_clean_data()
+
+# --- Fixtures ---
+@pytest.fixture
+def raw_hourly_df():
+    # Raw export rows, out of order, with duplicated timestamps and an empty column
+    data = {
+        'dt_iso': [
+            '2023-06-01 02:00:00 +0000 UTC',
+            '2023-06-01 00:00:00 +0000 UTC',
+            '2023-06-01 01:00:00 +0000 UTC',
+            '2023-06-01 01:00:00 +0000 UTC',  # identical duplicate
+            '2023-06-01 02:00:00 +0000 UTC',  # differing duplicate
+            '2023-06-01 03:00:00 +0000 UTC',
+            '2023-06-01 03:00:00 +0000 UTC',  # NaN vs value only
+            'not a date',
+        ],
+        'temp': [74.0, 70.0, 71.0, 71.0, 76.0, 60.0, 60.0, 50.0],
+        'rain_1h': [0.1, None, 0.2, 0.2, None, None, 0.4, None],
+        'sea_level': [None] * 8,
+        'weather_main': ['Rain', 'Clear', 'Clear', 'Clear', 'Thunderstorm', 'Rain', 'Rain', 'Clear'],
+    }
+    return pd.DataFrame(data)
+
+# --- Tests ---
+def test_clean_hourly(raw_hourly_df):
+    cleaned = clean_data.clean_hourly(raw_hourly_df)
+    assert cleaned.columns.tolist() == ['dt_iso', 'temp', 'rain_1h', 'weather_main']
+    assert len(cleaned) == 4
+    assert cleaned['dt_iso'].is_monotonic_increasing
+    # Identical duplicate keeps its row
+    assert cleaned.loc[1, 'temp'] == 71.0
+    # Differing duplicate: max for numeric, first for categorical
+    assert cleaned.loc[2, 'temp'] == 76.0
+    assert cleaned.loc[2, 'rain_1h'] == 0.1
+    assert cleaned.loc[2, 'weather_main'] == 'Rain'
+    # Rows that only differ by NaN count as identical and keep the first row
+    assert np.isnan(cleaned.loc[3, 'rain_1h'])
+
+def test_resolve_duplicates_without_duplicates(raw_hourly_df):
+    df = clean_data.parse_dt_iso(raw_hourly_df.iloc[[0, 1, 2]])
+    cleaned = clean_data.resolve_duplicates(df)
+    assert cleaned['temp'].tolist() == [70.0, 71.0, 74.0]
+
+def test_exact_copies_with_empty_column_are_not_conflicts(raw_hourly_df, caplog):
+    df = clean_data.parse_dt_iso(raw_hourly_df)  # sea_level stays, all NaN
+    with caplog.at_level('WARNING'):
+        cleaned = clean_data.resolve_duplicates(df)
+    assert "Aggregated 1 non-identical duplicate timestamps." in caplog.text
+    assert cleaned.loc[1, 'temp'] == 71.0
+    assert cleaned.loc[3, 'rain_1h'] == 0.4  # max branch, as the original script
+
+if __name__ == "__main__":
+    pytest.main([__file__])
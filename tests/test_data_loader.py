@@ -1,5 +1,6 @@
 # tests/test_data_loader.py
 import os
+import numpy as np
 import pandas as pd
 import pytest
 from datetime import datetime
@@ -37,6 +38,28 @@ def sample_hourly_df():
     df = pd.DataFrame(data)
     return df
 
+@pytest.fixture
+def fractional_hourly_df():
+    # Ten days of two-decimal readings; odd chunk sizes split most days between chunks
+    rng = np.random.default_rng(5)
+    times = pd.date_range("2023-06-01", periods=240, freq="h")
+    n = len(times)
+    reading = lambda low, high: rng.uniform(low, high, n).round(2)
+    return pd.DataFrame({
+        'dt_iso': times,
+        'temp': reading(40, 100),
+        'temp_min': reading(40, 100),
+        'temp_max': reading(40, 100),
+        'wind_speed': reading(0, 40),
+        'wind_gust': reading(0, 50),
+        'rain_1h': np.where(rng.random(n) < 0.3, reading(0, 1), np.nan),
+        'rain_3h': np.where(rng.random(n) < 0.2, reading(0, 2), np.nan),
+        'snow_1h': np.where(rng.random(n) < 0.1, reading(0, 1), np.nan),
+        'snow_3h': np.nan,
+        'weather_main': rng.choice(['Clear', 'Rain', 'Thunderstorm'], n),
+        'weather_description': 'n/a',
+    })
+
 # --- Tests ---
 def test_add_thunderstorm_flag(sample_hourly_df):
     df = data_loader.add_thunderstorm_flag(sample_hourly_df.copy())
@@ -71,5 +94,57 @@ def test_aggregate_daily(sample_hourly_df):
     d2 = daily.iloc[1]
     assert d2['thunderstorm_day'] == True
 
+@pytest.mark.parametrize("chunksize", [1, 7, 17, 100, 1000])
+def test_aggregate_daily_chunked_matches_aggregate_daily(fractional_hourly_df, tmp_path, chunksize):
+    path = tmp_path / "hourly.csv"
+    fractional_hourly_df.to_csv(path, index=False)
+    expected = data_loader.aggregate_daily(data_loader.add_thunderstorm_flag(
+        data_loader.load_hourly_csv(str(path), use_cache=False)))
+    daily = data_loader.aggregate_daily_chunked(str(path), chunksize=chunksize)
+    pd.testing.assert_frame_equal(daily, expected, check_exact=True)
+
+def test_merge_partial_daily_across_chunks(sample_hourly_df):
+    df = data_loader.add_thunderstorm_flag(sample_hourly_df.copy())
+    agg_funcs = data_loader.daily_agg_funcs(df.columns)
+    # Split mid-day so 2023-06-01 appears in both partials
+    partials = [data_loader.partial_daily(df.iloc[:2], agg_funcs),
+                data_loader.partial_daily(df.iloc[2:], agg_funcs)]
+    merged = data_loader.merge_partial_daily(partials)
+    assert len(merged) == 2
+    assert merged.loc[merged.index[0], ('temp', 'count')] == 3
+    assert merged.loc[merged.index[0], ('rain_3h', 'max')] == 0.4
+
+def test_load_hourly_csv_schema(sample_hourly_df, tmp_path):
+    path = tmp_path / "hourly.csv"
+    sample_hourly_df.assign(weather_id=[800, 211, 500, 800, 211]).to_csv(path, index=False)
+    df = data_loader.load_hourly_csv(str(path), use_cache=False)
+    assert df['temp'].dtype == 'float32'
+    assert df['weather_id'].dtype == 'int16'
+    assert isinstance(df['weather_main'].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_dtype(df['dt_iso'])
+    # Categorical strings still work with the thunderstorm flag
+    assert data_loader.add_thunderstorm_flag(df)['is_thunderstorm'].sum() == 2
+    report = data_loader.schema_memory_report(str(path))
+    assert report.loc['temp', 'ratio'] == 2
+    assert report.loc['TOTAL', 'bytes_after'] < report.loc['TOTAL', 'bytes_before']
+
+def test_load_hourly_csv_missing_weather_id(sample_hourly_df, tmp_path):
+    path = tmp_path / "hourly.csv"
+    sample_hourly_df.assign(weather_id=[800, None, 500, 800, 211], timezone=-21600).to_csv(path, index=False)
+    for use_cache in (False, True):
+        df = data_loader.load_hourly_csv(str(path), use_cache=use_cache, cache_dir=str(tmp_path / "cache"))
+        assert df['weather_id'].isna().tolist() == [False, True, False, False, False]
+        assert df['timezone'].dtype == 'int32'
+    assert data_loader.add_thunderstorm_flag(df)['is_thunderstorm'].sum() == 1
+
+def test_load_hourly_csv_schema_cached(sample_hourly_df, tmp_path):
+    path = tmp_path / "hourly.csv"
+    sample_hourly_df.to_csv(path, index=False)
+    cache_dir = str(tmp_path / "cache")
+    data_loader.load_hourly_csv(str(path), cache_dir=cache_dir)
+    df = data_loader.load_hourly_csv(str(path), columns=['weather_main', 'rain_1h'], cache_dir=cache_dir)
+    pd.testing.assert_frame_equal(df, data_loader.load_hourly_csv(
+        str(path), columns=['weather_main', 'rain_1h'], use_cache=False))
+
 if __name__ == "__main__":
     pytest.main([__file__])
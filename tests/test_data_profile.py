@@ -0,0 +1,127 @@
+# tests/test_data_profile.py
+import json
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+# Import data_profile / synthetic_weather
+def import_modules():
+    import sys
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    sys.path.insert(0, root)
+    sys.path.insert(0, os.path.join(root, 'benchmarks'))
+    import data_profile
+    import synthetic_weather
+    return data_profile, synthetic_weather
+
+data_profile, synthetic_weather = import_modules()
+
+# --- Fixtures ---
+@pytest.fixture
+def raw():
+    frames = [synthetic_weather.generate_station(2, station=i, seed=i, duplicate_rate=0.01, gap_rate=0.01)
+              for i in range(2)]
+    return pd.concat(frames, ignore_index=True)
+
+@pytest.fixture
+def csv_path(raw, tmp_path):
+    path = tmp_path / "hourly.csv"
+    raw.to_csv(path, index=False)
+    return path
+
+# --- Tests ---
+def test_numeric_and_categorical_match_pandas(raw, csv_path):
+    report = data_profile.profile_csv(csv_path, chunksize=3000, sketch_size=1 << 16).report()
+    assert report['rows'] == len(raw)
+    wind = report['columns']['wind_speed']
+    assert wind['count'] == raw['wind_speed'].count()
+    assert wind['nulls'] == raw['wind_speed'].isnull().sum()
+    assert wind['nonzero'] == (raw['wind_speed'].fillna(0) != 0).sum()
+    assert wind['mean'] == pytest.approx(raw['wind_speed'].mean())
+    assert wind['std'] == pytest.approx(raw['wind_speed'].std())
+    assert wind['max'] == raw['wind_speed'].max()
+    assert wind['quantiles']['0.5'] == raw['wind_speed'].quantile(0.5, interpolation='lower')
+    assert [t['value'] for t in wind['top']] == raw['wind_speed'].nlargest(10).tolist()
+    temp = report['columns']['temp']
+    assert [t['value'] for t in temp['bottom']] == raw['temp'].nsmallest(10).tolist()
+    assert sum(temp['histogram']['counts']) == raw['temp'].count()
+    main = report['columns']['weather_main']
+    assert main['top'] == raw['weather_main'].value_counts().head(10).to_dict()
+    assert main['distinct'] == raw['weather_main'].nunique()
+
+def test_sketch_quantiles_are_close_and_bounded():
+    rng = np.random.default_rng(0)
+    values = rng.gamma(2.0, 3.0, 400_000)
+    sketch = data_profile.QuantileSketch(size=1024)
+    for part in np.array_split(values, 37):
+        sketch.update(part)
+    assert sum(len(level) for level in sketch.levels) < 1024 * 16
+    approx = sketch.quantiles((0.05, 0.5, 0.95))
+    ranks = np.searchsorted(np.sort(values), approx) / len(values)
+    np.testing.assert_allclose(ranks, (0.05, 0.5, 0.95), atol=0.01)
+
+def test_time_duplicates_and_gaps_per_station(raw, csv_path):
+    report = data_profile.profile_csv(csv_path, chunksize=5000).report()
+    assert report['station_col'] == 'city_name'
+    for station, g in raw.groupby('city_name'):
+        times = data_profile.parse_times(g['dt_iso'])
+        hours = np.unique(times // data_profile.HOUR_NS)
+        summary = report['time'][station]
+        assert summary['records'] == len(g)
+        assert summary['unique_hours'] == len(hours)
+        assert summary['duplicate_rows'] == len(g) - len(hours)
+        assert summary['missing_hours'] == hours[-1] - hours[0] + 1 - len(hours)
+        assert summary['gaps'] == (np.diff(hours) > 1).sum()
+        assert summary['largest_gaps'][0]['missing_hours'] == np.diff(hours).max() - 1
+
+def test_pair_checks_and_row_sample(raw, csv_path):
+    report = data_profile.profile_csv(csv_path, chunksize=3000, sample_rows=500).report()
+    gust = report['checks']['wind_gust >= wind_speed']
+    both = raw[['wind_gust', 'wind_speed']].dropna()
+    bad = both[both['wind_gust'] < both['wind_speed']]
+    assert gust['checked'] == len(both)
+    assert gust['failed'] == len(bad)
+    assert [row['wind_gust'] for row in gust['sample']] == bad['wind_gust'].head(10).tolist()
+    assert report['sample']['size'] == 500
+    assert set(report['sample']['rows']['temp']) <= set(raw['temp'].dropna())
+
+def test_profiler_does_not_import_the_hazard_stack():
+    import subprocess
+    import sys
+    code = "import sys, data_profile; print('hazard_forecast' in sys.modules or 'streaks' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(data_profile.__file__))
+    assert out.stdout.strip() == 'False'
+
+def test_load_report_reprofiles_a_changed_csv(raw, csv_path, tmp_path, monkeypatch):
+    report_path = tmp_path / "logs" / "profile.json"
+    first = data_profile.load_report(report_path, csv_path)
+    assert first['rows'] == len(raw)
+    assert first['source']['size'] == os.path.getsize(csv_path)
+    calls = []
+    profile_csv = data_profile.profile_csv
+    monkeypatch.setattr(data_profile, 'profile_csv', lambda *a, **k: calls.append(a) or profile_csv(*a, **k))
+    assert data_profile.load_report(report_path, csv_path) == first
+    assert calls == []
+    raw.head(100).to_csv(csv_path, index=False)  # re-exported file
+    assert data_profile.load_report(report_path, csv_path)['rows'] == 100
+    assert len(calls) == 1
+    assert data_profile.load_report(report_path)['rows'] == 100
+
+def test_merged_profiles_match_single_pass(raw, csv_path, tmp_path):
+    whole = data_profile.profile_csv(csv_path, chunksize=len(raw)).report()
+    half = len(raw) // 2
+    first, second = data_profile.DataProfile(), data_profile.DataProfile()
+    first.update(raw.iloc[:half])
+    second.update(raw.iloc[half:])
+    merged = first.merge(second).report()
+    assert merged['time'] == whole['time']
+    for col in ('temp', 'weather_description'):
+        a, b = merged['columns'][col], whole['columns'][col]
+        assert a['count'] == b['count'] and a['top'] == b['top']
+        assert a.get('mean') == pytest.approx(b.get('mean'))
+        assert a.get('bottom') == b.get('bottom')
+    assert merged['checks'] == whole['checks']
+    path = data_profile.write_report(merged, tmp_path / "report.json")
+    assert json.loads(path.read_text())['rows'] == len(raw)
@@ -0,0 +1,101 @@
+# tests/test_forecast_service.py
+import asyncio
+import json
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+# Import forecast_service / hazard_forecast
+def import_modules():
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    import forecast_service
+    import hazard_forecast
+    return forecast_service, hazard_forecast
+
+forecast_service, hazard_forecast = import_modules()
+
+# --- Fixtures ---
+@pytest.fixture
+def hourly_df():
+    rng = np.random.default_rng(4)
+    times = pd.date_range("2019-12-15", "2023-01-20 23:00", freq="h")
+    n = len(times)
+    df = pd.DataFrame({
+        'dt_iso': times,
+        'wind_speed': rng.uniform(0, 40, n),
+        'feels_like': rng.uniform(0, 100, n),
+        'rain_1h': np.where(rng.random(n) < 0.2, rng.uniform(0, 1, n), np.nan),
+        'rain_3h': np.nan,
+        'snow_1h': np.where(rng.random(n) < 0.05, rng.uniform(0, 1, n), np.nan),
+        'snow_3h': np.nan,
+    })
+    return df.sample(frac=0.97, random_state=1)
+
+@pytest.fixture
+def service(hourly_df):
+    index = hazard_forecast.build_hazard_hour_index(hourly_df, {})
+    return forecast_service.ForecastService({'plainview': forecast_service.station_data(index)}, cache_size=8)
+
+def pipeline(df, start, end, work_start, work_end, min_year, max_year):
+    df = hazard_forecast.filter_working_hours(df, work_start, work_end)
+    daily = hazard_forecast.flag_daily_hazards(hazard_forecast.flag_hourly_hazards(df, {}))
+    return hazard_forecast.forecast_hazards(daily, start, end, min_year, max_year)
+
+# --- Tests ---
+@pytest.mark.parametrize("start,end,work_start,work_end", [
+    ("2025-01-01", "2025-01-10", 7, 17),
+    ("2024-12-25", "2025-01-05", 6, 18),
+    ("2024-02-25", "2024-03-02", 0, 24),
+])
+def test_shift_forecast_matches_pipeline(service, hourly_df, start, end, work_start, work_end):
+    result = forecast_service.shift_forecast(service.stations['plainview'], start, end,
+                                             work_start, work_end, 2020, 2022)
+    pd.testing.assert_frame_equal(result, pipeline(hourly_df, start, end, work_start, work_end, 2020, 2022))
+
+def test_handle_caches_answers_and_reports_metrics(service):
+    target = "/forecast?station=plainview&start=2025-01-01&end=2025-01-10&min_year=2020&max_year=2022"
+    status, body = service.handle(target)
+    assert status == 200
+    answer = json.loads(body)
+    assert len(answer['forecast']) == 10
+    assert answer['forecast'][0]['date'] == "2025-01-01"
+    assert service.handle(target)[1] == body
+
+    assert service.handle("/forecast?station=nowhere&start=2025-01-01")[0] == 400
+    assert service.handle("/nope")[0] == 404
+    metrics = json.loads(service.handle("/metrics")[1])
+    assert metrics['cache']['hits'] == 1 and metrics['cache']['misses'] == 1
+    assert metrics['requests'] == 4 and metrics['errors'] == 2
+    assert metrics['latency_ms']['p99'] < 1000
+
+def test_empty_shift_is_a_bad_request(service):
+    status, body = service.handle("/forecast?start=2025-01-01&work_start=7&work_end=7")
+    assert status == 400
+    assert "must differ" in json.loads(body)['error']
+
+def test_http_roundtrip(service):
+    async def roundtrip():
+        server = await asyncio.start_server(service.serve_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        bodies = []
+        for conn in ("keep-alive", "close"):
+            writer.write(f"GET /forecast?start=2025-01-01&end=2025-01-03 HTTP/1.1\r\n"
+                         f"Host: x\r\nConnection: {conn}\r\n\r\n".encode())
+            await writer.drain()
+            status = await reader.readline()
+            headers = {}
+            while (line := await reader.readline()) != b"\r\n":
+                name, _, value = line.decode().partition(":")
+                headers[name.lower()] = value.strip()
+            bodies.append((status, json.loads(await reader.readexactly(int(headers['content-length'])))))
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return bodies
+
+    bodies = asyncio.run(roundtrip())
+    assert all(status.startswith(b"HTTP/1.1 200") for status, _ in bodies)
+    assert len(bodies[1][1]['forecast']) == 3
@@ -0,0 +1,83 @@
+# tests/test_hazard_cube.py
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+# Import hazard_cube / hazard_forecast
+def import_modules():
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    import hazard_cube
+    import hazard_forecast
+    return hazard_cube, hazard_forecast
+
+hazard_cube, hazard_forecast = import_modules()
+
+# --- Fixtures ---
+@pytest.fixture
+def daily():
+    # Dec 20 - Mar 5 of 2018/19, 2019/20 (leap) and 2020/21
+    rng = np.random.default_rng(5)
+    times = pd.DatetimeIndex(np.concatenate([
+        pd.date_range(f"{y}-12-20", f"{y + 1}-03-05 23:00", freq="h").values for y in (2018, 2019, 2020)
+    ]))
+    n = len(times)
+    df = pd.DataFrame({
+        'dt_iso': times,
+        'wind_speed': rng.uniform(0, 40, n),
+        'feels_like': rng.uniform(0, 90, n),
+        'rain_1h': np.where(rng.random(n) < 0.1, rng.uniform(0, 1, n), np.nan),
+        'rain_3h': np.nan,
+        'snow_1h': np.where(rng.random(n) < 0.1, rng.uniform(0, 1, n), np.nan),
+        'snow_3h': np.nan,
+    })
+    df = hazard_forecast.filter_working_hours(df)
+    return hazard_forecast.flag_daily_hazards(hazard_forecast.flag_hourly_hazards(df, {}))
+
+@pytest.fixture
+def cube(daily, tmp_path):
+    return hazard_cube.build_hazard_cube(daily, str(tmp_path / "cube.npy"))
+
+# --- Tests ---
+def test_cube_is_memory_mapped(cube, tmp_path):
+    assert isinstance(cube.data, np.memmap)
+    assert cube.data.shape == (4, 366, len(hazard_forecast.HAZARD_COLS))
+    reopened = hazard_cube.open_hazard_cube(str(tmp_path / "cube.npy"))
+    np.testing.assert_array_equal(reopened.data, cube.data)
+    # Feb 29 only exists in 2020
+    feb29 = hazard_cube.FEB29_SLOT
+    assert np.isnan(cube.data[list(cube.years).index(2019), feb29, 0])
+    assert not np.isnan(cube.data[list(cube.years).index(2020), feb29, 0])
+
+def test_cube_mean_matches_forecast(cube, daily):
+    expected = hazard_forecast.forecast_hazards(daily, "2024-02-25", "2024-03-08", 2018, 2021)
+    pd.testing.assert_frame_equal(hazard_cube.cube_mean(cube, "2024-02-25", "2024-03-08", 2018, 2021), expected)
+
+def test_cube_percentile(cube, daily):
+    p90 = hazard_cube.cube_percentile(cube, "2025-01-02", "2025-01-02", q=90, min_year=2019, max_year=2021)
+    values = daily[(daily['month'] == 1) & (daily['day'] == 2)]['is_wind_hazard']
+    assert p90.loc[0, 'wind_hr'] == pytest.approx(np.percentile(values, 90))
+
+def test_window_across_new_year(cube, daily):
+    years, values = hazard_cube.window_by_year(cube, "2025-12-30", "2026-01-02", 'is_snow_1h_hazard', 2018, 2020)
+    assert years.tolist() == [2018, 2019, 2020]
+    by_date = daily.set_index('date')['is_snow_1h_hazard']
+    expected = [by_date[pd.Timestamp(f"{y}-12-30").date()] + by_date[pd.Timestamp(f"{y + 1}-01-02").date()]
+                for y in years]
+    assert (values[:, 0] + values[:, 3]).tolist() == expected
+
+def test_lost_day_exceedance(cube):
+    years, values = hazard_cube.window_by_year(cube, "2023-02-20", "2023-03-05", 'is_hazard', 2019, 2021)
+    lost = (values >= 6).sum(axis=1)
+    prob = hazard_cube.lost_day_exceedance(cube, "2023-02-20", "2023-03-05", more_than_days=lost.min(),
+                                           lost_day_hours=6, min_year=2019, max_year=2021)
+    assert prob == pytest.approx((lost > lost.min()).mean())
+    # Leap window: Feb 29 counts as 0 hours in non-leap years
+    years, values = hazard_cube.window_by_year(cube, "2024-02-28", "2024-03-01", 'is_hazard', 2019, 2021)
+    assert len(years) == 3 and values[[0, 2], 1].tolist() == [0, 0]
+    totals = hazard_cube.window_total_percentiles(cube, "2024-02-28", "2024-03-01", q=(50,), min_year=2019)
+    assert totals[50] == pytest.approx(np.median(values.sum(axis=1)))
+
+if __name__ == "__main__":
+    pytest.main([__file__])
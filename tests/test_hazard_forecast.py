@@ -97,5 +97,183 @@ def test_summarize_probabilities():
     assert '80th_any' in result
     assert '90th_any' in result
 
+@pytest.fixture
+def multi_year_hourly_df():
+    # Every hour of Feb 20 - Mar 10 for 2019-2021 (2020 has Feb 29), random weather
+    rng = np.random.default_rng(0)
+    times = pd.DatetimeIndex(np.concatenate([
+        pd.date_range(f"{y}-02-20", f"{y}-03-10 23:00", freq="h").values for y in (2019, 2020, 2021)
+    ]))
+    n = len(times)
+    return pd.DataFrame({
+        'dt_iso': times,
+        'wind_speed': rng.uniform(0, 40, n),
+        'feels_like': rng.uniform(10, 100, n),
+        'rain_1h': np.where(rng.random(n) < 0.1, rng.uniform(0, 1, n), np.nan),
+        'rain_3h': np.where(rng.random(n) < 0.1, rng.uniform(0, 2, n), np.nan),
+        'snow_1h': np.where(rng.random(n) < 0.05, rng.uniform(0, 1, n), np.nan),
+        'snow_3h': np.where(rng.random(n) < 0.05, rng.uniform(0, 2, n), np.nan),
+    })
+
+@pytest.fixture
+def multi_year_daily(multi_year_hourly_df):
+    df = hazard_forecast.filter_working_hours(multi_year_hourly_df)
+    df = hazard_forecast.flag_hourly_hazards(df, {})
+    return hazard_forecast.flag_daily_hazards(df)
+
+def loop_forecast(daily, start_date, end_date, min_year, max_year):
+    # Reference: the original per-day scan of forecast_hazards
+    out = []
+    for dt in pd.date_range(start=start_date, end=end_date, freq='D'):
+        subset = daily[(daily['month'] == dt.month) & (daily['day'] == dt.day) &
+                       (daily['year'] >= min_year) & (daily['year'] <= max_year)]
+        n_years = subset['year'].nunique()
+        stats = {hazard_forecast.forecast_col(col): subset[col].mean() if n_years > 0 else np.nan
+                 for col in hazard_forecast.HAZARD_COLS}
+        out.append({'date': dt.date(), 'n_years': n_years, **stats})
+    return pd.DataFrame(out)
+
+@pytest.mark.parametrize("start_date,end_date,min_year,max_year", [
+    ("2025-02-18", "2025-03-12", 1979, 2024),   # includes days with no history
+    ("2024-02-27", "2024-03-02", 2019, 2021),   # Feb 29 only in 2020
+    ("2025-02-25", "2025-03-05", 2021, 2021),
+    ("2024-01-01", "2026-12-31", 2019, 2020),   # multi-year window
+])
+def test_forecast_hazards_matches_per_day_loop(multi_year_daily, start_date, end_date, min_year, max_year):
+    expected = loop_forecast(multi_year_daily, start_date, end_date, min_year, max_year)
+    forecast = hazard_forecast.forecast_hazards(multi_year_daily, start_date, end_date, min_year, max_year)
+    pd.testing.assert_frame_equal(forecast, expected)
+
+def test_forecast_from_prebuilt_climatology(multi_year_daily):
+    clim = hazard_forecast.build_climatology(multi_year_daily, 2019, 2021)
+    assert clim.loc[(2, 29), 'n_years'] == 1
+    assert clim.loc[(3, 1), 'n_years'] == 3
+    forecast = hazard_forecast.forecast_hazards(multi_year_daily, "2030-03-01", "2030-03-03", climatology=clim)
+    expected = loop_forecast(multi_year_daily, "2030-03-01", "2030-03-03", 2019, 2021)
+    pd.testing.assert_frame_equal(forecast, expected)
+
+@pytest.mark.parametrize("work_start,work_end", [(7, 17), (0, 24), (6, 7), (13, 23)])
+def test_daily_hazards_for_shift_matches_refiltering(multi_year_hourly_df, work_start, work_end):
+    thresholds = {'wind_speed': 25, 'temp_heat': 85}
+    df = hazard_forecast.filter_working_hours(multi_year_hourly_df, work_start, work_end)
+    expected = hazard_forecast.flag_daily_hazards(hazard_forecast.flag_hourly_hazards(df, thresholds))
+    index = hazard_forecast.build_hazard_hour_index(multi_year_hourly_df, thresholds)
+    daily = hazard_forecast.daily_hazards_for_shift(index, work_start, work_end)
+    pd.testing.assert_frame_equal(daily, expected)
+
+def test_daily_hazards_for_overnight_shift(multi_year_hourly_df):
+    index = hazard_forecast.build_hazard_hour_index(multi_year_hourly_df, {})
+    daily = hazard_forecast.daily_hazards_for_shift(index, 22, 6)
+    flagged = hazard_forecast.flag_hourly_hazards(multi_year_hourly_df, {})
+    # Shift starting 2020-02-28 22:00 runs to 2020-02-29 06:00
+    shift = flagged[(flagged['dt_iso'] >= '2020-02-28 22:00') & (flagged['dt_iso'] < '2020-02-29 06:00')]
+    row = daily[daily['date'] == pd.Timestamp('2020-02-28').date()].iloc[0]
+    for col in hazard_forecast.HAZARD_COLS:
+        assert row[col] == shift[col].sum()
+    # The last day of each year's data has no following morning
+    last = daily[daily['date'] == pd.Timestamp('2021-03-10').date()].iloc[0]
+    assert last['is_hazard'] <= 2
+
+def test_shift_with_equal_bounds_is_rejected(multi_year_hourly_df):
+    assert hazard_forecast.filter_working_hours(multi_year_hourly_df, 7, 7).empty
+    index = hazard_forecast.build_hazard_hour_index(multi_year_hourly_df, {})
+    with pytest.raises(ValueError):
+        hazard_forecast.daily_hazards_for_shift(index, 7, 7)
+
+def test_hazard_mask_matches_bool_flags(multi_year_hourly_df):
+    thresholds = {'wind_speed': 30, 'temp_cold': 20}
+    flagged = hazard_forecast.flag_hourly_hazards(multi_year_hourly_df, thresholds)
+    masked = hazard_forecast.flag_hourly_hazard_mask(multi_year_hourly_df, thresholds)
+    assert masked['hazard_mask'].dtype == np.uint8
+    decoded = hazard_forecast.decode_hazard_mask(masked['hazard_mask'])
+    pd.testing.assert_frame_equal(decoded, flagged[hazard_forecast.HAZARD_COLS].reset_index(drop=True))
+    popcount = hazard_forecast.hazard_popcount(masked['hazard_mask'])
+    np.testing.assert_array_equal(popcount, flagged[hazard_forecast.HAZARD_COLS[:-1]].sum(axis=1))
+
+def test_flag_daily_hazards_accepts_mask(multi_year_hourly_df):
+    df = hazard_forecast.filter_working_hours(multi_year_hourly_df)
+    expected = hazard_forecast.flag_daily_hazards(hazard_forecast.flag_hourly_hazards(df, {}))
+    daily = hazard_forecast.flag_daily_hazards(hazard_forecast.flag_hourly_hazard_mask(df, {}))
+    pd.testing.assert_frame_equal(daily, expected)
+
+@pytest.fixture
+def float32_borderline_df():
+    # float32 readings exactly at thresholds that float32 cannot represent
+    times = pd.date_range("2024-06-01 07:00", periods=4, freq="h")
+    values = np.array([0.35, 0.7, 0.3, 1.1], dtype='float32')
+    return pd.DataFrame({'dt_iso': times, 'wind_speed': values * 40, 'feels_like': values * 100,
+                         'rain_1h': values, 'rain_3h': values, 'snow_1h': values, 'snow_3h': values})
+
+@pytest.mark.parametrize("limit", [0.35, 0.7])
+def test_numpy_thresholds_on_float32_match_python_floats(float32_borderline_df, limit):
+    python = {'rain_1h': limit, 'temp_cold': limit * 100}
+    numpy = {key: np.float64(value) for key, value in python.items()}
+    flagged = hazard_forecast.flag_hourly_hazards(float32_borderline_df, numpy)
+    assert flagged['is_rain_1h_hazard'].sum() == (float32_borderline_df['rain_1h'] >= np.float32(limit)).sum()
+    pd.testing.assert_frame_equal(flagged, hazard_forecast.flag_hourly_hazards(float32_borderline_df, python))
+    masked = hazard_forecast.flag_hourly_hazard_mask(float32_borderline_df, numpy)
+    pd.testing.assert_frame_equal(hazard_forecast.decode_hazard_mask(masked['hazard_mask']),
+                                  flagged[hazard_forecast.HAZARD_COLS])
+
+def pooled_reference(daily, month, day, pool_days, weights, min_year, max_year):
+    # Reference: weighted mean over every row within pool_days slots of (month, day), wrapping the year
+    slot = lambda m, d: pd.Timestamp(2000, m, d).dayofyear - 1
+    target = slot(month, day)
+    kernel = hazard_forecast.pool_kernel(pool_days, weights)
+    subset = daily[(daily['year'] >= min_year) & (daily['year'] <= max_year)]
+    dist = np.array([(slot(m, d) - target + 183) % 366 - 183 for m, d in zip(subset['month'], subset['day'])])
+    near = np.abs(dist) <= pool_days
+    w = kernel[dist[near] + pool_days]
+    return {hazard_forecast.forecast_col(col): np.average(subset.loc[near, col], weights=w)
+            for col in hazard_forecast.HAZARD_COLS}, int(near.sum())
+
+@pytest.mark.parametrize("weights", ['uniform', 'triangular', 'gaussian'])
+def test_pooled_climatology_matches_reference(multi_year_daily, weights):
+    clim = hazard_forecast.build_climatology(multi_year_daily, 2019, 2021, pool_days=3, pool_weights=weights)
+    for month, day in [(2, 29), (3, 1), (2, 18), (3, 12)]:
+        expected, n_pooled = pooled_reference(multi_year_daily, month, day, 3, weights, 2019, 2021)
+        row = clim.loc[(month, day)]
+        assert row['n_pooled'] == n_pooled
+        for col, value in expected.items():
+            assert row[col] == pytest.approx(value)
+    # Days just outside the data still get a pooled estimate, with no exact-day history
+    assert clim.loc[(2, 18), 'n_years'] == 0
+    assert clim.loc[(2, 29), 'n_years'] == 1
+
+def test_pooling_wraps_around_year_end():
+    dates = pd.date_range("2020-12-20", "2021-01-10", freq="D")
+    daily = pd.DataFrame({'date': dates.date})
+    for col in hazard_forecast.HAZARD_COLS:
+        daily[col] = np.arange(len(dates), dtype='int64')
+    daily['year'], daily['month'], daily['day'] = dates.year, dates.month, dates.day
+    clim = hazard_forecast.build_climatology(daily, 2020, 2021, pool_days=2)
+    # Dec 31 pools Dec 29 - Jan 2
+    assert clim.loc[(12, 31), 'wind_hr'] == pytest.approx(np.mean([9, 10, 11, 12, 13]))
+    assert clim.loc[(1, 1), 'n_pooled'] == 5
+
+def test_circular_pool_matches_definition():
+    rng = np.random.default_rng(0)
+    values = rng.random((366, 3))
+    kernel = np.array([0.5, 1.0, 2.0, 0.25, 3.0])  # asymmetric, so a flipped kernel would show
+    k, n = 2, len(values)
+    expected = np.array([sum(kernel[j] * values[(s + j - k) % n] for j in range(len(kernel))) for s in range(n)])
+    np.testing.assert_allclose(hazard_forecast.circular_pool(values, kernel), expected)
+    np.testing.assert_allclose(hazard_forecast.circular_pool(values[:, 0], kernel), expected[:, 0])
+
+def test_pooled_n_years_counts_distinct_years(multi_year_daily):
+    # Two rows per date (e.g. two stations) must not double n_years
+    doubled = pd.concat([multi_year_daily, multi_year_daily], ignore_index=True)
+    exact = hazard_forecast.build_climatology(doubled, 2019, 2021)
+    pooled = hazard_forecast.build_climatology(doubled, 2019, 2021, pool_days=2)
+    pd.testing.assert_series_equal(pooled['n_years'].loc[exact.index], exact['n_years'], check_dtype=False)
+
+def test_forecast_without_pooling_is_unchanged(multi_year_daily):
+    exact = hazard_forecast.forecast_hazards(multi_year_daily, "2025-02-25", "2025-03-05", 2019, 2021)
+    pd.testing.assert_frame_equal(exact, loop_forecast(multi_year_daily, "2025-02-25", "2025-03-05", 2019, 2021))
+    pooled = hazard_forecast.forecast_hazards(multi_year_daily, "2025-02-25", "2025-03-05", 2019, 2021, pool_days=2)
+    assert (pooled['n_pooled'] >= 5 * 2).all()
+    with pytest.raises(ValueError):
+        hazard_forecast.build_climatology(multi_year_daily, pool_days=2, pool_weights='cosine')
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,70 @@
+# tests/test_hazard_kernel.py
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+# Import hazard_kernel / hazard_forecast
+def import_modules():
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    import hazard_kernel
+    import hazard_forecast
+    return hazard_kernel, hazard_forecast
+
+hazard_kernel, hazard_forecast = import_modules()
+
+# --- Fixtures ---
+@pytest.fixture
+def hourly_df():
+    rng = np.random.default_rng(3)
+    times = pd.date_range("1969-12-25", "1970-01-10 23:00", freq="h")  # crosses the epoch
+    n = len(times)
+    df = pd.DataFrame({
+        'dt_iso': times,
+        'wind_speed': rng.integers(0, 40, n),
+        'feels_like': rng.uniform(10, 100, n).astype('float32'),
+        'rain_1h': np.where(rng.random(n) < 0.2, rng.uniform(0, 1, n), np.nan),
+        'rain_3h': np.where(rng.random(n) < 0.1, rng.uniform(0, 2, n), np.nan),
+        'snow_1h': np.nan,
+        'snow_3h': np.where(rng.random(n) < 0.1, rng.uniform(0, 2, n), np.nan),
+    })
+    # Shuffle rows and drop a few hours
+    return df.sample(frac=0.95, random_state=4)
+
+def chain(df, thresholds, work_start, work_end):
+    df = hazard_forecast.filter_working_hours(df, work_start, work_end)
+    return hazard_forecast.flag_daily_hazards(hazard_forecast.flag_hourly_hazards(df, thresholds))
+
+# --- Tests ---
+@pytest.mark.parametrize("work_start,work_end", [(7, 17), (0, 24), (16, 17)])
+def test_fused_matches_chain(hourly_df, work_start, work_end):
+    thresholds = {'wind_speed': 25, 'temp_cold': 40, 'rain_1h': 0.1}
+    expected = chain(hourly_df, thresholds, work_start, work_end)
+    daily = hazard_kernel.fused_daily_hazards_from_frame(hourly_df, thresholds, work_start, work_end)
+    pd.testing.assert_frame_equal(daily, expected)
+
+def test_fused_from_arrays_with_nat(hourly_df):
+    df = hourly_df.sort_values('dt_iso').reset_index(drop=True)
+    times = df['dt_iso'].to_numpy().copy()
+    times[5] = np.datetime64('NaT')
+    columns = {col: df[col].to_numpy() for col in ['wind_speed', 'feels_like', 'rain_1h', 'rain_3h', 'snow_1h', 'snow_3h']}
+    daily = hazard_kernel.fused_daily_hazards(times, columns, {})
+    expected = chain(df.assign(dt_iso=times), {}, 7, 17)
+    pd.testing.assert_frame_equal(daily, expected)
+
+def test_fused_numpy_threshold_on_float32(hourly_df):
+    df = hourly_df.assign(rain_1h=hourly_df['rain_1h'].round(2).astype('float32'))
+    readings = df['rain_1h'].dropna().to_numpy()
+    # A reading whose float32 value lies just below its two-decimal value
+    limit = next(round(float(v), 2) for v in readings if float(v) < round(float(v), 2))
+    daily = hazard_kernel.fused_daily_hazards_from_frame(df, {'rain_1h': np.float64(limit)}, 0, 24)
+    pd.testing.assert_frame_equal(daily, chain(df, {'rain_1h': limit}, 0, 24))
+
+def test_fused_empty_window(hourly_df):
+    daily = hazard_kernel.fused_daily_hazards_from_frame(hourly_df, {}, 5, 5)
+    assert len(daily) == 0
+    assert daily.columns.tolist() == ['date'] + hazard_forecast.HAZARD_COLS + ['year', 'month', 'day']
+
+if __name__ == "__main__":
+    pytest.main([__file__])
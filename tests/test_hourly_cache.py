@@ -0,0 +1,71 @@
+# tests/test_hourly_cache.py
+import os
+import pandas as pd
+import pytest
+from datetime import datetime
+
+# Import data_loader / hourly_cache
+def import_modules():
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    import data_loader
+    import hourly_cache
+    return data_loader, hourly_cache
+
+data_loader, hourly_cache = import_modules()
+
+# --- Fixtures ---
+@pytest.fixture
+def hourly_csv(tmp_path):
+    data = {
+        'dt_iso': [
+            datetime(2023, 6, 1, 0), datetime(2023, 6, 1, 1), datetime(2023, 6, 1, 2),
+            datetime(2023, 6, 2, 0), datetime(2023, 6, 2, 1),
+        ],
+        'temp': [70.5, 71.0, 74.2, 68.0, 69.1],
+        'wind_speed': [10, 15, 5, 20, 18],
+        'rain_1h': [0.1, None, 0, 0, 0.3],
+        'weather_main': ['Clear', 'Thunderstorm', None, 'Clear', 'Thunderstorm'],
+    }
+    path = tmp_path / "hourly.csv"
+    pd.DataFrame(data).to_csv(path, index=False)
+    return str(path)
+
+# --- Tests ---
+def test_cache_roundtrip_matches_csv(hourly_csv, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    expected = data_loader.load_hourly_csv(hourly_csv, use_cache=False)
+    first = data_loader.load_hourly_csv(hourly_csv, cache_dir=cache_dir)
+    assert os.path.exists(os.path.join(cache_dir, hourly_cache.MANIFEST_NAME))
+    second = data_loader.load_hourly_csv(hourly_csv, cache_dir=cache_dir)
+    pd.testing.assert_frame_equal(first, expected)
+    pd.testing.assert_frame_equal(second, expected)
+
+def test_cache_column_subset(hourly_csv, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    data_loader.load_hourly_csv(hourly_csv, cache_dir=cache_dir)
+    df = data_loader.load_hourly_csv(hourly_csv, columns=['dt_iso', 'wind_speed'], cache_dir=cache_dir)
+    assert df.columns.tolist() == ['dt_iso', 'wind_speed']
+    assert pd.api.types.is_datetime64_dtype(df['dt_iso'])
+    with pytest.raises(ValueError):
+        data_loader.load_hourly_csv(hourly_csv, columns=['nope'], cache_dir=cache_dir)
+
+def test_cache_invalidated_when_source_changes(hourly_csv, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    data_loader.load_hourly_csv(hourly_csv, cache_dir=cache_dir)
+    with open(hourly_csv, 'a') as fh:
+        fh.write("2023-06-02 02:00:00,60.0,3,0.0,Rain\n")
+    df = data_loader.load_hourly_csv(hourly_csv, cache_dir=cache_dir)
+    assert len(df) == 6
+    assert df['weather_main'].iloc[-1] == 'Rain'
+
+def test_cache_reused_after_touch(hourly_csv, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    data_loader.load_hourly_csv(hourly_csv, cache_dir=cache_dir)
+    st = os.stat(hourly_csv)
+    os.utime(hourly_csv, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    manifest = hourly_cache._read_manifest(cache_dir)
+    assert hourly_cache.is_cache_valid(manifest, hourly_csv, manifest['options'])
+
+if __name__ == "__main__":
+    pytest.main([__file__])
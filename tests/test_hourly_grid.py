@@ -0,0 +1,85 @@
+# tests/test_hourly_grid.py
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+# Import hourly_grid / data_loader / hazard_forecast
+def import_modules():
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    import hourly_grid
+    import data_loader
+    import hazard_forecast
+    return hourly_grid, data_loader, hazard_forecast
+
+hourly_grid, data_loader, hazard_forecast = import_modules()
+
+# --- Fixtures ---
+@pytest.fixture
+def gappy_hourly_df():
+    # Three days from 2023-06-01 01:00 with a 5-hour gap and a fully missing day
+    rng = np.random.default_rng(2)
+    times = pd.date_range("2023-06-01 01:00", "2023-06-04 22:00", freq="h")
+    times = times[~((times >= "2023-06-01 10:00") & (times < "2023-06-01 15:00"))]
+    times = times[times.normalize() != pd.Timestamp("2023-06-03")]
+    n = len(times)
+    return pd.DataFrame({
+        'dt_iso': times,
+        'temp': rng.uniform(50, 90, n).astype('float32'),
+        'feels_like': rng.uniform(20, 100, n),
+        'wind_speed': rng.integers(0, 40, n),
+        'rain_1h': np.where(rng.random(n) < 0.3, rng.uniform(0, 1, n), np.nan),
+        'rain_3h': np.nan,
+        'snow_1h': np.nan,
+        'snow_3h': np.nan,
+        'is_thunderstorm': rng.random(n) < 0.2,
+    })
+
+# --- Tests ---
+def test_build_hourly_grid(gappy_hourly_df):
+    grid = hourly_grid.build_hourly_grid(gappy_hourly_df)
+    assert grid.n_days == 4
+    assert grid.present.sum() == len(gappy_hourly_df)
+    view = hourly_grid.day_view(grid, 'temp')
+    assert view.shape == (4, 24)
+    assert np.shares_memory(view, grid.values['temp'])
+    assert np.isnan(view[0, 0])
+    assert view[0, 1] == gappy_hourly_df['temp'].iloc[0]
+    assert grid.gaps['n_hours'].tolist() == [5, 24]
+    assert grid.gaps['gap_start'].iloc[0] == pd.Timestamp("2023-06-01 10:00")
+    assert grid.gaps['gap_end'].iloc[1] == pd.Timestamp("2023-06-03 23:00")
+    assert hourly_grid.working_hours_view(grid, 'temp', 7, 17).base is not None
+
+def test_build_hourly_grid_rejects_duplicates(gappy_hourly_df):
+    with pytest.raises(ValueError):
+        hourly_grid.build_hourly_grid(pd.concat([gappy_hourly_df, gappy_hourly_df.iloc[:1]]))
+
+def test_grid_daily_aggregate_matches_aggregate_daily(gappy_hourly_df):
+    df = gappy_hourly_df.assign(rain_1h=gappy_hourly_df['rain_1h'].astype('float32'))
+    expected = data_loader.aggregate_daily(df.copy())
+    grid = hourly_grid.build_hourly_grid(df)
+    pd.testing.assert_frame_equal(hourly_grid.grid_daily_aggregate(grid), expected, check_exact=True)
+
+@pytest.mark.parametrize("work_start,work_end", [(7, 17), (0, 24), (10, 15)])
+def test_grid_daily_hazards_matches_pipeline(gappy_hourly_df, work_start, work_end):
+    thresholds = {'wind_speed': 20, 'rain_1h': 0.0}
+    df = hazard_forecast.filter_working_hours(gappy_hourly_df, work_start, work_end)
+    expected = hazard_forecast.flag_daily_hazards(hazard_forecast.flag_hourly_hazards(df, thresholds))
+    grid = hourly_grid.build_hourly_grid(gappy_hourly_df)
+    daily = hourly_grid.grid_daily_hazards(grid, thresholds, work_start, work_end)
+    pd.testing.assert_frame_equal(daily, expected)
+
+def test_grid_daily_hazards_numpy_threshold_on_float32(gappy_hourly_df):
+    df = gappy_hourly_df.assign(rain_1h=gappy_hourly_df['rain_1h'].round(2).astype('float32'))
+    readings = df['rain_1h'].dropna().to_numpy()
+    # A reading whose float32 value lies just below its two-decimal value
+    limit = next(round(float(v), 2) for v in readings if float(v) < round(float(v), 2))
+    grid = hourly_grid.build_hourly_grid(df)
+    daily = hourly_grid.grid_daily_hazards(grid, {'rain_1h': np.float64(limit)}, 0, 24)
+    expected = hourly_grid.grid_daily_hazards(grid, {'rain_1h': limit}, 0, 24)
+    pd.testing.assert_frame_equal(daily, expected)
+    assert daily['is_rain_1h_hazard'].sum() == (df['rain_1h'] >= np.float32(limit)).sum()
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,95 @@
+# tests/test_hourly_store.py
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+# Import hourly_store
+def import_hourly_store():
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    import hourly_store
+    return hourly_store
+
+hourly_store = import_hourly_store()
+
+# --- Fixtures ---
+@pytest.fixture
+def hourly():
+    times = pd.date_range("2019-12-01", "2021-02-28 23:00", freq="h")
+    n = len(times)
+    rng = np.random.default_rng(3)
+    return pd.DataFrame({
+        'dt_iso': times.tz_localize("UTC"),
+        'wind_speed': rng.uniform(0, 40, n),
+        'wind_gust': np.where(rng.random(n) < 0.3, rng.uniform(0, 60, n), np.nan),
+        'weather_id': rng.choice([800, 500, 211], n),
+        'weather_main': rng.choice(['Clear', 'Rain', 'Thunderstorm'], n),
+    })
+
+@pytest.fixture
+def store(tmp_path, hourly):
+    conn = hourly_store.connect(str(tmp_path / "hourly.sqlite"))
+    hourly_store.upsert_hourly(conn, hourly, "north")
+    yield conn
+    conn.close()
+
+# --- Tests ---
+def test_load_all_columns_typed(store, hourly):
+    df = hourly_store.load_hourly_store(store, "north")
+    assert list(df.columns) == ['dt_iso', 'wind_speed', 'wind_gust', 'weather_id', 'weather_main']
+    assert len(df) == len(hourly)
+    assert df['wind_speed'].dtype == 'float32'
+    assert df['weather_id'].dtype == 'int16'
+    assert df['weather_main'].dtype == 'category'
+    np.testing.assert_array_equal(df['dt_iso'].to_numpy(), hourly['dt_iso'].dt.tz_localize(None).to_numpy())
+    assert df['wind_gust'].isna().sum() == hourly['wind_gust'].isna().sum()
+
+def test_date_range_and_columns(store):
+    df = hourly_store.load_hourly_store(store, "north", columns=['dt_iso', 'wind_speed'],
+                                        start="2020-06-01", end="2020-06-03")
+    assert list(df.columns) == ['dt_iso', 'wind_speed']
+    assert len(df) == 48
+    assert df['dt_iso'].min() == pd.Timestamp("2020-06-01")
+
+def test_month_and_wrapping_season_filters(store, hourly):
+    feb = hourly_store.load_hourly_store(store, "north", columns=['wind_speed'], months=[2])
+    times = hourly['dt_iso'].dt.tz_localize(None)
+    assert len(feb) == (times.dt.month == 2).sum()
+
+    season = hourly_store.load_hourly_store(store, "north", columns=['wind_speed'],
+                                            season=((12, 30), (1, 2)))
+    md = times.dt.month * 100 + times.dt.day
+    assert len(season) == ((md >= 1230) | (md <= 102)).sum()
+
+def test_upsert_updates_and_keeps_stations_apart(store, hourly):
+    changed = hourly.iloc[:24].assign(wind_speed=99.0)
+    hourly_store.upsert_hourly(store, changed, "north")
+    hourly_store.upsert_hourly(store, hourly.iloc[:5], "south")
+    north = hourly_store.load_hourly_store(store, "north", columns=['wind_speed'])
+    assert len(north) == len(hourly)
+    assert (north['wind_speed'].iloc[:24] == 99.0).all()
+    assert len(hourly_store.load_hourly_store(store, "south")) == 5
+
+def test_queries_use_indexes(store):
+    cases = [({'start': "2020-06-01", 'end': "2020-07-01"}, "PRIMARY KEY (station=? AND ts>? AND ts<?)"),
+             ({'months': [6]}, "INDEX hourly_station_md (station=? AND md>? AND md<?)")]
+    for kwargs, expected in cases:
+        sql, params = hourly_store.build_query("north", ['wind_speed'], **kwargs)
+        plan = " ".join(row[-1] for row in store.execute("EXPLAIN QUERY PLAN " + sql, params))
+        assert "SCAN" not in plan
+        assert expected in plan
+
+def test_unknown_column_raises(store):
+    with pytest.raises(ValueError):
+        hourly_store.load_hourly_store(store, "north", columns=['nope'])
+
+def test_import_cleaned_csv(tmp_path, hourly):
+    path = tmp_path / "cleaned.csv"
+    hourly.iloc[:100].to_csv(path, index=False)
+    conn = hourly_store.connect(str(tmp_path / "imported.sqlite"))
+    assert hourly_store.import_cleaned_csv(conn, str(path), "north", chunksize=30) == 100
+    df = hourly_store.load_hourly_store(conn, "north", columns=['dt_iso', 'wind_speed'])
+    assert df['dt_iso'].iloc[0] == pd.Timestamp("2019-12-01")
+    assert len(df) == 100
+    conn.close()
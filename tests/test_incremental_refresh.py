@@ -0,0 +1,83 @@
+# tests/test_incremental_refresh.py
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+# Import incremental_refresh and the modules it mirrors
+def import_modules():
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    import incremental_refresh
+    import data_loader
+    import hazard_forecast
+    import hourly_store
+    return incremental_refresh, data_loader, hazard_forecast, hourly_store
+
+incremental_refresh, data_loader, hazard_forecast, hourly_store = import_modules()
+
+# --- Fixtures ---
+@pytest.fixture
+def archive():
+    rng = np.random.default_rng(8)
+    times = pd.date_range("2021-01-01", "2023-03-10 23:00", freq="h")
+    n = len(times)
+    return pd.DataFrame({
+        'dt_iso': times,
+        'temp': rng.uniform(20, 90, n).astype('float32'),
+        'feels_like': rng.uniform(10, 100, n).astype('float32'),
+        'wind_speed': rng.uniform(0, 40, n).astype('float32'),
+        'rain_1h': np.where(rng.random(n) < 0.2, rng.uniform(0, 1, n), np.nan).astype('float32'),
+        'rain_3h': np.nan,
+        'snow_1h': np.nan,
+        'snow_3h': np.where(rng.random(n) < 0.05, rng.uniform(0, 3, n), np.nan).astype('float32'),
+        'weather_id': rng.choice([800, 211, 500], n).astype('int16'),
+    })
+
+def build_state(hourly, min_year=2021, max_year=2023):
+    daily = data_loader.aggregate_daily(data_loader.add_thunderstorm_flag(hourly.copy()))
+    hazards = hazard_forecast.flag_daily_hazards(
+        hazard_forecast.flag_hourly_hazards(hazard_forecast.filter_working_hours(hourly), {}))
+    clim = incremental_refresh.running_climatology(hazards, min_year, max_year)
+    return incremental_refresh.IncrementalState(daily, hazards, clim, thresholds={})
+
+def split(archive):
+    # Old data stops mid-day; the new batch finishes that day, revises an earlier hour and adds days
+    cut = archive['dt_iso'] < pd.Timestamp("2023-03-05 12:00")
+    old, new = archive[cut], archive[~cut].copy()
+    revised = archive[archive['dt_iso'] == pd.Timestamp("2023-03-04 10:00")].assign(wind_speed=np.float32(39))
+    new = pd.concat([revised, new], ignore_index=True)
+    combined = pd.concat([old, new]).drop_duplicates('dt_iso', keep='last').sort_values('dt_iso')
+    return old, new, combined.reset_index(drop=True)
+
+def check_matches_rebuild(state, combined):
+    expected = build_state(combined)
+    pd.testing.assert_frame_equal(state.daily, expected.daily)
+    pd.testing.assert_frame_equal(state.daily_hazards, expected.daily_hazards)
+    pd.testing.assert_frame_equal(
+        incremental_refresh.climatology_table(state.climatology),
+        hazard_forecast.build_climatology(expected.daily_hazards, 2021, 2023))
+
+# --- Tests ---
+def test_climatology_table_matches_build_climatology(archive):
+    state = build_state(archive)
+    pd.testing.assert_frame_equal(
+        incremental_refresh.climatology_table(state.climatology),
+        hazard_forecast.build_climatology(state.daily_hazards, 2021, 2023))
+
+def test_refresh_matches_full_rebuild(archive):
+    old, new, combined = split(archive)
+    state = build_state(old)
+    dates = incremental_refresh.affected_dates(new)
+    hourly_days = combined[combined['dt_iso'].dt.date.isin(dates)]
+    incremental_refresh.refresh(state, hourly_days)
+    check_matches_rebuild(state, combined)
+
+def test_refresh_from_store(archive, tmp_path):
+    old, new, combined = split(archive)
+    conn = hourly_store.connect(str(tmp_path / "hourly.sqlite"))
+    hourly_store.upsert_hourly(conn, old, "site")
+    state = build_state(old)
+    incremental_refresh.refresh_from_store(state, conn, "site", new)
+    conn.close()
+    check_matches_rebuild(state, combined)
@@ -0,0 +1,90 @@
+# tests/test_instrumentation.py
+import logging
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+# Import instrumentation and an instrumented pipeline module
+def import_modules():
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    import instrumentation
+    import hazard_forecast
+    return instrumentation, hazard_forecast
+
+instrumentation, hazard_forecast = import_modules()
+
+# --- Fixtures ---
+@pytest.fixture
+def metrics():
+    instrumentation.METRICS.reset()
+    instrumentation.METRICS.enable(trace_memory=True)
+    yield instrumentation.METRICS
+    instrumentation.METRICS.disable()
+    instrumentation.METRICS.reset()
+
+@pytest.fixture
+def hourly_df():
+    times = pd.date_range("2022-01-01", "2022-03-31 23:00", freq="h")
+    rng = np.random.default_rng(0)
+    n = len(times)
+    return pd.DataFrame({
+        'dt_iso': times,
+        'wind_speed': rng.uniform(0, 40, n),
+        'feels_like': rng.uniform(0, 100, n),
+        'rain_1h': np.nan, 'rain_3h': np.nan, 'snow_1h': np.nan, 'snow_3h': np.nan,
+    })
+
+# --- Tests ---
+def test_pipeline_stages_are_recorded(metrics, hourly_df):
+    df = hazard_forecast.filter_working_hours(hourly_df)
+    daily = hazard_forecast.flag_daily_hazards(hazard_forecast.flag_hourly_hazards(df, {}))
+    hazard_forecast.forecast_hazards(daily, "2025-01-01", "2025-01-10", 2022, 2022)
+
+    stats = metrics.as_dict()
+    assert stats['filter_working_hours']['rows_in'] == len(hourly_df)
+    assert stats['filter_working_hours']['rows_out'] == len(df)
+    assert stats['flag_daily_hazards']['rows_out'] == len(daily) == 90
+    assert stats['forecast_hazards']['rows_out'] == 10
+    assert stats['build_climatology']['calls'] == 1
+    assert all(s['seconds'] > 0 and s['peak_bytes'] > 0 for s in stats.values())
+    # nested stage: the outer peak covers the inner one
+    assert stats['forecast_hazards']['peak_bytes'] >= stats['build_climatology']['peak_bytes']
+
+def test_disabled_metrics_record_nothing(hourly_df):
+    instrumentation.METRICS.reset()
+    hazard_forecast.filter_working_hours(hourly_df)
+    assert instrumentation.METRICS.stages == {}
+
+def test_exports(metrics, hourly_df, tmp_path):
+    hazard_forecast.filter_working_hours(hourly_df)
+    text = metrics.to_prometheus(str(tmp_path / "metrics.prom"))
+    assert '# TYPE weather_pipeline_stage_seconds_total counter' in text
+    assert f'weather_pipeline_stage_rows_in_total{{stage="filter_working_hours"}} {len(hourly_df)}' in text
+    assert (tmp_path / "metrics.prom").read_text() == text
+    assert '"filter_working_hours"' in metrics.to_json(str(tmp_path / "metrics.json"))
+
+def test_profiled_writes_stats(tmp_path, hourly_df):
+    path = str(tmp_path / "run.prof")
+    with instrumentation.profiled(path, top=5):
+        hazard_forecast.filter_working_hours(hourly_df)
+    assert os.path.exists(path)
+    assert "filter_working_hours" in open(path + ".txt").read()
+
+def test_setup_logging_is_idempotent(tmp_path):
+    root = logging.getLogger()
+    before = list(root.handlers)
+    try:
+        instrumentation.setup_logging("unit", log_dir=str(tmp_path))
+        instrumentation.setup_logging("unit", log_dir=str(tmp_path))
+        added = [h for h in root.handlers if h not in before]
+        assert len(added) == 1
+        logging.getLogger().info("hello")
+        added[0].flush()
+        assert "hello" in (tmp_path / "unit.log").read_text()
+    finally:
+        for h in root.handlers[:]:
+            if h not in before:
+                root.removeHandler(h)
+                h.close()
@@ -0,0 +1,50 @@
+# tests/test_parallel_daily.py
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+# Import parallel_daily / data_loader
+def import_modules():
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    import parallel_daily
+    import data_loader
+    return parallel_daily, data_loader
+
+parallel_daily, data_loader = import_modules()
+
+# --- Fixtures ---
+@pytest.fixture
+def hourly_df():
+    rng = np.random.default_rng(6)
+    times = pd.date_range("2019-11-01", "2021-03-01 23:00", freq="h", tz="US/Central")
+    n = len(times)
+    df = pd.DataFrame({
+        'dt_iso': times,
+        'temp': rng.uniform(0, 90, n).astype('float32'),
+        'temp_min': rng.uniform(0, 90, n).astype('float32'),
+        'temp_max': rng.uniform(0, 90, n).astype('float32'),
+        'wind_speed': rng.uniform(0, 40, n).astype('float32'),
+        'wind_gust': np.where(rng.random(n) < 0.3, rng.uniform(0, 60, n), np.nan).astype('float32'),
+        'rain_1h': np.where(rng.random(n) < 0.1, rng.uniform(0, 1, n), np.nan).astype('float32'),
+        'snow_3h': np.nan,
+        'is_thunderstorm': rng.random(n) < 0.02,
+        'weather_main': 'Clear',
+    })
+    df.loc[5, 'dt_iso'] = pd.NaT
+    return df.sample(frac=1, random_state=7)
+
+# --- Tests ---
+@pytest.mark.parametrize("workers", [1, 3])
+def test_matches_serial_aggregate_daily(hourly_df, workers):
+    expected = data_loader.aggregate_daily(hourly_df.copy())
+    result = parallel_daily.aggregate_daily_parallel(hourly_df, workers=workers)
+    pd.testing.assert_frame_equal(result, expected)
+
+def test_partition_bounds_are_day_aligned():
+    days = np.repeat(np.arange(10), 24)
+    bounds = parallel_daily.partition_bounds(days, 4)
+    assert bounds[0] == 0 and bounds[-1] == len(days)
+    assert all(b % 24 == 0 for b in bounds)
+    assert len(parallel_daily.partition_bounds(days[:24], 4)) == 2
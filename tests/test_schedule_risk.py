@@ -0,0 +1,83 @@
+# tests/test_schedule_risk.py
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+# Import schedule_risk / hazard_forecast / synthetic_weather
+def import_modules():
+    import sys
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    sys.path.insert(0, root)
+    sys.path.insert(0, os.path.join(root, 'benchmarks'))
+    import schedule_risk
+    import hazard_forecast
+    import synthetic_weather
+    return schedule_risk, hazard_forecast, synthetic_weather
+
+schedule_risk, hazard_forecast, synthetic_weather = import_modules()
+Task = schedule_risk.Task
+
+def replay(daily, start, tasks, workdays=schedule_risk.WEEKDAYS):
+    # Day-by-day walk through one year of history
+    hours = pd.DataFrame(daily).set_index(pd.to_datetime(daily['date']))
+    day, finish = pd.Timestamp(start), []
+    for task in tasks:
+        left = task.work_days
+        while True:
+            row = hours.loc[day] if day in hours.index else None
+            lost = row is not None and any(row[h] >= task.lost_hours for h in task.hazards)
+            if day.dayofweek in workdays and not lost:
+                left -= 1
+            if left == 0:
+                break
+            day += pd.Timedelta(days=1)
+        finish.append((day - pd.Timestamp(start)).days)
+        day += pd.Timedelta(days=1)
+    return finish
+
+# --- Fixtures ---
+@pytest.fixture
+def daily():
+    return synthetic_weather.generate_daily_hazards(2015, 2022, hazard_forecast.HAZARD_COLS)
+
+@pytest.fixture
+def tasks():
+    return [
+        Task('foundation', 10, ['is_rain_1h_hazard', 'is_snow_1h_hazard'], lost_hours=3),
+        Task('framing', 15, ['is_wind_hazard'], lost_hours=4),
+        Task('roofing', 5, ['is_hazard'], lost_hours=5),
+    ]
+
+# --- Tests ---
+def test_single_year_matches_day_by_day_replay(daily, tasks):
+    result = schedule_risk.simulate_schedule(daily, "2017-04-03", tasks, n_scenarios=3,
+                                             min_year=2017, max_year=2017)
+    expected = replay(daily, "2017-04-03", tasks)
+    assert (result.finish == expected).all()
+
+def test_blocks_mix_years_and_summary(daily, tasks):
+    result = schedule_risk.simulate_schedule(daily, "2025-04-07", tasks, n_scenarios=2000,
+                                             block_days=7, min_year=2015, max_year=2021)
+    assert (np.diff(result.finish, axis=1) > 0).all()
+    assert len(np.unique(result.completion)) > 8  # more outcomes than base years
+    summary = schedule_risk.completion_summary(result)
+    assert list(summary['task']) == ['foundation', 'framing', 'roofing']
+    assert (summary['finished_share'] == 1).all()
+    assert summary['p50'].iloc[-1] <= summary['p95'].iloc[-1]
+    assert schedule_risk.probability_late(result, "2025-04-07") == 1
+    assert schedule_risk.probability_late(result, "2026-04-07") == 0
+
+def test_horizon_and_missing_years(daily, tasks):
+    result = schedule_risk.simulate_schedule(daily, "2025-04-07", tasks, n_scenarios=10,
+                                             horizon=20, min_year=2015, max_year=2021)
+    assert (result.finish[:, 1:] == -1).all()
+    assert schedule_risk.completion_summary(result)['p50'].isna().iloc[-1]
+    with pytest.raises(ValueError):
+        schedule_risk.simulate_schedule(daily, "2025-04-07", tasks, min_year=2022, max_year=2024)
+
+def test_100k_scenarios(tasks):
+    # Timing lives in benchmarks/bench_daily_analyses.py
+    daily = synthetic_weather.generate_daily_hazards(1979, 2024, hazard_forecast.HAZARD_COLS, seed=1)
+    result = schedule_risk.simulate_schedule(daily, "2025-03-03", tasks, n_scenarios=100_000)
+    assert result.finish.shape == (100_000, 3)
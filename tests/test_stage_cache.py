@@ -0,0 +1,81 @@
+# tests/test_stage_cache.py
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+# Import stage_cache / hazard_forecast
+def import_modules():
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    import stage_cache
+    import hazard_forecast
+    return stage_cache, hazard_forecast
+
+stage_cache, hazard_forecast = import_modules()
+
+# --- Fixtures ---
+@pytest.fixture
+def hourly_df():
+    rng = np.random.default_rng(2)
+    times = pd.date_range("2021-12-20", "2023-01-15 23:00", freq="h")
+    n = len(times)
+    return pd.DataFrame({
+        'dt_iso': times,
+        'wind_speed': rng.uniform(0, 40, n).astype('float32'),
+        'feels_like': rng.uniform(10, 100, n).astype('float32'),
+        'rain_1h': np.where(rng.random(n) < 0.2, rng.uniform(0, 1, n), np.nan),
+        'rain_3h': np.nan,
+        'snow_1h': np.nan,
+        'snow_3h': np.nan,
+    })
+
+def uncached(df, thresholds, start_date, end_date):
+    df = hazard_forecast.filter_working_hours(df)
+    daily = hazard_forecast.flag_daily_hazards(hazard_forecast.flag_hourly_hazards(df, thresholds))
+    return hazard_forecast.forecast_hazards(daily, start_date, end_date, 2022, 2022)
+
+def run(df, cache, thresholds, start_date="2025-01-01", end_date="2025-01-10"):
+    return stage_cache.cached_forecast(df, cache, thresholds, start_date, end_date, min_year=2022, max_year=2022)
+
+# --- Tests ---
+def test_cached_forecast_reuses_upstream_stages(hourly_df, tmp_path):
+    cache = stage_cache.StageCache(str(tmp_path / "stages"))
+    first = run(hourly_df, cache, {})
+    pd.testing.assert_frame_equal(first, uncached(hourly_df, {}, "2025-01-01", "2025-01-10"))
+    assert cache.summary()['misses'] == 4
+
+    # Same inputs (explicit defaults resolve to the same key): straight from the cache
+    pd.testing.assert_frame_equal(run(hourly_df, cache, {'wind_speed': 28}), first)
+    assert cache.stats['forecast_hazards'] == {'hits': 1, 'misses': 1}
+
+    # New window: only forecast_hazards reruns
+    window = run(hourly_df, cache, {}, "2025-01-05", "2025-01-20")
+    pd.testing.assert_frame_equal(window, uncached(hourly_df, {}, "2025-01-05", "2025-01-20"))
+    assert cache.stats['flag_daily_hazards'] == {'hits': 1, 'misses': 1}
+
+    # New threshold: working-hours filter is reused
+    changed = run(hourly_df, cache, {'wind_speed': 20})
+    pd.testing.assert_frame_equal(changed, uncached(hourly_df, {'wind_speed': 20}, "2025-01-01", "2025-01-10"))
+    assert cache.stats['filter_working_hours'] == {'hits': 1, 'misses': 1}
+    assert cache.stats['flag_hourly_hazards'] == {'hits': 0, 'misses': 2}
+
+def test_changed_data_misses(hourly_df, tmp_path):
+    cache = stage_cache.StageCache(str(tmp_path / "stages"))
+    run(hourly_df, cache, {})
+    edited = hourly_df.copy()
+    edited.loc[100, 'wind_speed'] = 39.0
+    run(edited, cache, {})
+    assert cache.summary()['hits'] == 0
+
+def test_lru_eviction(tmp_path):
+    cache = stage_cache.StageCache(str(tmp_path / "stages"), max_bytes=25_000)
+    payload = np.zeros(1000)  # ~8 kB pickled
+    for key in "abc":
+        cache.store(key, payload)
+    cache.load("a")  # a becomes most recently used
+    cache.store("d", payload)
+    assert "b" not in cache
+    assert all(k in cache for k in "acd")
+    assert cache.evictions == 1
+    assert cache.summary()['bytes'] <= 25_000
@@ -0,0 +1,97 @@
+# tests/test_streaks.py
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+# Import streaks / synthetic_weather
+def import_modules():
+    import sys
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    sys.path.insert(0, root)
+    sys.path.insert(0, os.path.join(root, 'benchmarks'))
+    import streaks
+    import synthetic_weather
+    return streaks, synthetic_weather
+
+streaks, synthetic_weather = import_modules()
+
+def brute_force(daily, lost_hours, n):
+    # Day-by-day walk per station and month
+    rows = []
+    df = daily.assign(date=pd.to_datetime(daily['date'])).sort_values(['station', 'date'])
+    for (station, year, month), g in df.groupby(['station', df['date'].dt.year, df['date'].dt.month]):
+        best = {True: 0, False: 0}
+        count = {True: 0, False: 0}
+        run, prev_state, prev_date = 0, None, None
+        for date, hours in zip(g['date'], g['is_hazard']):
+            state = hours >= lost_hours
+            if prev_date is not None and state == prev_state and (date - prev_date).days == 1:
+                run += 1
+            else:
+                if prev_state is not None:
+                    count[prev_state] += run >= n
+                run = 1
+            best[state] = max(best[state], run)
+            prev_state, prev_date = state, date
+        count[prev_state] += run >= n
+        rows.append((station, year, month, best[True], best[False], count[True], count[False]))
+    return pd.DataFrame(rows, columns=['station', 'year', 'window', 'longest_hazard', 'longest_workable',
+                                       f'hazard_streaks_{n}', f'workable_streaks_{n}'])
+
+# --- Fixtures ---
+@pytest.fixture
+def daily():
+    # Two stations, 2018-2020, a few missing days, rows shuffled
+    return synthetic_weather.generate_daily_hazards(2018, 2020, stations=('a', 'b'), drop=0.02, mean_hours=1.5,
+                                                    shuffle=True)
+
+# --- Tests ---
+def test_run_lengths_respect_segments():
+    flags = np.array([1, 1, 0, 1, 1, 1, 1, 0, 1], dtype=bool)
+    segments = np.array([0, 0, 0, 0, 0, 1, 1, 1, 2])
+    starts, lengths = streaks.run_lengths(flags, segments)
+    assert starts.tolist() == [0, 3, 5, 8]
+    assert lengths.tolist() == [2, 2, 2, 1]
+
+def test_streak_table_matches_brute_force(daily):
+    table = streaks.streak_table(daily, lost_hours=2, min_days=(3,))
+    expected = brute_force(daily, 2, 3)
+    pd.testing.assert_frame_equal(table[expected.columns].reset_index(drop=True), expected,
+                                  check_dtype=False)
+    assert table['days'].sum() == len(daily)
+
+def test_thunderstorm_days_and_windows():
+    dates = pd.date_range("2020-12-25", "2021-01-06", freq="D")
+    storms = [0, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1]
+    daily = pd.DataFrame({'date_': dates.date, 'thunderstorm_day': storms})
+    table = streaks.streak_table(daily, col='thunderstorm_day', window='year', min_days=(3, 5),
+                                 date_col='date_')
+    assert table['year'].tolist() == [2020, 2021]
+    assert table['longest_hazard'].tolist() == [3, 1]
+    assert table['longest_workable'].tolist() == [3, 5]  # the year edge splits the 8-day dry run
+    assert table['workable_streaks_5'].tolist() == [0, 1]
+    with pytest.raises(ValueError):
+        streaks.streak_table(daily, col='thunderstorm_day', window='fortnight', date_col='date_')
+
+def test_empty_table_keeps_the_columns(daily):
+    expected = streaks.streak_table(daily)
+    empty = streaks.streak_table(daily.iloc[:0])
+    assert empty.empty
+    assert empty.columns.tolist() == expected.columns.tolist()
+
+def test_workable_window_probability(daily):
+    table = streaks.streak_table(daily, lost_hours=2, min_days=(3,))
+    prob = streaks.workable_window_probability(table, min_days=(3, 30))
+    assert len(prob) == 2 * 12
+    assert (prob['years'] == 3).all()
+    assert prob['p_workable_3'].between(0, 1).all()
+    assert (prob['p_workable_30'] == 0).all()
+
+def test_all_years_and_stations_in_one_call():
+    # Timing lives in benchmarks/bench_daily_analyses.py
+    daily = synthetic_weather.generate_daily_hazards(1979, 2024, stations=[f"s{i}" for i in range(10)], seed=1,
+                                                     drop=0.02, mean_hours=1.5, shuffle=True)
+    table = streaks.streak_table(daily, window='week')
+    assert table['window'].max() == 52
+    assert table['days'].sum() == len(daily)
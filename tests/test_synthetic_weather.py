@@ -0,0 +1,55 @@
+# tests/test_synthetic_weather.py
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+# Import the benchmark generator and suite helpers
+def import_modules():
+    import sys
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    sys.path.insert(0, root)
+    sys.path.insert(0, os.path.join(root, 'benchmarks'))
+    sys.path.insert(0, os.path.join(root, 'data_explore_clean'))
+    import synthetic_weather
+    import bench_pipeline
+    import clean_data
+    return synthetic_weather, bench_pipeline, clean_data
+
+synthetic_weather, bench_pipeline, clean_data = import_modules()
+
+# --- Tests ---
+def test_generator_is_deterministic_per_station():
+    a = synthetic_weather.generate_station(1, station=3, seed=1)
+    pd.testing.assert_frame_equal(a, synthetic_weather.generate_station(1, station=3, seed=1))
+    assert not a.equals(synthetic_weather.generate_station(1, station=4, seed=1))
+
+def test_generator_has_duplicates_gaps_and_codes():
+    raw = synthetic_weather.generate_station(2, duplicate_rate=0.01, gap_rate=0.01)
+    assert raw['dt'].duplicated().sum() > 0
+    assert raw['dt'].nunique() < 2 * 8760
+    assert set(raw['weather_id']) <= set(synthetic_weather.WEATHER_TEXT)
+    rain = raw['rain_1h'].notna()
+    assert raw.loc[rain, 'weather_main'].isin(['Rain', 'Thunderstorm']).all()
+
+    cleaned = clean_data.clean_hourly(raw)
+    assert not cleaned['dt_iso'].duplicated().any()
+    assert 'sea_level' not in cleaned.columns
+
+def test_write_stations_manifest(tmp_path):
+    manifest = synthetic_weather.write_stations(str(tmp_path), n_stations=2, years=1)
+    listed = pd.read_csv(manifest)
+    assert listed['station'].tolist() == ['station_000', 'station_001']
+    assert all(os.path.exists(tmp_path / p) for p in listed['path'])
+
+def test_find_regressions():
+    baseline = {'aggregate_daily': {'seconds': 1.0, 'peak_mb': 10.0}}
+    stages = {'aggregate_daily': {'seconds': 1.2, 'peak_mb': 14.0}, 'new_stage': {'seconds': 5.0, 'peak_mb': 1.0}}
+    regressions = bench_pipeline.find_regressions(stages, baseline, tolerance=0.25)
+    assert [(r['stage'], r['metric']) for r in regressions] == [('aggregate_daily', 'peak_mb')]
+
+def test_missing_baseline_skips_the_check():
+    stages = {'aggregate_daily': {'seconds': 1.2, 'peak_mb': 14.0}}
+    assert bench_pipeline.check_baseline(stages, {}, '10y x 1st') is None
+    baselines = {'10y x 1st': {'aggregate_daily': {'seconds': 1.0, 'peak_mb': 10.0}}}
+    assert len(bench_pipeline.check_baseline(stages, baselines, '10y x 1st', tolerance=0.25)) == 1
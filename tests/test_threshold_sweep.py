@@ -0,0 +1,72 @@
+# tests/test_threshold_sweep.py
+import os
+import itertools
+import numpy as np
+import pandas as pd
+import pytest
+
+# Import threshold_sweep / hazard_forecast
+def import_modules():
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    import threshold_sweep
+    import hazard_forecast
+    return threshold_sweep, hazard_forecast
+
+threshold_sweep, hazard_forecast = import_modules()
+
+# --- Fixtures ---
+@pytest.fixture
+def working_hourly_df():
+    rng = np.random.default_rng(1)
+    times = pd.DatetimeIndex(np.concatenate([
+        pd.date_range(f"{y}-02-25", f"{y}-03-05 23:00", freq="h").values for y in (2018, 2019, 2020)
+    ]))
+    n = len(times)
+    df = pd.DataFrame({
+        'dt_iso': times,
+        'wind_speed': rng.integers(10, 40, n).astype('float32'),
+        'feels_like': rng.uniform(10, 100, n).round(1).astype('float32'),
+        'rain_1h': np.where(rng.random(n) < 0.2, rng.choice([0.1, 0.25, 0.7], n), np.nan).astype('float32'),
+        'rain_3h': np.where(rng.random(n) < 0.1, rng.uniform(0, 2, n), np.nan),
+        'snow_1h': np.nan,
+        'snow_3h': np.where(rng.random(n) < 0.05, rng.uniform(0, 2, n), np.nan),
+    })
+    return hazard_forecast.filter_working_hours(df)
+
+def brute_force(df, thresholds, start_date, end_date, min_year, max_year):
+    flagged = hazard_forecast.flag_hourly_hazards(df, thresholds)
+    daily = hazard_forecast.flag_daily_hazards(flagged)
+    forecast = hazard_forecast.forecast_hazards(daily, start_date, end_date, min_year, max_year)
+    return forecast.drop(columns=['date', 'n_years']).sum()
+
+# --- Tests ---
+def test_sweep_matches_full_pipeline(working_hourly_df):
+    grid = {
+        'wind_speed': [20, 25, 30, 38],
+        'temp_heat': [70, 85.5],
+        'temp_cold': [20, 32],
+        'rain_1h': [0.1, 0.25, 0.7],
+    }
+    windows = [("2025-02-27", "2025-03-03"), ("2024-02-20", "2024-03-10")]
+    result = threshold_sweep.sweep_thresholds(working_hourly_df, grid, windows, min_year=2018, max_year=2020)
+    assert len(result) == 2 * 4 * 2 * 2 * 3
+    hr_cols = [hazard_forecast.forecast_col(c) for c in hazard_forecast.HAZARD_COLS]
+    for _, row in result.iterrows():
+        thresholds = {key: row[key] for key in grid}
+        expected = brute_force(working_hourly_df, thresholds, row['window_start'], row['window_end'], 2018, 2020)
+        np.testing.assert_allclose(row[hr_cols].to_numpy(dtype=float), expected[hr_cols].to_numpy(dtype=float),
+                                   atol=1e-9)
+
+def test_sweep_fixed_thresholds_and_year_range(working_hourly_df):
+    thresholds = {'wind_speed': 33, 'snow_3h': 1.0}
+    result = threshold_sweep.sweep_thresholds(
+        working_hourly_df, {}, [("2030-03-01", "2030-03-04")], thresholds=thresholds, min_year=2019, max_year=2019)
+    assert len(result) == 1
+    assert result.loc[0, 'wind_speed'] == 33
+    expected = brute_force(working_hourly_df, thresholds, "2030-03-01", "2030-03-04", 2019, 2019)
+    assert result.loc[0, 'hazard'] == pytest.approx(expected['hazard'])
+    assert result.loc[0, 'snow_3h_hr'] == pytest.approx(expected['snow_3h_hr'])
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,53 @@
+# tests/test_weather_codes.py
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+# Import weather_codes / data_loader
+def import_modules():
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    import weather_codes
+    import data_loader
+    return weather_codes, data_loader
+
+weather_codes, data_loader = import_modules()
+
+# --- Fixtures ---
+@pytest.fixture
+def coded_hourly_df():
+    data = {
+        'weather_id': [800, 211, 201, 511, 741, 615, 999, 211],
+        'weather_main': ['Clear', 'Thunderstorm', 'Thunderstorm', 'Rain', 'Fog', 'Snow', 'Unknown', 'Clear'],
+        'weather_description': ['clear sky', 'thunderstorm', 'thunderstorm with rain', 'freezing rain',
+                                'fog', 'light rain and snow', 'unknown', 'clear sky'],
+    }
+    return pd.DataFrame(data)
+
+# --- Tests ---
+def test_classify_weather_ids(coded_hourly_df):
+    mask = weather_codes.classify_weather_ids(coded_hourly_df['weather_id'])
+    assert weather_codes.has_class(mask, 'thunderstorm').tolist() == [False, True, True, False, False, False, False, True]
+    assert weather_codes.has_class(mask, 'freezing_rain').tolist() == [False, False, False, True, False, False, False, False]
+    assert weather_codes.has_class(mask, 'rain')[[2, 3, 5]].all()
+    assert weather_codes.has_class(mask, 'fog')[4]
+    assert mask[6] == 0
+
+def test_classify_missing_and_out_of_range_ids():
+    mask = weather_codes.classify_weather_ids([np.nan, -1, 5000, 800])
+    assert mask.tolist() == [0, 0, 0, 0]
+
+def test_add_thunderstorm_flag_uses_weather_id(coded_hourly_df):
+    df = data_loader.add_thunderstorm_flag(coded_hourly_df.copy())
+    # Last row is coded 211 but labelled 'Clear': the code wins
+    assert df['is_thunderstorm'].tolist() == [False, True, True, False, False, False, False, True]
+
+def test_check_code_consistency(coded_hourly_df):
+    mismatches = weather_codes.check_code_consistency(coded_hourly_df)
+    assert set(mismatches['weather_class']) == {'thunderstorm'}
+    assert mismatches['weather_id'].tolist() == [211]
+    assert mismatches['by_code'].tolist() == [True]
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,115 @@
+# threshold_sweep.py
+
+import itertools
+import logging
+
+import numpy as np
+import pandas as pd
+
+from hazard_forecast import HAZARD_RULES, forecast_col
+
+log = logging.getLogger()
+
+
+def _grid_values(key, default, op, grid, thresholds):
+    """
+    Threshold values for one hazard type, ordered so that a larger index is a
+    stricter threshold: ascending for '>=' types, descending for '<=' types.
+    Types not in grid sweep over their single configured value.
+    """
+    values = grid.get(key, [thresholds.get(key, default)])
+    return sorted(set(values), reverse=(op == '<='))
+
+
+def _trigger_ranks(values, limits, op):
+    """
+    For every hour, the number of grid thresholds it triggers. Limits are
+    ordered strictest-last, so an hour triggers threshold j iff j < rank.
+    Missing values never trigger. Limits are compared in the values' float
+    dtype, as flag_hourly_hazards' scalar comparisons are.
+    """
+    ascending = np.asarray(limits[::-1] if op == '<=' else limits, dtype=values.dtype)
+    if op == '>=':
+        rank = np.searchsorted(ascending, values, side='right')
+    else:
+        rank = len(ascending) - np.searchsorted(ascending, values, side='left')
+    rank[np.isnan(values)] = 0
+    return rank
+
+
+def _window_weights(cal_key, year_ok, start_date, end_date, n_years):
+    """
+    Weight of each hourly row in a window's expected hours: how often its
+    calendar day occurs in the window divided by that day's n_years, so summing
+    weights over flagged hours equals summing forecast_hazards means over the window.
+    """
+    window = pd.date_range(start=start_date, end=end_date, freq='D')
+    occurrences = np.bincount(window.month * 32 + window.day, minlength=13 * 32)
+    per_day = np.divide(occurrences, n_years, out=np.zeros(len(n_years)), where=n_years > 0)
+    return np.where(year_ok, per_day[cal_key], 0.0)
+
+
+def sweep_thresholds(df_hourly, grid, windows, thresholds=None, min_year=1979, max_year=2024):
+    """
+    Expected hazard hours per forecast window for every combination of the
+    threshold values in grid, e.g. {'wind_speed': [20, 22, ...], 'temp_heat': [...]}.
+
+    df_hourly is working-hours data (filter_working_hours output, unflagged).
+    Each result equals running flag_hourly_hazards -> flag_daily_hazards ->
+    forecast_hazards with that threshold set and summing the window's columns,
+    but all combinations come from one pass: per-type hours by counting sorted
+    values, and any-hazard hours from a cumulative histogram over the grid.
+    Returns one row per (window, combination) with the threshold values and
+    the expected hours per type (wind_hr, ...) and any hazard (hazard).
+    """
+    thresholds = thresholds or {}
+    ts = pd.to_datetime(df_hourly['dt_iso'])
+    valid = ts.notna().to_numpy()
+    ts = ts[valid]
+    year = ts.dt.year.to_numpy()
+    cal_key = (ts.dt.month * 32 + ts.dt.day).to_numpy()
+    year_ok = (year >= min_year) & (year <= max_year)
+
+    # n_years per calendar day: distinct (year, month, day) dates in range
+    day_keys = np.unique(year[year_ok].astype('int64') * 1000 + cal_key[year_ok])
+    n_years = np.bincount(day_keys % 1000, minlength=13 * 32)
+
+    keys, limits, ranks = [], [], []
+    for flag, key, col, default, op, fill_zero in HAZARD_RULES:
+        values = df_hourly[col].to_numpy()[valid]
+        if values.dtype.kind != 'f':
+            values = values.astype('float64')
+        if fill_zero:
+            values = np.nan_to_num(values, nan=0.0)
+        keys.append(key)
+        limits.append(_grid_values(key, default, op, grid, thresholds))
+        ranks.append(_trigger_ranks(values, limits[-1], op))
+
+    shape = tuple(len(lim) for lim in limits)
+    hist_shape = tuple(n + 1 for n in shape)
+    joint_rank = np.ravel_multi_index(ranks, hist_shape)
+    combos = np.array(list(itertools.product(*[range(n) for n in shape])))
+
+    out = []
+    for start_date, end_date in windows:
+        weights = _window_weights(cal_key, year_ok, start_date, end_date, n_years)
+        table = {'window_start': start_date, 'window_end': end_date}
+        for k, key in enumerate(keys):
+            table[key] = np.asarray(limits[k])[combos[:, k]]
+        for k, (flag, *_rest) in enumerate(HAZARD_RULES):
+            by_rank = np.bincount(ranks[k], weights=weights, minlength=shape[k] + 1)
+            # hours triggering threshold j: weight of hours with rank > j
+            hours = by_rank[::-1].cumsum()[::-1][1:]
+            table[forecast_col(flag)] = hours[combos[:, k]]
+        # any hazard: total weight minus hours with rank <= j_k for every type
+        hist = np.bincount(joint_rank, weights=weights, minlength=int(np.prod(hist_shape)))
+        hist = hist.reshape(hist_shape)
+        for axis in range(hist.ndim):
+            hist = hist.cumsum(axis=axis)
+        safe = hist[tuple(combos.T)]
+        table[forecast_col('is_hazard')] = np.maximum(weights.sum() - safe, 0.0)
+        out.append(pd.DataFrame(table))
+
+    result = pd.concat(out, ignore_index=True)
+    log.info("Swept %d threshold combinations over %d windows.", len(combos), len(windows))
+    return result
@@ -0,0 +1,123 @@
+# weather_codes.py
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+log = logging.getLogger()
+
+# OpenWeather condition codes (weather_id) grouped into hazard classes.
+# Each class is a list of inclusive (low, high) weather_id ranges.
+WEATHER_CLASSES = {
+    'thunderstorm': [(200, 299)],
+    'drizzle': [(230, 232), (300, 399)],
+    'rain': [(200, 202), (310, 314), (500, 599), (615, 616)],
+    'freezing_rain': [(511, 511)],
+    'snow': [(600, 699)],
+    'sleet': [(611, 613)],
+    'mist': [(701, 701)],
+    'fog': [(741, 741)],
+    'smoke': [(711, 711)],
+    'haze': [(721, 721)],
+    'dust': [(731, 731), (761, 761)],
+    'sand': [(731, 731), (751, 751)],
+    'ash': [(762, 762)],
+    'squall': [(771, 771)],
+    'tornado': [(781, 781)],
+    'clouds': [(801, 804)],
+}
+
+# Word that marks each class in weather_main / weather_description,
+# used only to cross-check the code table against the text columns.
+CLASS_KEYWORDS = {
+    'thunderstorm': 'thunderstorm',
+    'drizzle': 'drizzle',
+    'rain': 'rain',
+    'freezing_rain': 'freezing rain',
+    'snow': 'snow',
+    'sleet': 'sleet',
+    'mist': 'mist',
+    'fog': 'fog',
+    'smoke': 'smoke',
+    'haze': 'haze',
+    'dust': 'dust',
+    'sand': 'sand',
+    'ash': 'ash',
+    'squall': 'squall',
+    'tornado': 'tornado',
+    'clouds': 'cloud',
+}
+
+MAX_WEATHER_ID = 999
+
+
+def compile_code_table(classes=WEATHER_CLASSES):
+    """
+    Build a lookup array indexed by weather_id whose entries are bitmasks of
+    the classes that code belongs to (bit i = i-th class in classes).
+    """
+    if len(classes) > 32:
+        raise ValueError(f"At most 32 weather classes fit the uint32 table, got {len(classes)}")
+    table = np.zeros(MAX_WEATHER_ID + 1, dtype=np.uint32)
+    for bit, ranges in enumerate(classes.values()):
+        for low, high in ranges:
+            table[low:high + 1] |= np.uint32(1 << bit)
+    return table
+
+
+CODE_TABLE = compile_code_table()
+
+
+def class_bit(name, classes=WEATHER_CLASSES):
+    return 1 << list(classes).index(name)
+
+
+def classify_weather_ids(weather_id, table=CODE_TABLE):
+    """Class bitmask for every weather_id; missing or unknown codes get 0."""
+    ids = pd.to_numeric(pd.Series(weather_id), errors='coerce').to_numpy(dtype='float64')
+    valid = ~np.isnan(ids) & (ids >= 0) & (ids < len(table))
+    out = np.zeros(len(ids), dtype=table.dtype)
+    out[valid] = table[ids[valid].astype(np.intp)]
+    return out
+
+
+def has_class(mask, name, classes=WEATHER_CLASSES):
+    """Boolean array: which entries of a class bitmask belong to class name."""
+    return (np.asarray(mask) & class_bit(name, classes)) != 0
+
+
+def add_weather_class_mask(df, table=CODE_TABLE):
+    """
+    Add a 'weather_class' bitmask column from weather_id with one array lookup.
+    Any number of classes then come out of has_class at no extra cost per row.
+    """
+    df['weather_class'] = classify_weather_ids(df['weather_id'], table)
+    return df
+
+
+def check_code_consistency(df, classes=WEATHER_CLASSES, keywords=CLASS_KEYWORDS):
+    """
+    Compare code-based classes with keyword matches in weather_main /
+    weather_description. Works on the distinct (weather_id, main, description)
+    combinations, so its cost does not grow with the number of hourly rows.
+    Returns one row per (combination, class) where the two disagree, with the
+    number of hourly rows affected.
+    """
+    combos = (
+        df.groupby(['weather_id', 'weather_main', 'weather_description'], observed=True, dropna=False)
+        .size().reset_index(name='count')
+    )
+    mask = classify_weather_ids(combos['weather_id'])
+    text = (combos['weather_main'].astype(str) + ' ' + combos['weather_description'].astype(str)).str.lower()
+    mismatches = []
+    for name, keyword in keywords.items():
+        by_code = has_class(mask, name, classes)
+        by_text = text.str.contains(keyword, regex=False).to_numpy()
+        bad = combos[by_code != by_text].assign(
+            weather_class=name, by_code=by_code[by_code != by_text], by_text=by_text[by_code != by_text])
+        mismatches.append(bad)
+    result = pd.concat(mismatches, ignore_index=True)
+    if not result.empty:
+        log.warning("%d row-class pairs disagree between weather_id and text", result['count'].sum())
+    return result